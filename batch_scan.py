@@ -0,0 +1,242 @@
+# batch_scan.py
+import argparse
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from pages.FoodScan import NUTRITION_FAILED, FoodAnalyzer, LogUI
+from pages.image_ingest import ingest_image
+
+load_dotenv()
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+# 결과 행의 열 (모든 행이 같은 키를 가져 JSONL/Parquet 스키마가 행마다 달라지지 않음)
+ROW_FIELDS = ["image", "status", "detected_foods", "nutrition", "annotated", "error", "latency"]
+
+
+class RateLimiter:
+    """요청 간 최소 간격을 보장하는 스레드 안전 레이트 리미터"""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class JsonlWriter:
+    def __init__(self, path, append=True):
+        self.file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.file.flush()
+        return [row]
+
+    def close(self):
+        self.file.close()
+        return []
+
+
+class ParquetWriter:
+    """결과를 일정 개수씩 모아 row group 단위로 기록"""
+
+    def __init__(self, path, batch_size=100, append=True):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = Path(path)
+        if not append:
+            # 처음부터 다시 실행하면 이전 실행의 파일과 파트 파일을 모두 삭제
+            path.unlink(missing_ok=True)
+            for old in path.parent.glob(f"{path.stem}.part*{path.suffix}"):
+                old.unlink()
+        # 이어서 실행할 때는 기존 파일을 덮어쓰지 않고 새 파트 파일에 기록
+        part = 1
+        while path.exists():
+            path = path.with_name(f"{path.stem.split('.part')[0]}.part{part}{path.suffix}")
+            part += 1
+
+        self.pa = pa
+        self.pq = pq
+        # 첫 배치에서 스키마를 추론하면 error/annotated 열이 없는 배치와 섞일 때 기록이 실패하므로 명시
+        # (중첩 구조는 JSON 문자열, 모든 열은 null 허용)
+        self.schema = pa.schema([
+            pa.field(name, pa.float64() if name == "latency" else pa.string(), nullable=True) for name in ROW_FIELDS
+        ])
+        self.path = path
+        self.batch_size = batch_size
+        self.rows = []
+        self.writer = None
+
+    def write(self, row):
+        # 중첩 구조는 JSON 문자열로 저장
+        self.rows.append({
+            key: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+            for key, value in row.items()
+        })
+        if len(self.rows) >= self.batch_size:
+            return self._flush()
+        return []
+
+    def _flush(self):
+        # 파일에 기록된 행 목록을 반환 (체크포인트용)
+        if not self.rows:
+            return []
+        table = self.pa.Table.from_pylist(self.rows, schema=self.schema)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(str(self.path), self.schema)
+        self.writer.write_table(table)
+        written = self.rows
+        self.rows = []
+        return written
+
+    def close(self):
+        written = self._flush()
+        if self.writer is not None:
+            self.writer.close()
+        return written
+
+
+def load_checkpoint(path):
+    if not path.exists():
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def mark_done(checkpoint, rows):
+    # 결과 파일에 실제로 기록된 이미지만 체크포인트에 추가
+    # (실패한 이미지는 기록하지 않아 이어서 실행할 때 다시 시도, 결과 파일에는 같은 이미지의 마지막 행이 최신)
+    for row in rows:
+        if row["status"] != "error":
+            checkpoint.write(row["image"] + "\n")
+    checkpoint.flush()
+
+
+def find_images(image_dir):
+    return sorted(
+        path for path in Path(image_dir).rglob("*")
+        if path.suffix.lower() in IMAGE_EXTENSIONS
+    )
+
+
+def annotated_path_for(path, image_dir, annotated_dir):
+    """입력 폴더 기준 상대 경로를 그대로 따라 저장 (하위 폴더의 같은 이름 이미지가 서로 덮어쓰지 않음)"""
+    relative = Path(path).relative_to(image_dir)
+    return Path(annotated_dir) / relative.parent / f"{relative.stem}_annotated.jpg"
+
+
+def scan_image(analyzer, limiter, path, nutrition_mode, annotated_dir=None, image_dir=None):
+    limiter.acquire()
+    start = time.perf_counter()
+    row = dict.fromkeys(ROW_FIELDS)
+    row["image"] = str(path)
+    try:
+        prepared = ingest_image(path)
+        # 배치 모드의 분석기는 API/네트워크 오류를 빈 결과 대신 예외로 알림
+        detected_foods = analyzer.analyze_image(prepared[1], prepared=prepared)
+        nutrition_info = analyzer.get_nutrition_info(detected_foods, mode=nutrition_mode) if nutrition_mode != "off" else {}
+        failed = [name for name, info in nutrition_info.items() if info == NUTRITION_FAILED]
+        if failed:
+            raise RuntimeError(f"영양 정보 조회 실패: {', '.join(failed)}")
+        if annotated_dir and detected_foods:
+            # 워커마다 렌더러의 캐시된 폰트/레이어를 공유하며 주석 이미지 저장
+            annotated_path = annotated_path_for(path, image_dir or path.parent, annotated_dir)
+            annotated_path.parent.mkdir(parents=True, exist_ok=True)
+            analyzer.renderer.render(prepared[1], detected_foods).save(annotated_path, quality=90)
+            row["annotated"] = str(annotated_path)
+        row.update({
+            "status": "ok" if detected_foods else "empty",
+            "detected_foods": detected_foods,
+            "nutrition": nutrition_info,
+        })
+    except Exception as e:
+        row.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    row["latency"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def run(args):
+    images = find_images(args.image_dir)
+    checkpoint_path = Path(args.checkpoint or f"{args.output}.checkpoint")
+    done = load_checkpoint(checkpoint_path) if not args.restart else set()
+    todo = [path for path in images if str(path) not in done]
+    print(f"전체 이미지 {len(images)}개 / 완료 {len(images) - len(todo)}개 / 처리 대상 {len(todo)}개")
+    if not todo:
+        return
+
+    analyzer = FoodAnalyzer(ui=LogUI(verbose=args.verbose), raise_errors=True)
+    if args.annotated_dir:
+        Path(args.annotated_dir).mkdir(parents=True, exist_ok=True)
+    limiter = RateLimiter(args.rate)
+    if args.output.endswith(".parquet"):
+        writer = ParquetWriter(args.output, append=not args.restart)
+    else:
+        writer = JsonlWriter(args.output, append=not args.restart)
+    checkpoint = open(checkpoint_path, "w" if args.restart else "a", encoding="utf-8")
+
+    latencies = []
+    counts = {"ok": 0, "empty": 0, "error": 0}
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(scan_image, analyzer, limiter, path, args.nutrition_mode, args.annotated_dir, args.image_dir)
+                for path in todo
+            ]
+            for index, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                mark_done(checkpoint, writer.write(row))
+
+                latencies.append(row["latency"])
+                counts[row["status"]] += 1
+                elapsed = time.perf_counter() - start
+                print(f"[{index}/{len(todo)}] {row['status']:5} {row['latency']:6.2f}s  {row['image']}  ({index / elapsed:.2f} img/s)")
+    finally:
+        mark_done(checkpoint, writer.close())
+        checkpoint.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n처리 {len(latencies)}개 (성공 {counts['ok']} / 음식 없음 {counts['empty']} / 실패 {counts['error']})")
+    print(f"소요 시간 {elapsed:.1f}s, 처리량 {len(latencies) / elapsed:.2f} img/s")
+    print(f"지연 시간 p50 {percentile(latencies, 0.5):.2f}s / p95 {percentile(latencies, 0.95):.2f}s / 최대 {max(latencies):.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이미지 폴더 전체를 FoodScan으로 일괄 분석")
+    parser.add_argument("image_dir", help="분석할 이미지 폴더 (하위 폴더 포함)")
+    parser.add_argument("-o", "--output", default="scan_results.jsonl", help="결과 파일 (.jsonl 또는 .parquet)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="동시 작업 수")
+    parser.add_argument("--rate", type=float, default=30, help="분당 최대 이미지 처리 수 (0이면 제한 없음)")
+    parser.add_argument("--checkpoint", help="처리 완료 목록 파일 (기본값: <output>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    parser.add_argument("--nutrition-mode", default="concurrent", choices=["sequential", "concurrent", "batch", "off"], help="영양 정보 조회 방식")
+    parser.add_argument("--annotated-dir", help="바운딩 박스를 그린 이미지를 저장할 폴더")
+    parser.add_argument("-v", "--verbose", action="store_true", help="분석 단계별 로그 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run(args)
@@ -0,0 +1,149 @@
+# benchmarks/bench_context.py
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from benchmarks.bench_hybrid import HashEmbeddings, load_corpus, make_queries
+from pages.context_packer import ContextPacker, count_tokens
+from pages.keyword_index import HybridRetriever, KeywordIndex
+
+SYSTEM_PROMPT = "당신은 야구 전문가입니다. 주어진 컨텍스트를 바탕으로 답변해주세요.\n\n텍스트:\n{context}"
+
+
+def start_stub_server(latency, ms_per_1k_tokens):
+    """프롬프트 길이에 비례해 느려지는 OpenAI 호환 서버 (입력 토큰 처리 시간을 흉내 냄)"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            prompt_tokens = sum(count_tokens(message["content"]) for message in request["messages"])
+            time.sleep(latency + prompt_tokens / 1000 * ms_per_1k_tokens / 1000)
+            body = json.dumps({
+                "id": "bench", "object": "chat.completion", "created": 0, "model": request["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "답변입니다."},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 3, "total_tokens": prompt_tokens + 3},
+            }, ensure_ascii=False).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values, ratio):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(ratio * (len(values) - 1))))]
+
+
+def measure(name, build_context, queries, chain):
+    """질문 단어가 모두 컨텍스트에 들어 있으면 정답 내용을 찾은 것으로 봄"""
+    hits, tokens, latencies = 0, [], []
+    for query, _ in queries:
+        start = time.perf_counter()
+        context = build_context(query)
+        if chain is not None:
+            chain.invoke({"context": context, "query": query})
+        latencies.append(time.perf_counter() - start)
+        hits += all(word in context for word in query.split())
+        tokens.append(count_tokens(context))
+    print(f"{name:<16} {hits / len(queries):>10.1%} {statistics.mean(tokens):>12.0f} "
+          f"{statistics.median(latencies) * 1000:>10.1f} {percentile(latencies, 0.95) * 1000:>10.1f}")
+    return statistics.mean(tokens)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="상위 k개 이어 붙이기 / MMR + 토큰 예산 컨텍스트의 토큰 수와 답변 지연 비교")
+    parser.add_argument("--chroma", default=str(project_root / "chroma"), help="문서를 가져올 Chroma 폴더")
+    parser.add_argument("--collection", default="baseball-chroma", help="컬렉션 이름")
+    parser.add_argument("--queries", type=int, default=50, help="질문 수")
+    parser.add_argument("-k", type=int, default=3, help="기존 방식에서 이어 붙이는 청크 수")
+    parser.add_argument("--candidates", type=int, default=8, help="MMR로 고를 후보 청크 수")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[600, 900, 1200], help="비교할 토큰 예산")
+    parser.add_argument("--lambda-mult", type=float, default=0.7, help="MMR 관련성 가중치")
+    parser.add_argument("--stub-latency", type=float, default=0.3, help="가짜 LLM 서버의 기본 응답 지연(초)")
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=150, help="입력 1000토큰당 추가 지연(ms)")
+    parser.add_argument("--no-llm", action="store_true", help="LLM 호출 없이 컨텍스트 구성만 측정")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    chain = None
+    if not args.no_llm:
+        server = start_stub_server(args.stub_latency, args.ms_per_1k_tokens)
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        os.environ["OPENAI_API_KEY"] = "context-benchmark"
+
+        from langchain_core.prompts import ChatPromptTemplate
+
+        from pages.llm_clients import get_chat_model
+
+        chain = ChatPromptTemplate.from_messages([("system", SYSTEM_PROMPT), ("human", "{query}")]) | get_chat_model()
+
+    from langchain_chroma import Chroma
+
+    corpus = load_corpus(args.chroma, args.collection)
+    texts = [text for text, _ in corpus]
+    queries = make_queries(texts, args.queries, args.seed)
+    embeddings = HashEmbeddings()
+
+    with tempfile.TemporaryDirectory() as directory:
+        vectorstore = Chroma(collection_name="bench-context", embedding_function=embeddings, persist_directory=directory)
+        ids = [f"doc-{index}" for index in range(len(texts))]
+        vectorstore._collection.add(ids=ids, documents=texts, embeddings=embeddings.embed_documents(texts))
+        index = KeywordIndex(Path(directory) / "keyword-index.sqlite3")
+        index.sync("bench-context", vectorstore._collection)
+
+        top_k = HybridRetriever(vectorstore=vectorstore, index=index, collection_name="bench-context", k=args.k)
+        candidates = HybridRetriever(
+            vectorstore=vectorstore, index=index, collection_name="bench-context", k=args.candidates
+        )
+
+        def naive(query):
+            return "\n".join(doc.page_content for doc in top_k.invoke(query))
+
+        def packed(packer):
+            def build(query):
+                docs = candidates.invoke(query)
+                data = vectorstore._collection.get(ids=[doc.id for doc in docs], include=["embeddings"])
+                vectors = dict(zip(data["ids"], data["embeddings"]))
+                context, _, _ = packer.pack(
+                    embeddings.embed_query(query), docs, [vectors[doc.id] for doc in docs], query
+                )
+                return context
+            return build
+
+        print(f"문서 {len(texts)}개, 질문 {len(queries)}개"
+              + ("" if chain is None else f", LLM stub {args.stub_latency * 1000:.0f}ms + {args.ms_per_1k_tokens:.0f}ms/1k토큰"))
+        print(f"{'방식':<16} {'recall':>10} {'평균 토큰':>12} {'p50(ms)':>10} {'p95(ms)':>10}")
+        count_tokens("준비")  # 인코더 로드는 측정에서 제외
+        measure(f"top-{args.k}", naive, queries, chain)
+        for budget in args.budgets:
+            packer = ContextPacker(budget=budget, lambda_mult=args.lambda_mult, baseline_k=args.k)
+            measure(f"mmr ({budget})", packed(packer), queries, chain)
+            stats = packer.stats()
+            print(f"{'':<16} 질문당 절약 토큰 {stats['saved_per_query']:.0f}개, 추가 토큰 {stats['added_per_query']:.0f}개")
@@ -0,0 +1,111 @@
+# benchmarks/bench_embeddings.py
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+QUERIES = [
+    "스트라이크 존이 뭐야?", "보크는 언제 선언돼?", "인필드 플라이 규칙 알려줘", "지명타자 제도가 뭐야?",
+    "김치찌개 끓이는 법", "불고기 양념 비율", "계란말이 잘 만드는 팁", "된장찌개에 어떤 재료가 들어가?",
+]
+DOCUMENT = "야구는 9명의 선수로 이루어진 두 팀이 공격과 수비를 번갈아 하는 경기입니다. " * 8
+
+
+def start_openai_stub(latency, dimensions=1536):
+    """OpenAI 임베딩 API를 흉내 내는 로컬 서버 (네트워크 왕복 지연만 재현)"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            inputs = request["input"] if isinstance(request["input"], list) else [request["input"]]
+            time.sleep(latency)
+            body = json.dumps({
+                "object": "list", "model": request["model"],
+                "data": [{"object": "embedding", "index": index, "embedding": [0.01] * dimensions}
+                         for index in range(len(inputs))],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values, ratio):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(ratio * (len(values) - 1))))]
+
+
+def bench(name, embeddings, repeat, docs, concurrency):
+    embeddings.embed_query("준비")  # 모델 로드/연결 준비는 측정에서 제외
+
+    latencies = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            embeddings.embed_query(query)
+            latencies.append(time.perf_counter() - start)
+
+    # 여러 세션이 동시에 질문하는 경우 (local은 동시에 들어온 질문을 한 번에 인코딩)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(embeddings.embed_query, QUERIES * repeat))
+    concurrent_qps = len(QUERIES) * repeat / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    embeddings.embed_documents([DOCUMENT] * docs)
+    docs_per_sec = docs / (time.perf_counter() - start)
+
+    print(f"{name:<20} {statistics.median(latencies) * 1000:>10.2f} {percentile(latencies, 0.95) * 1000:>10.2f} "
+          f"{concurrent_qps:>12.1f} {docs_per_sec:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI / 로컬 임베딩 백엔드 비교")
+    parser.add_argument("--repeat", type=int, default=5, help="질문 목록 반복 횟수")
+    parser.add_argument("--docs", type=int, default=256, help="문서 임베딩 처리량 측정용 문서 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 질문 스레드 수")
+    parser.add_argument("--stub-latency", type=float, default=0.15,
+                        help="가짜 OpenAI 서버의 응답 지연(초), --real-openai를 주면 실제 API 사용")
+    parser.add_argument("--real-openai", action="store_true", help="실제 OpenAI API로 측정 (요금 발생)")
+    parser.add_argument("--threads", type=int, help="로컬 모델 추론 스레드 수")
+    parser.add_argument("--acceleration", nargs="+", default=["none", "int8", "onnx", "onnx-int8"],
+                        help="측정할 로컬 가속 방식")
+    args = parser.parse_args()
+
+    if not args.real_openai:
+        server = start_openai_stub(args.stub_latency)
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        os.environ["OPENAI_API_KEY"] = "embedding-benchmark"
+
+    from pages.embedding_backend import LocalEmbeddings, get_embeddings
+
+    print(f"{'백엔드':<20} {'p50(ms)':>10} {'p95(ms)':>10} {'동시 질문/초':>12} {'문서/초':>12}")
+    bench("openai" if args.real_openai else f"openai (stub {args.stub_latency * 1000:.0f}ms)",
+          get_embeddings("openai"), args.repeat, args.docs, args.concurrency)
+    for acceleration in args.acceleration:
+        try:
+            embeddings = LocalEmbeddings(threads=args.threads, acceleration=acceleration)
+            bench(f"local ({acceleration})", embeddings, args.repeat, args.docs, args.concurrency)
+        except ImportError as e:
+            print(f"{'local (' + acceleration + ')':<20} 건너뜀: {e}")
@@ -0,0 +1,176 @@
+# benchmarks/bench_flat_index.py
+import argparse
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from pages.flat_index import FlatIndex, export_collection
+
+BATCH_SIZE = 5000
+CLUSTERS = 256
+
+
+class SyntheticCollection:
+    """Chroma 컬렉션처럼 get(limit, offset)으로 읽을 수 있는 가짜 컬렉션 (군집된 무작위 단위 벡터)
+
+    Chroma에 넣기엔 너무 큰 규모도 export_collection으로 그대로 내보낼 수 있습니다.
+    """
+
+    def __init__(self, count, dimensions, seed=0):
+        self.name = f"synthetic-{count}"
+        self.metadata = {"hnsw:space": "l2", "content_version": "bench"}
+        self._count = count
+        self.dimensions = dimensions
+        self.seed = seed
+        self.centers = np.random.default_rng(seed).standard_normal((CLUSTERS, dimensions)).astype(np.float32)
+
+    def count(self):
+        return self._count
+
+    def vectors(self, offset, limit):
+        rng = np.random.default_rng((self.seed, offset))
+        size = max(0, min(limit, self._count - offset))
+        noise = rng.standard_normal((size, self.dimensions)).astype(np.float32)
+        vectors = self.centers[rng.integers(0, CLUSTERS, size)] + 0.6 * noise
+        # 임베딩 모델 출력처럼 길이 1로 정규화
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def get(self, include=None, limit=BATCH_SIZE, offset=0):
+        vectors = self.vectors(offset, limit)
+        ids = [f"doc-{offset + i}" for i in range(len(vectors))]
+        return {
+            "ids": ids,
+            "embeddings": vectors,
+            "documents": [f"문서 {id_}" for id_ in ids],
+            "metadatas": [{"source": "bench"} for _ in ids],
+        }
+
+
+def percentile(values, ratio):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(ratio * (len(values) - 1))))]
+
+
+def make_queries(collection, count, seed):
+    """저장된 벡터에 잡음을 더한 질문 벡터"""
+    rng = np.random.default_rng(seed + 1)
+    positions = rng.integers(0, collection.count(), count)
+    vectors = np.concatenate([collection.vectors(int(position), 1) for position in positions])
+    return vectors + 0.3 / np.sqrt(vectors.shape[1]) * rng.standard_normal(vectors.shape).astype(np.float32)
+
+
+def timed(search, queries):
+    search(queries[0])  # 첫 호출(페이지 캐시/연결 준비)은 측정에서 제외
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+def mapping_usage(path):
+    """현재 프로세스에서 path 파일 매핑의 (RSS, PSS) MB (Linux 전용, 공유 페이지는 PSS에서 프로세스 수로 나뉨)"""
+    rss = pss = 0.0
+    try:
+        lines = Path("/proc/self/smaps").read_text().splitlines()
+    except OSError:
+        return float("nan"), float("nan")
+    inside = False
+    for line in lines:
+        fields = line.split()
+        if not line.endswith(":") and "-" in fields[0] and ":" not in fields[0]:
+            # 새 매핑의 헤더 줄
+            inside = line.endswith(str(path))
+        elif inside and fields[0] == "Rss:":
+            rss += int(fields[1]) / 1024
+        elif inside and fields[0] == "Pss:":
+            pss += int(fields[1]) / 1024
+    return rss, pss
+
+
+def worker(directory, name, queries, k, results):
+    """Streamlit 워커 프로세스처럼 같은 파일을 따로 열어 검색"""
+    index = FlatIndex(directory, name)
+    for query in queries:
+        index.similarity_search_with_score(query, k)
+    results.put(mapping_usage(index.vectors_path))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chroma 검색과 memmap 평면 인덱스 검색의 지연 시간/정확도 비교")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000], help="컬렉션 청크 수")
+    parser.add_argument("--dims", type=int, default=384,
+                        help="벡터 차원 (OpenAI 임베딩은 1536, 1M x 1536은 약 6GB)")
+    parser.add_argument("--queries", type=int, default=100, help="질문 수")
+    parser.add_argument("-k", type=int, default=20, help="가져올 후보 수 (HybridRetriever의 fetch_k)")
+    parser.add_argument("--chroma-max", type=int, default=100000,
+                        help="이 크기까지만 Chroma에 넣어 비교 (HNSW 구축이 오래 걸림)")
+    parser.add_argument("--processes", type=int, default=4, help="가장 큰 인덱스를 함께 여는 프로세스 수 (0이면 생략)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"차원 {args.dims}, 질문 {args.queries}개, k={args.k}")
+    print(f"{'청크 수':>10} {'방식':<8} {'준비(초)':>10} {'p50(ms)':>10} {'p95(ms)':>10} {'recall@k':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            collection = SyntheticCollection(size, args.dims, args.seed)
+            queries = make_queries(collection, args.queries, args.seed)
+
+            start = time.perf_counter()
+            export_collection(collection, directory)
+            index = FlatIndex(directory, collection.name)
+            prepare = time.perf_counter() - start
+            latencies, exact = timed(lambda query: index.similarity_search_with_score(query, args.k), queries)
+            exact_ids = [{doc.id for doc, _ in found} for found in exact]
+            print(f"{size:>10} {'flat':<8} {prepare:>10.2f} {statistics.median(latencies) * 1000:>10.2f} "
+                  f"{percentile(latencies, 0.95) * 1000:>10.2f} {1:>10.1%}")
+
+            if size > args.chroma_max:
+                print(f"{size:>10} {'chroma':<8} {'건너뜀 (--chroma-max)':>10}")
+                continue
+            import chromadb
+
+            start = time.perf_counter()
+            client = chromadb.PersistentClient(str(Path(directory) / "chroma"))
+            chroma = client.create_collection(collection.name, metadata={"hnsw:space": "l2"})
+            for offset in range(0, size, BATCH_SIZE):
+                data = collection.get(limit=BATCH_SIZE, offset=offset)
+                chroma.add(ids=data["ids"], embeddings=data["embeddings"], documents=data["documents"],
+                           metadatas=data["metadatas"])
+            prepare = time.perf_counter() - start
+            latencies, found = timed(
+                lambda query: chroma.query(query_embeddings=[query.tolist()], n_results=args.k,
+                                           include=["documents", "metadatas", "distances"]),
+                queries,
+            )
+            recall = statistics.mean(len(set(result["ids"][0]) & ids) / len(ids) for result, ids in zip(found, exact_ids))
+            print(f"{size:>10} {'chroma':<8} {prepare:>10.2f} {statistics.median(latencies) * 1000:>10.2f} "
+                  f"{percentile(latencies, 0.95) * 1000:>10.2f} {recall:>10.1%}")
+            client.delete_collection(collection.name)
+
+        if args.processes:
+            # 여러 프로세스가 같은 memmap을 열었을 때 .npy 매핑의 메모리 사용량 (PSS 합계 ≈ 실제 물리 메모리)
+            name = f"synthetic-{args.sizes[-1]}"
+            size_mb = (Path(directory) / f"{name}.npy").stat().st_size / 1024 / 1024
+            results = multiprocessing.Queue()
+            processes = [
+                multiprocessing.Process(target=worker, args=(directory, name, queries, args.k, results))
+                for _ in range(args.processes)
+            ]
+            for process in processes:
+                process.start()
+            usage = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+            print(f"프로세스 {args.processes}개가 {name}.npy({size_mb:.0f}MB)를 함께 사용: "
+                  f"매핑 RSS 합계 {sum(rss for rss, _ in usage):.0f}MB, PSS 합계 {sum(pss for _, pss in usage):.0f}MB")
@@ -0,0 +1,254 @@
+# benchmarks/bench_foodscan.py
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+FOODS = ["김치찌개", "공기밥", "계란말이", "불고기", "시금치나물", "짜장면", "탕수육", "감자튀김"]
+
+
+# ---- OpenAI 호환 가짜 서버 ----
+
+def detection_text(count):
+    blocks = []
+    for index in range(count):
+        x1, y1 = 20 + index * 60, 30 + index * 40
+        blocks.append(
+            f"[음식 {index + 1}]\n음식 이름: {FOODS[index % len(FOODS)]}\n위치: [{x1},{y1},{x1 + 150},{y1 + 120}]\n"
+            f"칼로리: {300 + index * 50}kcal\n영양성분:\n- 단백질: {10 + index}g\n- 탄수화물: {40 + index}g\n- 지방: {8 + index}g\n"
+        )
+    return "분석 결과입니다.\n\n" + "\n".join(blocks)
+
+
+def detection_json(count):
+    return json.dumps({"items": [
+        {"food": FOODS[index % len(FOODS)], "bbox": [20 + index * 60, 30 + index * 40, 170 + index * 60, 150 + index * 40],
+         "calories": 300 + index * 50, "protein": 10 + index, "carbs": 40 + index, "fat": 8 + index}
+        for index in range(count)
+    ]}, ensure_ascii=False)
+
+
+def canned_response(request, items):
+    messages = request.get("messages", [])
+    content = messages[-1].get("content") if messages else ""
+    response_format = (request.get("response_format") or {}).get("type")
+
+    if isinstance(content, list):  # 이미지 분석 요청
+        return detection_json(items) if response_format == "json_schema" else detection_text(items)
+    if response_format == "json_object":  # 영양 정보 일괄 요청
+        names = [line[2:].strip() for line in content.splitlines() if line.startswith("- ")]
+        return json.dumps({name: {"calories": 350, "protein": 12, "carbs": 45, "fat": 9} for name in names}, ensure_ascii=False)
+    return "칼로리: 350kcal\n단백질: 12g\n탄수화물: 45g\n지방: 9g"
+
+
+def make_handler(latency, token_latency, items):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            text = canned_response(request, items)
+            time.sleep(latency)
+
+            if request.get("stream"):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for start in range(0, len(text), 8):
+                    chunk = {"id": "bench", "object": "chat.completion.chunk", "created": 0, "model": request["model"],
+                             "choices": [{"index": 0, "delta": {"content": text[start:start + 8]}, "finish_reason": None}]}
+                    self._write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+                    time.sleep(token_latency)
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                return
+
+            time.sleep(token_latency * len(text) / 8)
+            body = json.dumps({
+                "id": "bench", "object": "chat.completion", "created": 0, "model": request["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }, ensure_ascii=False).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _write_chunk(self, data):
+            data = data.encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 스트림을 중간에 닫는 경우는 정상 동작
+        if not isinstance(sys.exc_info()[1], (ConnectionError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+def serve(port, latency, token_latency, items):
+    StubServer(("127.0.0.1", port), make_handler(latency, token_latency, items)).serve_forever()
+
+
+def start_server(latency, token_latency, items):
+    """측정 대상 프로세스의 CPU/메모리에 섞이지 않도록 별도 프로세스에서 실행"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = multiprocessing.Process(target=serve, args=(port, latency, token_latency, items), daemon=True)
+    process.start()
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("가짜 OpenAI 서버를 시작하지 못했습니다")
+
+
+# ---- 측정 ----
+
+def peak_rss_mb():
+    # 프로세스 전체의 최대 RSS (지금까지의 최고치라 단계별 값이 아니라 누적)
+    # 리눅스는 KB, macOS는 바이트 단위
+    scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def measure(name, func, inputs, repeat):
+    wall, cpu = [], []
+    rss_before = peak_rss_mb()
+    for _ in range(repeat):
+        for value in inputs:
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            func(value)
+            wall.append(time.perf_counter() - wall_start)
+            cpu.append(time.process_time() - cpu_start)
+    wall.sort()
+    result = {
+        "calls": len(wall),
+        "p50_ms": statistics.median(wall) * 1000,
+        "p95_ms": wall[min(len(wall) - 1, int(round(0.95 * (len(wall) - 1))))] * 1000,
+        "cpu_ms": statistics.mean(cpu) * 1000,
+        # process_peak_rss_mb: 이 단계까지의 프로세스 최대 RSS
+        # peak_rss_growth_mb: 이 단계에서 최대 RSS가 늘어난 양 (이전 단계보다 메모리를 더 쓴 경우만 0보다 큼)
+        "process_peak_rss_mb": peak_rss_mb(),
+        "peak_rss_growth_mb": peak_rss_mb() - rss_before,
+    }
+    print(f"{name:<28} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} {result['cpu_ms']:>10.2f} "
+          f"{result['process_peak_rss_mb']:>14.1f} {result['peak_rss_growth_mb']:>12.1f}")
+    return result
+
+
+def first_item(stream):
+    # 첫 아이템까지의 시간만 측정하고 스트림은 바로 닫음
+    try:
+        return next(stream, None)
+    finally:
+        stream.close()
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=project_root, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    print(f"\n기준 결과({baseline.get('commit')}) 대비 p50 변화")
+    for stage, result in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if before:
+            change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0.0
+            print(f"{stage:<28} {before['p50_ms']:>10.2f} -> {result['p50_ms']:>10.2f} ms ({change:+.1f}%)")
+
+
+def run(args):
+    process, port = start_server(args.latency, args.token_latency, args.items)
+
+    # 서버 주소와 캐시/로컬 DB 비활성화는 모듈 import 전에 설정
+    os.environ["OPENAI_API_KEY"] = "bench"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ["FOODSCAN_NUTRIENT_DB"] = str(Path(os.devnull) / "missing.sqlite3")
+
+    from pages.FoodScan import FoodAnalyzer, LogUI
+    from pages.image_ingest import ingest_image
+    from pages.scan_cache import ScanCache
+
+    analyzer = FoodAnalyzer(cache=ScanCache(enabled=False), ui=LogUI())
+    paths = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png"})
+    prepared = [ingest_image(path) for path in paths]
+    foods = analyzer.analyze_image(prepared[0][1], prepared=prepared[0])
+    text = detection_text(args.items)
+
+    print(f"이미지 {len(paths)}개, 음식 {args.items}개, 지연 {args.latency * 1000:.0f}ms + 토큰당 {args.token_latency * 1000:.1f}ms")
+    print(f"{'단계':<28} {'p50(ms)':>10} {'p95(ms)':>10} {'CPU(ms)':>10} {'프로세스 최대RSS':>14} {'최대RSS 증가':>12}")
+    stages = {
+        "ingest_image": measure("ingest_image", ingest_image, paths, args.repeat),
+        "analyze_image": measure("analyze_image", lambda p: analyzer.analyze_image(p[1], prepared=p), prepared, args.repeat),
+        "analyze_image_stream(first)": measure(
+            "analyze_image_stream(first)", lambda p: first_item(analyzer.analyze_image_stream(p[1], prepared=p)), prepared, args.repeat
+        ),
+        "parse_detection_result": measure("parse_detection_result", analyzer.parse_detection_result, [text] * 50, args.repeat),
+        "draw_boxes": measure("draw_boxes", lambda p: analyzer.draw_boxes(p[1], foods, verbose=False), prepared, args.repeat),
+    }
+    for mode in ("sequential", "concurrent", "batch"):
+        stages[f"get_nutrition_info({mode})"] = measure(
+            f"get_nutrition_info({mode})", lambda f: analyzer.get_nutrition_info(f, mode=mode), [foods], args.repeat
+        )
+
+    process.terminate()
+
+    result = {
+        "commit": git_commit(),
+        "datetime": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {"latency": args.latency, "token_latency": args.token_latency, "items": args.items,
+                   "repeat": args.repeat, "images": len(paths)},
+        "stages": stages,
+    }
+    output = Path(args.output or project_root / "benchmarks" / "results" / f"foodscan-{result['commit']}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가짜 OpenAI 서버를 사용한 FoodScan 단계별 벤치마크")
+    parser.add_argument("--images", default=str(project_root / "food_images"), help="샘플 이미지 폴더")
+    parser.add_argument("--latency", type=float, default=0.2, help="요청당 응답 지연(초)")
+    parser.add_argument("--token-latency", type=float, default=0.002, help="8글자 조각당 생성 지연(초)")
+    parser.add_argument("--items", type=int, default=6, help="응답에 포함할 음식 수")
+    parser.add_argument("--repeat", type=int, default=3, help="입력별 반복 횟수")
+    parser.add_argument("-o", "--output", help="결과 JSON 경로 (기본값: benchmarks/results/foodscan-<commit>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    run(parser.parse_args())
@@ -0,0 +1,118 @@
+# benchmarks/bench_hybrid.py
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from langchain_core.documents import Document
+
+from pages.embedding_backend import StubEmbeddings
+from pages.keyword_index import HybridRetriever, KeywordIndex
+
+# 오프라인 측정용 임베딩 (음절 2-gram 해시를 256차원에 누적한 뒤 정규화)
+HashEmbeddings = StubEmbeddings
+
+
+def load_corpus(source_dir, collection):
+    import chromadb
+
+    data = chromadb.PersistentClient(str(source_dir)).get_collection(collection).get(include=["documents", "embeddings"])
+    unique = {}
+    for text, vector in zip(data["documents"], data["embeddings"]):
+        unique.setdefault(text, vector)
+    return list(unique.items())
+
+
+def make_queries(texts, count, seed):
+    """문서 안의 연속된 2~4 단어를 질문으로 사용 (정답은 해당 문서)"""
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        text = rng.choice(texts)
+        words = [word for word in text.split() if any("가" <= char <= "힣" for char in word)]
+        if len(words) < 4:
+            continue
+        size = rng.randint(2, 4)
+        start = rng.randrange(len(words) - size)
+        queries.append((" ".join(words[start:start + size]), text))
+    return queries
+
+
+def evaluate(name, retrieve, queries, k):
+    hits, latencies = 0, []
+    for query, answer in queries:
+        start = time.perf_counter()
+        documents = retrieve(query)
+        latencies.append(time.perf_counter() - start)
+        hits += any(document.page_content == answer for document in documents[:k])
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))]
+    print(f"{name:<12} {hits / len(queries):>10.1%} {statistics.median(latencies) * 1000:>10.2f} {p95 * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벡터 / BM25 / 하이브리드 검색 recall@k와 지연 시간 비교")
+    parser.add_argument("--chroma", default=str(project_root / "chroma"), help="문서를 가져올 Chroma 폴더")
+    parser.add_argument("--collection", default="baseball-chroma", help="컬렉션 이름")
+    parser.add_argument("--queries", type=int, default=200, help="질문 수")
+    parser.add_argument("-k", type=int, default=3, help="recall@k의 k")
+    parser.add_argument("--copies", type=int, default=0,
+                        help="지연 시간 측정용으로 문장을 섞은 가짜 문서를 추가할 배수 (같은 문장을 공유하므로 recall은 낮아짐)")
+    parser.add_argument("--openai", action="store_true", help="저장된 OpenAI 임베딩과 실제 API로 질문 임베딩 (요금 발생)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from langchain_chroma import Chroma
+
+    corpus = load_corpus(args.chroma, args.collection)
+    texts = [text for text, _ in corpus]
+    queries = make_queries(texts, args.queries, args.seed)
+
+    if args.openai:
+        from langchain_openai import OpenAIEmbeddings
+        embeddings, vectors = OpenAIEmbeddings(), [list(vector) for _, vector in corpus]
+    else:
+        embeddings = HashEmbeddings()
+        vectors = embeddings.embed_documents(texts)
+
+    # 문장을 섞어 만든 가짜 문서 (검색 대상 규모를 키워 지연 시간 확인용)
+    rng = random.Random(args.seed)
+    sentences = [sentence for text in texts for sentence in text.split(". ") if sentence]
+    extra = [". ".join(rng.sample(sentences, min(8, len(sentences)))) for _ in range(len(texts) * args.copies)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        vectorstore = Chroma(collection_name="bench-hybrid", embedding_function=embeddings, persist_directory=directory)
+        ids = [f"doc-{index}" for index in range(len(texts) + len(extra))]
+        extra_vectors = (HashEmbeddings() if not args.openai else embeddings).embed_documents(extra) if extra else []
+        for start in range(0, len(ids), 1000):
+            vectorstore._collection.add(
+                ids=ids[start:start + 1000],
+                documents=(texts + extra)[start:start + 1000],
+                embeddings=(vectors + extra_vectors)[start:start + 1000],
+            )
+
+        start = time.perf_counter()
+        index = KeywordIndex(Path(directory) / "keyword-index.sqlite3")
+        index.sync("bench-hybrid", vectorstore._collection)
+        print(f"문서 {len(ids)}개, 질문 {len(queries)}개, 역색인 생성 {time.perf_counter() - start:.2f}초"
+              f" ({'OpenAI' if args.openai else '해시'} 임베딩)")
+
+        hybrid = HybridRetriever(vectorstore=vectorstore, index=index, collection_name="bench-hybrid", k=args.k)
+
+        def bm25(query):
+            found = [id_ for id_, _ in index.search("bench-hybrid", query, args.k)]
+            data = vectorstore._collection.get(ids=found, include=["documents"]) if found else {"ids": [], "documents": []}
+            by_id = dict(zip(data["ids"], data["documents"]))
+            return [Document(page_content=by_id[id_]) for id_ in found if id_ in by_id]
+
+        print(f"{'방식':<12} {'recall@' + str(args.k):>10} {'p50(ms)':>10} {'p95(ms)':>10}")
+        evaluate("vector", lambda query: vectorstore.similarity_search(query, k=args.k), queries, args.k)
+        evaluate("bm25", bm25, queries, args.k)
+        evaluate("hybrid", hybrid.invoke, queries, args.k)
@@ -0,0 +1,80 @@
+# benchmarks/bench_ingest.py
+import argparse
+import base64
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from pages.image_ingest import ingest_image
+
+
+def legacy_ingest(source):
+    """기존 FoodScan.show() + prepare_image 경로 (원본 디코딩 후 두 번 리사이즈)"""
+    image = Image.open(source)
+
+    # show(): 표시용 리사이즈
+    ratio = min(800 / image.size[0], 800 / image.size[1])
+    if ratio < 1:
+        display_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
+        display_image = image.resize(display_size, Image.Resampling.LANCZOS)
+    else:
+        display_image = image
+
+    # prepare_image(): 원본을 다시 리사이즈 후 인코딩
+    ratio = min(800 / image.size[0], 800 / image.size[1])
+    if ratio < 1:
+        new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
+        image = image.resize(new_size, Image.Resampling.LANCZOS)
+    buffered = io.BytesIO()
+    image.save(buffered, format="JPEG", quality=85)
+    return base64.b64encode(buffered.getvalue()).decode(), display_image
+
+
+def make_photo(path, size):
+    """샘플 이미지를 휴대폰 사진 크기로 확대한 JPEG (EXIF 회전 포함)"""
+    image = Image.open(path).convert("RGB").resize(size, Image.Resampling.BICUBIC)
+    exif = Image.Exif()
+    exif[0x0112] = 6  # 90도 회전
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=92, exif=exif)
+    return buffer.getvalue()
+
+
+def measure(func, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(io.BytesIO(data))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이미지 준비 단계 벤치마크 (기존 경로 vs 단일 디코딩 경로)")
+    parser.add_argument("--images", default=str(project_root / "food_images"), help="샘플 이미지 폴더")
+    parser.add_argument("--size", default="4032x3024", help="테스트용 사진 크기 (기본값: 12MP)")
+    parser.add_argument("--repeat", type=int, default=5, help="이미지별 반복 횟수")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split("x"))
+    paths = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png"})
+
+    total_legacy = total_ingest = 0.0
+    print(f"{'이미지':<30} {'기존(ms)':>10} {'개선(ms)':>10} {'배율':>6}")
+    for path in paths:
+        data = make_photo(path, size)
+        legacy = measure(legacy_ingest, data, args.repeat)
+        ingest = measure(ingest_image, data, args.repeat)
+        total_legacy += legacy
+        total_ingest += ingest
+        print(f"{path.name:<30} {legacy * 1000:>10.1f} {ingest * 1000:>10.1f} {legacy / ingest:>5.1f}x")
+
+    print(f"{'합계':<30} {total_legacy * 1000:>10.1f} {total_ingest * 1000:>10.1f} {total_legacy / total_ingest:>5.1f}x")
@@ -0,0 +1,147 @@
+# benchmarks/bench_ingest_pipeline.py
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+os.environ.setdefault("USER_AGENT", "ingest-benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "ingest-benchmark")
+
+SENTENCES = [
+    "야구는 9명의 선수로 이루어진 두 팀이 공격과 수비를 번갈아 하는 경기입니다.",
+    "스트라이크 존은 타자의 겨드랑이와 무릎 사이, 홈 플레이트 위의 공간을 말합니다.",
+    "투수가 던진 공이 스트라이크 존을 벗어나고 타자가 치지 않으면 볼이 선언됩니다.",
+    "김치찌개는 잘 익은 김치와 돼지고기를 넣고 끓이는 대표적인 한국 음식입니다.",
+]
+
+
+# ---- 테스트용 HTTP 서버 ----
+
+def page_html(index, paragraphs):
+    body = "\n".join(
+        f"<p>{index}번 문서 {paragraph}번 문단. {' '.join(SENTENCES)}</p>" for paragraph in range(paragraphs)
+    )
+    return f'<html lang="ko"><head><title>문서 {index}</title></head><body>{body}</body></html>'.encode()
+
+
+def start_fixture_server(paragraphs, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            name = self.path.strip("/").split("/")[-1]
+            if not name.isdigit():
+                self.send_error(404)
+                return
+            body = page_html(int(name), paragraphs)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class FakeEmbeddings:
+    """배치당 고정 지연을 갖는 가짜 임베딩 (OpenAI 호출 대신)"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        time.sleep(self.latency)
+        return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+
+# ---- 측정 ----
+
+def run_legacy(urls, embeddings, batch_size):
+    """기존 방식: URL을 하나씩 WebBaseLoader로 가져와 단일 스레드로 분할한 뒤 임베딩"""
+    from langchain_community.document_loaders import WebBaseLoader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    docs = []
+    for url in urls:
+        docs.extend(WebBaseLoader(url, header_template={"User-Agent": os.environ["USER_AGENT"]}).load())
+    splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(chunk_size=500, chunk_overlap=0, model_name="gpt-4o-mini")
+    chunks = splitter.split_documents(docs)
+    for start in range(0, len(chunks), batch_size):
+        embeddings.embed_documents([chunk.page_content for chunk in chunks[start:start + batch_size]])
+    return len(docs), len(chunks)
+
+
+def run_pipeline(sources, embeddings, batch_size, connections, workers):
+    """새 방식: 동시 수집 + 프로세스 풀 분할 + 청크가 모이는 대로 임베딩"""
+    from pages.ingest_pipeline import IngestPipeline
+
+    pipeline = IngestPipeline(sources, max_connections=connections, workers=workers)
+    batch = []
+    for chunk in pipeline:
+        batch.append(chunk.page_content)
+        if len(batch) >= batch_size:
+            embeddings.embed_documents(batch)
+            batch = []
+    if batch:
+        embeddings.embed_documents(batch)
+    return pipeline.docs, pipeline.chunks
+
+
+def report(name, func):
+    start = time.perf_counter()
+    docs, chunks = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {docs:>8} {chunks:>8} {elapsed:>10.2f} {docs / elapsed:>12.1f}")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="문서 수집 파이프라인 벤치마크 (로컬 HTTP 서버 사용)")
+    parser.add_argument("--docs", type=int, default=200, help="문서 수")
+    parser.add_argument("--paragraphs", type=int, default=40, help="문서당 문단 수")
+    parser.add_argument("--latency", type=float, default=0.05, help="HTTP 응답 지연(초)")
+    parser.add_argument("--embed-latency", type=float, default=0.2, help="임베딩 배치당 지연(초)")
+    parser.add_argument("--batch-size", type=int, default=64, help="임베딩 배치 크기")
+    parser.add_argument("-c", "--connections", type=int, default=16, help="동시 HTTP 연결 수")
+    parser.add_argument("-w", "--workers", type=int, help="분할 작업 프로세스 수")
+    args = parser.parse_args()
+
+    server = start_fixture_server(args.paragraphs, args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/doc/{index}" for index in range(args.docs)]
+
+    print(f"문서 {args.docs}개, 문단 {args.paragraphs}개, HTTP 지연 {args.latency * 1000:.0f}ms, "
+          f"임베딩 배치 {args.batch_size}개당 {args.embed_latency * 1000:.0f}ms")
+    print(f"{'방식':<24} {'문서':>8} {'청크':>8} {'시간(초)':>10} {'docs/sec':>12}")
+    legacy = report("기존 (순차)", lambda: run_legacy(urls, FakeEmbeddings(args.embed_latency), args.batch_size))
+    pipeline = report("파이프라인 (HTTP)", lambda: run_pipeline(
+        urls, FakeEmbeddings(args.embed_latency), args.batch_size, args.connections, args.workers
+    ))
+
+    # 같은 문서를 로컬 폴더에서 읽는 경우
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(args.docs):
+            Path(directory, f"{index}.html").write_bytes(page_html(index, args.paragraphs))
+        report("파이프라인 (로컬 폴더)", lambda: run_pipeline(
+            [directory], FakeEmbeddings(args.embed_latency), args.batch_size, args.connections, args.workers
+        ))
+
+    print(f"\nHTTP 파이프라인 속도 향상: {legacy / pipeline:.1f}x")
+    server.shutdown()
@@ -0,0 +1,113 @@
+# benchmarks/bench_llm_client.py
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+SYSTEM_PROMPT = "당신은 야구 전문가입니다. 주어진 컨텍스트를 바탕으로 답변해주세요.\n\n텍스트:\n{context}"
+CONTEXT = "스트라이크 존은 타자의 겨드랑이와 무릎 사이, 홈 플레이트 위의 공간을 말합니다. " * 20
+
+
+def start_stub_server(latency):
+    """고정 답변을 돌려주는 OpenAI 호환 서버 (새로 맺은 연결 수를 셈)"""
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            # 헤더와 본문을 나눠 쓸 때 Nagle 지연(약 40ms)이 측정에 섞이지 않도록 함
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connections.append(self.client_address)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            body = json.dumps({
+                "id": "bench", "object": "chat.completion", "created": 0, "model": request["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "스트라이크 존은 ..."},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }, ensure_ascii=False).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, connections
+
+
+def per_query_chain():
+    """기존 generate_answer: 질문마다 ChatOpenAI와 프롬프트 체인을 새로 만듦"""
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_openai import ChatOpenAI
+
+    llm = ChatOpenAI(temperature=0)
+    prompt = ChatPromptTemplate.from_messages([("system", SYSTEM_PROMPT), ("human", "{query}")])
+    return prompt | llm
+
+
+def per_query_chain_new_connection():
+    """질문마다 새 HTTP 클라이언트까지 만드는 경우 (기본 클라이언트를 캐시하지 않는 langchain-openai 버전)"""
+    import httpx
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_openai import ChatOpenAI
+
+    llm = ChatOpenAI(temperature=0, http_client=httpx.Client())
+    prompt = ChatPromptTemplate.from_messages([("system", SYSTEM_PROMPT), ("human", "{query}")])
+    return prompt | llm
+
+
+def measure(name, make_chain, repeat, connections):
+    before = len(connections)
+    make_chain().invoke({"context": CONTEXT, "query": "준비"})
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        make_chain().invoke({"context": CONTEXT, "query": "스트라이크 존이 뭐야?"})
+        latencies.append(time.perf_counter() - start)
+    print(f"{name:<24} {statistics.median(latencies) * 1000:>10.2f} {statistics.mean(latencies) * 1000:>10.2f} "
+          f"{len(connections) - before:>10}")
+    return statistics.median(latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="답변 생성 체인 재사용 효과 측정 (가짜 OpenAI 서버 사용)")
+    parser.add_argument("--repeat", type=int, default=200, help="질문 반복 횟수")
+    parser.add_argument("--latency", type=float, default=0.0, help="서버 응답 지연(초), 0이면 클라이언트 오버헤드만 측정")
+    args = parser.parse_args()
+
+    server, connections = start_stub_server(args.latency)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["OPENAI_API_KEY"] = "llm-client-benchmark"
+
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from pages.llm_clients import get_chat_model
+
+    shared = ChatPromptTemplate.from_messages([("system", SYSTEM_PROMPT), ("human", "{query}")]) | get_chat_model()
+
+    print(f"질문 {args.repeat}회, 서버 지연 {args.latency * 1000:.0f}ms (로컬 HTTP라 TLS 핸드셰이크 비용은 포함되지 않음)")
+    print(f"{'방식':<24} {'p50(ms)':>10} {'평균(ms)':>10} {'새 연결 수':>10}")
+    rebuilt = measure("매번 생성", per_query_chain, args.repeat, connections)
+    reconnect = measure("매번 생성 + 새 연결", per_query_chain_new_connection, args.repeat, connections)
+    reused = measure("공유 체인", lambda: shared, args.repeat, connections)
+    print(f"\n질문당 절약: {(rebuilt - reused) * 1000:.2f}ms (새 연결 기준 {(reconnect - reused) * 1000:.2f}ms)")
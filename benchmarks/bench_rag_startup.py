@@ -0,0 +1,45 @@
+# benchmarks/bench_rag_startup.py
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+
+# 새 프로세스에서 페이지 모듈 import 시간과 첫 질문 시 엔진 구성 시간을 측정
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module} as page
+import_time = time.perf_counter() - start
+start = time.perf_counter()
+timings = page.get_rag_engine().warmup() if {warmup} else {{}}
+warmup_time = time.perf_counter() - start
+print(json.dumps({{"import": import_time, "warmup": warmup_time, "stages": timings}}))
+"""
+
+
+def probe(module, warmup):
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "startup-benchmark")
+    code = PROBE.format(root=str(project_root), module=module, warmup=warmup)
+    output = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RAG 페이지 import/첫 질문 준비 시간 측정")
+    parser.add_argument("--repeat", type=int, default=3, help="모듈별 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--no-warmup", action="store_true", help="엔진 구성 시간은 측정하지 않음")
+    args = parser.parse_args()
+
+    print(f"{'모듈':<20} {'import(ms)':>12} {'첫 질문 준비(ms)':>18}  단계별(ms)")
+    for module in ("pages.lg_rag", "pages.FoodRecipe"):
+        runs = [probe(module, not args.no_warmup) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["import"] + run["warmup"])
+        stages = ", ".join(f"{name} {value * 1000:.0f}" for name, value in best["stages"].items())
+        print(f"{module:<20} {best['import'] * 1000:>12.1f} {best['warmup'] * 1000:>18.1f}  {stages}")
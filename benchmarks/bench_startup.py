@@ -0,0 +1,107 @@
+# benchmarks/bench_startup.py
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+
+# 측정 대상: home은 main.py를 실행해 홈 화면을, 나머지는 페이지 모듈 import + show()로 첫 화면을 그림
+# (streamlit bare 모드로 실행하며, 사이드바 선택은 기본값인 홈)
+TARGETS = ["home", "pages.FoodScan", "pages.FoodConsultant", "pages.FoodRecipe", "pages.KnowledgeDB"]
+
+# 첫 화면 로딩 시간 기준값(ms) 파일: --record로 기록해 커밋하고, 기준값 × BUDGET_TOLERANCE를 넘으면 종료 코드 1
+# (반복 측정 간 편차가 10% 안팎이라 40% 여유를 둠, 측정 환경이 바뀌면 다시 기록)
+BASELINE_FILE = Path(__file__).parent / "startup_baseline.json"
+BUDGET_TOLERANCE = 1.4
+
+# 첫 화면에서 로드되면 안 되는 무거운 라이브러리 (해당 기능을 실행할 때만 import)
+HEAVY_MODULES = [
+    "selenium", "webdriver_manager", "pandas", "plotly", "openai", "cv2", "langgraph", "langchain_openai",
+    "langchain_chroma", "langchain_core", "pydantic", "chromadb", "torch", "sentence_transformers",
+]
+
+# 새 프로세스에서 첫 화면을 그리는 시간과 로드된 무거운 라이브러리를 측정
+PROBE = """
+import json, runpy, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+if {target!r} == "home":
+    runpy.run_path({main!r}, run_name="__main__")
+else:
+    __import__({target!r}, fromlist=["show"]).show()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력에서 최상위 패키지별 import 시간(ms) (모듈 자체 시간의 합, 하위 모듈 포함)"""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(own) / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def probe(target):
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "startup-benchmark")
+    # bare 모드 경고(ScriptRunContext 없음)는 출력하지 않음
+    env.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    code = PROBE.format(root=str(project_root), target=target, main=str(project_root / "main.py"), heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], env=env, cwd=project_root, capture_output=True, text=True
+    )
+    if result.returncode:
+        raise RuntimeError(f"{target} 실행 실패:\n{result.stderr[-2000:]}")
+    run = json.loads(result.stdout.strip().splitlines()[-1])
+    run["imports"] = parse_importtime(result.stderr)
+    return run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="홈/페이지 첫 화면 로딩 시간(import 포함) 측정, 예산을 넘으면 실패")
+    parser.add_argument("targets", nargs="*", default=TARGETS, help="측정 대상 (home 또는 페이지 모듈)")
+    parser.add_argument("--repeat", type=int, default=3, help="대상별 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--tolerance", type=float, default=BUDGET_TOLERANCE, help="기준값 대비 허용 배율")
+    parser.add_argument("--record", action="store_true", help="측정값을 기준값 파일에 기록 (예산 검사 안 함)")
+    parser.add_argument("--top", type=int, default=4, help="표시할 import 시간 상위 패키지 수")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+
+    failures = []
+    measured = {}
+    print(f"{'대상':<22} {'첫 화면(ms)':>12} {'예산(ms)':>10}  import 상위 패키지(ms)")
+    for target in args.targets:
+        runs = [probe(target) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        elapsed = best["seconds"] * 1000
+        measured[target] = round(elapsed, 1)
+        budget = baseline[target] * args.tolerance if target in baseline else None
+        imports = ", ".join(f"{name} {value:.0f}" for name, value in list(best["imports"].items())[:args.top])
+        print(f"{target:<22} {elapsed:>12.1f} {budget or 0:>10.0f}  {imports}")
+        if budget is None and not args.record:
+            failures.append(f"{target}: 기준값 없음 (--record로 기록)")
+        elif budget is not None and not args.record and elapsed > budget:
+            failures.append(f"{target}: {elapsed:.0f}ms > 예산 {budget:.0f}ms (기준값 {baseline[target]:.0f}ms)")
+        if best["heavy"]:
+            failures.append(f"{target}: 첫 화면에서 무거운 라이브러리 로드 ({', '.join(best['heavy'])})")
+
+    if args.record:
+        BASELINE_FILE.write_text(json.dumps({**baseline, **measured}, indent=2) + "\n")
+        print(f"\n기준값을 기록했습니다: {BASELINE_FILE}")
+
+    if failures:
+        print("\n실패:")
+        for failure in failures:
+            print(f"- {failure}")
+        raise SystemExit(1)
+    print("\n모든 대상이 예산 안에 있습니다.")
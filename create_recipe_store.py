@@ -0,0 +1,243 @@
+# create_recipe_store.py
+import argparse
+import hashlib
+import itertools
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from create_vectorstore import EMBED_BATCH_SIZE, PERSIST_DIRECTORY, chunk_id
+from pages.embedding_backend import get_embeddings
+from pages.embedding_config import EMBEDDING_BACKEND, collection_name_for
+from pages.flat_index import FLAT_INDEX_DIR, export_collection
+from pages.keyword_index import KEYWORD_INDEX_FILE, KeywordIndex
+from pages.recipe_corpus import chunk_recipe, normalize_recipe, read_recipes
+
+load_dotenv()
+
+COLLECTION_NAME = "food-recipe"
+
+# 진행 상황(처리한 레시피 수, 저장한 청크 ID)을 기록하는 체크포인트 폴더
+CHECKPOINT_DIRECTORY = Path(os.getenv("RECIPE_CHECKPOINT_DIRECTORY", Path(__file__).resolve().parent / ".cache"))
+# 진행 상황을 출력하는 간격(초)
+REPORT_INTERVAL = 10
+
+
+def file_fingerprint(paths):
+    """입력 파일 경로/크기/수정 시각 (바뀌면 체크포인트를 쓰지 않고 처음부터)"""
+    parts = []
+    for path in paths:
+        stat = Path(path).stat()
+        parts.append(f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """처리한 레시피 수와 저장한 청크 ID를 SQLite에 기록 (중단 후 이어서 실행, 메모리에 ID를 모으지 않음)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY) WITHOUT ROWID;"""
+        )
+
+    def get(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def reset(self, fingerprint):
+        self._conn.execute("DELETE FROM state")
+        self._conn.execute("DELETE FROM seen")
+        self._conn.execute("INSERT INTO state (key, value) VALUES ('fingerprint', ?)", (fingerprint,))
+        self._conn.commit()
+
+    def commit(self, ids, counters):
+        """배치를 컬렉션에 저장한 뒤 호출 (한 트랜잭션으로 ID와 카운터를 함께 기록)"""
+        self._conn.executemany("INSERT OR IGNORE INTO seen (id) VALUES (?)", [(id_,) for id_ in ids])
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+            [(key, str(value)) for key, value in counters.items()],
+        )
+        self._conn.commit()
+
+    def unseen(self, ids):
+        """ids 중 이번 실행에서 만들지 않은 ID (삭제 대상)"""
+        placeholders = ",".join("?" * len(ids))
+        found = {row[0] for row in self._conn.execute(f"SELECT id FROM seen WHERE id IN ({placeholders})", ids)}
+        return [id_ for id_ in ids if id_ not in found]
+
+    def close(self, remove=False):
+        self._conn.close()
+        if remove:
+            self.path.unlink(missing_ok=True)
+
+
+def build_recipe_store(paths, collection=COLLECTION_NAME, backend=EMBEDDING_BACKEND, batch_size=EMBED_BATCH_SIZE,
+                       full=False, restart=False, limit=None, prune=True):
+    """레시피 덤프(CSV/JSONL)를 스트리밍으로 읽어 레시피 단위로 나눈 청크를 컬렉션에 저장
+
+    배치(batch_size개 청크)마다 임베딩/저장하고 체크포인트를 남기므로 메모리 사용량이 입력 크기와 무관하며,
+    중단되면 같은 명령으로 마지막 배치 다음부터 이어서 실행합니다.
+    prune: 입력을 끝까지 처리한 뒤 입력에 없는 기존 청크를 삭제
+    """
+    from langchain_chroma import Chroma
+
+    start = time.perf_counter()
+    collection_name = collection_name_for(collection, backend)
+    embeddings = get_embeddings(backend)
+    vectorstore = Chroma(
+        collection_name=collection_name, embedding_function=embeddings, persist_directory=str(PERSIST_DIRECTORY)
+    )
+    index = KeywordIndex(PERSIST_DIRECTORY / KEYWORD_INDEX_FILE)
+
+    checkpoint = Checkpoint(CHECKPOINT_DIRECTORY / f"recipe-build-{collection_name}.sqlite3")
+    fingerprint = file_fingerprint(paths)
+    resume = not restart and checkpoint.get("fingerprint") == fingerprint
+    if not resume:
+        checkpoint.reset(fingerprint)
+        if full:
+            # 전체 재구성: 컬렉션과 역색인을 비우고 시작 (이어서 실행할 때는 비우지 않음)
+            vectorstore.delete_collection()
+            vectorstore = Chroma(
+                collection_name=collection_name, embedding_function=embeddings,
+                persist_directory=str(PERSIST_DIRECTORY),
+            )
+            index.clear(collection_name)
+    else:
+        index.sync(collection_name, vectorstore._collection)
+    chroma = vectorstore._collection
+
+    counters = {key: int(checkpoint.get(key, 0)) for key in ("recipes", "skipped_recipes", "chunks", "added")}
+    done = counters["recipes"]
+    if resume and done:
+        print(f"체크포인트에서 이어서 실행: 레시피 {done}개 처리됨, 청크 {counters['chunks']}개")
+
+    pending = {}
+    in_flight = None
+    embed_seconds = 0.0
+    run_start, last_report, run_recipes, run_chunks = time.perf_counter(), time.perf_counter(), 0, 0
+    # 임베딩(API 대기)과 이전 배치의 Chroma/역색인 저장을 겹쳐서 실행 (메모리에는 최대 2개 배치만 유지)
+    embedder = ThreadPoolExecutor(max_workers=1)
+
+    def embed(texts):
+        nonlocal embed_seconds
+        embed_start = time.perf_counter()
+        vectors = embeddings.embed_documents(texts)
+        embed_seconds += time.perf_counter() - embed_start
+        return vectors
+
+    def write(batch):
+        ids, new_ids, texts, metadatas, future, snapshot = batch
+        if new_ids:
+            chroma.upsert(ids=new_ids, embeddings=future.result(), documents=texts, metadatas=metadatas)
+            index.add(collection_name, new_ids, texts)
+        # 저장이 끝난 배치까지만 체크포인트에 기록
+        checkpoint.commit(ids, snapshot)
+
+    def flush():
+        nonlocal in_flight
+        ids = list(pending)
+        # 이미 저장된 청크(이전 실행/증분 갱신)는 다시 임베딩하지 않음
+        existing = set(chroma.get(ids=ids, include=[])["ids"])
+        new_ids = [id_ for id_ in ids if id_ not in existing]
+        texts = [pending[id_].page_content for id_ in new_ids]
+        metadatas = [pending[id_].metadata for id_ in new_ids]
+        counters["added"] += len(new_ids)
+        future = embedder.submit(embed, texts) if new_ids else None
+        if in_flight is not None:
+            write(in_flight)
+        in_flight = (ids, new_ids, texts, metadatas, future, dict(counters))
+        pending.clear()
+
+    rows = itertools.chain.from_iterable(read_recipes(path) for path in paths)
+    for number, row in enumerate(itertools.islice(rows, limit), 1):
+        # 체크포인트까지 처리한 레시피는 읽기만 하고 넘어감
+        if number <= done:
+            continue
+        recipe = normalize_recipe(row, number)
+        counters["recipes"] = number
+        run_recipes += 1
+        if recipe is None:
+            counters["skipped_recipes"] += 1
+            continue
+        for doc in chunk_recipe(recipe):
+            pending.setdefault(chunk_id(doc.metadata["source"], doc.page_content), doc)
+        # 레시피 경계에서만 저장해 체크포인트가 레시피 단위로 맞아떨어지게 함
+        if len(pending) >= batch_size:
+            counters["chunks"] += len(pending)
+            run_chunks += len(pending)
+            flush()
+            if time.perf_counter() - last_report >= REPORT_INTERVAL:
+                last_report = time.perf_counter()
+                elapsed = last_report - run_start
+                print(
+                    f"레시피 {counters['recipes']}개 / 청크 {counters['chunks']}개 "
+                    f"(새로 임베딩 {counters['added']}개) - {run_recipes / elapsed:.1f} recipes/s, "
+                    f"{run_chunks / elapsed:.1f} chunks/s"
+                )
+    if pending:
+        counters["chunks"] += len(pending)
+        run_chunks += len(pending)
+        flush()
+    if in_flight is not None:
+        write(in_flight)
+    embedder.shutdown()
+
+    deleted = 0
+    if prune and not limit:
+        # 입력에 없는 기존 청크(삭제/변경된 레시피)를 페이지 단위로 확인해 삭제
+        offset = 0
+        while True:
+            ids = chroma.get(include=[], limit=5000, offset=offset)["ids"]
+            if not ids:
+                break
+            stale = checkpoint.unseen(ids)
+            if stale:
+                chroma.delete(ids=stale)
+                index.delete(collection_name, stale)
+                deleted += len(stale)
+            offset += len(ids) - len(stale)
+
+    # 내용이 바뀌면 버전을 올려 답변 캐시가 이전 답변을 쓰지 않도록 함
+    if counters["added"] or deleted:
+        metadata = dict(chroma.metadata or {})
+        metadata["content_version"] = str(time.time_ns())
+        chroma.modify(metadata=metadata)
+    if (PERSIST_DIRECTORY / FLAT_INDEX_DIR / f"{collection_name}.npy").exists():
+        export_collection(chroma, PERSIST_DIRECTORY / FLAT_INDEX_DIR)
+
+    elapsed = time.perf_counter() - run_start
+    print(
+        f"레시피 {counters['recipes']}개 (제목 없음 {counters['skipped_recipes']}개), 청크 {counters['chunks']}개, "
+        f"새로 임베딩 {counters['added']}개, 삭제 {deleted}개, 컬렉션 청크 {chroma.count()}개"
+    )
+    print(
+        f"이번 실행: {run_recipes / elapsed if elapsed else 0:.1f} recipes/s, "
+        f"{run_chunks / elapsed if elapsed else 0:.1f} chunks/s (임베딩 {embed_seconds:.1f}초, "
+        f"전체 {time.perf_counter() - start:.1f}초)"
+    )
+    # 끝까지 처리했으면 체크포인트 삭제 (일부만 처리한 --limit 실행은 남겨 이어서 실행 가능)
+    checkpoint.close(remove=not limit)
+    return counters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="레시피 덤프(CSV/JSONL)로 food-recipe 벡터 스토어 생성/갱신")
+    parser.add_argument("paths", nargs="+", help="레시피 파일 (.csv, .jsonl, .gz 압축 가능)")
+    parser.add_argument("--collection", default=COLLECTION_NAME, help="컬렉션 이름")
+    parser.add_argument("--backend", choices=["openai", "local", "stub"], default=EMBEDDING_BACKEND, help="임베딩 백엔드")
+    parser.add_argument("-b", "--batch-size", type=int, default=EMBED_BATCH_SIZE, help="한 번에 임베딩/저장할 청크 수")
+    parser.add_argument("--full", action="store_true", help="컬렉션을 비우고 전체를 다시 임베딩")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    parser.add_argument("--limit", type=int, help="앞에서부터 이 수의 레시피만 처리 (체크포인트는 남김)")
+    parser.add_argument("--no-prune", action="store_true", help="입력에 없는 기존 청크를 삭제하지 않음")
+    args = parser.parse_args()
+    build_recipe_store(args.paths, collection=args.collection, backend=args.backend, batch_size=args.batch_size,
+                       full=args.full, restart=args.restart, limit=args.limit, prune=not args.no_prune)
@@ -1,60 +1,173 @@
 from dotenv import load_dotenv
 from langchain_chroma import Chroma
-from langchain_community.document_loaders import WebBaseLoader
-from langchain_openai import OpenAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.embeddings import Embeddings
+import argparse
+import hashlib
 import os
+import time
 from pathlib import Path
 
+from pages.embedding_backend import get_embeddings
+from pages.embedding_config import EMBEDDING_BACKEND, collection_name_for
+from pages.flat_index import FLAT_INDEX_DIR, export_collection
+from pages.ingest_pipeline import DEFAULT_MAX_CONNECTIONS, IngestPipeline
+from pages.keyword_index import KEYWORD_INDEX_FILE, KeywordIndex
+
 load_dotenv()
 
 # 환경 변수 설정
 os.environ["USER_AGENT"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 # OpenAI API 키 설정
-# Chroma DB 경로 설정
-PERSIST_DIRECTORY = Path(__file__).parent / "chroma"
-
-def create_vectorstore():
-    """벡터 스토어 생성 및 저장"""
-    # URL 목록
-    urls = [
-        "https://namu.wiki/w/%EC%95%BC%EA%B5%AC/%EA%B2%BD%EA%B8%B0%20%EB%B0%A9%EC%8B%9D",
-        "https://food-wiki-mate.streamlit.app/"  # 추가된 URL
-    ]
+# Chroma DB 경로 설정 (환경 변수로 변경 가능)
+PERSIST_DIRECTORY = Path(os.getenv("CHROMA_PERSIST_DIRECTORY", Path(__file__).parent / "chroma"))
+COLLECTION_NAME = "baseball-chroma"
+
+# URL 목록
+URLS = [
+    "https://namu.wiki/w/%EC%95%BC%EA%B5%AC/%EA%B2%BD%EA%B8%B0%20%EB%B0%A9%EC%8B%9D",
+    "https://food-wiki-mate.streamlit.app/"  # 추가된 URL
+]
+
+# 한 번의 임베딩 요청에 보낼 청크 수
+EMBED_BATCH_SIZE = 256
+
+
+class CountingEmbeddings(Embeddings):
+    """임베딩 요청 횟수와 청크 수를 세는 래퍼"""
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.calls = 0
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        self.embedded += len(texts)
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+
+def chunk_id(source, text):
+    """출처와 내용으로 만든 청크 ID (내용이 같으면 같은 ID)"""
+    return hashlib.sha256(f"{source}\0{text}".encode("utf-8")).hexdigest()
+
+
+def sync_collection(vectorstore, doc_splits, sources, loaded_sources, index=None):
+    """청크 해시를 비교해 새로 생기거나 바뀐 청크만 임베딩/추가하고 사라진 청크는 삭제
+
+    doc_splits는 제너레이터여도 되며, 청크가 들어오는 대로 배치 단위로 임베딩합니다.
+    sources: 현재 수집 대상 출처 전체 (목록에서 빠진 출처의 청크는 삭제)
+    loaded_sources: 로드에 성공한 출처 (doc_splits를 모두 읽은 뒤 확인, 로드 실패한 출처의 기존 청크는 유지)
+    index: 함께 갱신할 BM25 역색인 (KeywordIndex)
+    """
+    collection = vectorstore._collection
+    if index is not None:
+        index.sync(collection.name, collection)
 
-    headers = {
-        "User-Agent": os.environ["USER_AGENT"]
+    # 기존 청크의 ID와 출처
+    existing = collection.get(include=["metadatas"])
+    existing_sources = {
+        id_: (metadata or {}).get("source", "") for id_, metadata in zip(existing["ids"], existing["metadatas"])
     }
 
-    # 문서 로드
-    docs = []
-    for url in urls:
-        try:
-            loader = WebBaseLoader(url, header_template=headers)
-            url_docs = loader.load()
-            docs.extend(url_docs)
-            print(f"Successfully loaded: {url}")
-        except Exception as e:
-            print(f"Error loading {url}: {e}")
-    
-    docs_list = [item for item in docs]
-
-    # 문서 분할
-    text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-        chunk_size=500, chunk_overlap=0, model_name="gpt-4o-mini"
-    )
-    doc_splits = text_splitter.split_documents(docs_list)
+    seen = set()
+    pending = {}
+    added = 0
+
+    def flush():
+        texts = [doc.page_content for doc in pending.values()]
+        vectorstore.add_texts(texts=texts, metadatas=[doc.metadata for doc in pending.values()], ids=list(pending))
+        if index is not None:
+            index.add(collection.name, list(pending), texts)
+        pending.clear()
+
+    for doc in doc_splits:
+        id_ = chunk_id(doc.metadata.get("source", ""), doc.page_content)
+        # 같은 출처 안의 중복 청크와 이미 저장된 청크는 건너뜀
+        if id_ in seen:
+            continue
+        seen.add(id_)
+        if id_ in existing_sources:
+            continue
+        pending[id_] = doc
+        added += 1
+        if len(pending) >= EMBED_BATCH_SIZE:
+            flush()
+    if pending:
+        flush()
+
+    to_delete = [
+        id_ for id_, source in existing_sources.items()
+        if id_ not in seen and (source not in sources or source in loaded_sources)
+    ]
+    if to_delete:
+        collection.delete(ids=to_delete)
+        if index is not None:
+            index.delete(collection.name, to_delete)
+
+    # 내용이 바뀌면 버전을 올려 답변 캐시가 이전 답변을 쓰지 않도록 함
+    if added or to_delete:
+        metadata = dict(collection.metadata or {})
+        metadata["content_version"] = str(time.time_ns())
+        collection.modify(metadata=metadata)
+
+    return {"added": added, "deleted": len(to_delete), "kept": len(existing_sources) - len(to_delete)}
 
-    # 벡터 스토어 생성 및 저장
-    vectorstore = Chroma.from_documents(
-        documents=doc_splits,
-        collection_name="baseball-chroma",
-        embedding=OpenAIEmbeddings(),
+
+def create_vectorstore(sources=None, full=False, max_connections=DEFAULT_MAX_CONNECTIONS, workers=None,
+                       backend=EMBEDDING_BACKEND):
+    """벡터 스토어 생성 및 저장 (기본은 바뀐 청크만 반영하는 증분 모드)
+
+    sources: URL, 로컬 파일 또는 폴더 목록 (기본값: URLS)
+    backend: 임베딩 백엔드 (openai / local, local은 별도 컬렉션에 저장)
+    """
+    start = time.perf_counter()
+    pipeline = IngestPipeline(sources or URLS, max_connections=max_connections, workers=workers)
+
+    embeddings = CountingEmbeddings(get_embeddings(backend))
+    collection_name = collection_name_for(COLLECTION_NAME, backend)
+    vectorstore = Chroma(
+        collection_name=collection_name,
+        embedding_function=embeddings,
         persist_directory=str(PERSIST_DIRECTORY),
     )
+    if full:
+        # 전체 재구성: 컬렉션을 지우고 다시 만듦
+        vectorstore.delete_collection()
+        vectorstore = Chroma(
+            collection_name=collection_name,
+            embedding_function=embeddings,
+            persist_directory=str(PERSIST_DIRECTORY),
+        )
+
+    # 수집/분할/임베딩이 겹쳐서 진행됨
+    index = KeywordIndex(PERSIST_DIRECTORY / KEYWORD_INDEX_FILE)
+    result = sync_collection(vectorstore, pipeline, set(pipeline.sources), pipeline.loaded, index=index)
+    # 평면 벡터 인덱스를 내보낸 적이 있으면 바뀐 내용으로 다시 내보냄
+    if (PERSIST_DIRECTORY / FLAT_INDEX_DIR / f"{collection_name}.npy").exists():
+        export_collection(vectorstore._collection, PERSIST_DIRECTORY / FLAT_INDEX_DIR)
+    stats = pipeline.stats()
+    print(
+        f"문서 {stats['docs']}개 (실패 {stats['failed']}개), 청크 {stats['chunks']}개, "
+        f"{stats['docs_per_sec']:.1f} docs/sec"
+    )
+    print(
+        f"추가 {result['added']}개 / 삭제 {result['deleted']}개 / 유지 {result['kept']}개 "
+        f"(임베딩 요청 {embeddings.calls}회, {time.perf_counter() - start:.1f}초)"
+    )
     print("Vector store created and saved successfully!")
     return vectorstore
 
 if __name__ == "__main__":
-    create_vectorstore()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="야구 지식 벡터 스토어 생성/갱신")
+    parser.add_argument("sources", nargs="*", help="URL, 로컬 파일 또는 폴더 (기본값: URLS)")
+    parser.add_argument("--full", action="store_true", help="컬렉션을 지우고 전체를 다시 임베딩")
+    parser.add_argument("-c", "--connections", type=int, default=DEFAULT_MAX_CONNECTIONS, help="동시 HTTP 연결 수")
+    parser.add_argument("-w", "--workers", type=int, help="분할 작업 프로세스 수")
+    parser.add_argument("--backend", choices=["openai", "local", "stub"], default=EMBEDDING_BACKEND, help="임베딩 백엔드")
+    args = parser.parse_args()
+    create_vectorstore(args.sources, full=args.full, max_connections=args.connections, workers=args.workers,
+                       backend=args.backend)
@@ -0,0 +1,288 @@
+# evaluate_retrieval.py
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROJECT_ROOT = Path(__file__).parent
+RESULTS_DIRECTORY = PROJECT_ROOT / "evaluation" / "results"
+
+# 평가할 컬렉션과 그 컬렉션을 쓰는 페이지 모듈 (페이지와 같은 리트리버 설정으로 평가)
+PAGE_MODULES = {
+    "baseball-chroma": "pages.lg_rag",
+    "food-recipe": "pages.FoodRecipe",
+}
+
+
+def load_dataset(path):
+    """{"query": ..., "relevant_ids": [...], "relevant_texts": [...]} 형식의 JSONL 읽기
+
+    relevant_texts는 청크 본문에 포함되어야 하는 문구입니다 (청크 크기가 바뀌어도 그대로 쓸 수 있음).
+    """
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            labels = [("id", value) for value in item.get("relevant_ids", [])]
+            labels += [("text", value) for value in item.get("relevant_texts", [])]
+            if not item.get("query") or not labels:
+                raise ValueError(f"{path}:{line_number}: query와 relevant_ids/relevant_texts가 필요합니다")
+            items.append({"query": item["query"], "labels": labels})
+    return items
+
+
+def load_queries(path):
+    """{"query": ...} 형식의 JSONL에서 질문만 읽기 (컬렉션과 무관한 질문 목록)"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["query"] for line in f if line.strip()]
+
+
+def top_score(docs):
+    """RagEngine.should_retrieve와 같은 검색 점수 (벡터 검색 유사도의 최댓값)"""
+    return max((doc.metadata.get("relevance_score", 0.0) for doc in docs), default=0.0)
+
+
+def suggest_thresholds(on_topic, off_topic):
+    """검색 점수 분포로 SCORE_FLOOR / REWRITE_BELOW 제안
+
+    - SCORE_FLOOR: 무관한 질문 p95와 관련 질문 p5의 중간 (분포가 겹치면 무관한 질문 p95)
+    - REWRITE_BELOW: 관련 질문 p25 (점수가 낮은 쪽 1/4은 검색어를 다시 써서 재검색)
+    """
+    off_high, on_low = percentile(off_topic, 0.95), percentile(on_topic, 0.05)
+    floor = (off_high + on_low) / 2 if on_low > off_high else off_high
+    return {
+        "score_floor": round(floor, 3),
+        "rewrite_below": round(max(percentile(on_topic, 0.25), floor), 3),
+        "separable": on_low > off_high,
+    }
+
+
+def matches(doc, label):
+    kind, value = label
+    return doc.id == value if kind == "id" else value in doc.page_content
+
+
+def score_query(docs, labels, ks):
+    """질문 하나의 recall@k와 첫 정답 순위(없으면 None)"""
+    recall = {k: sum(any(matches(doc, label) for doc in docs[:k]) for label in labels) / len(labels) for k in ks}
+    rank = next((i + 1 for i, doc in enumerate(docs) if any(matches(doc, label) for label in labels)), None)
+    return recall, rank
+
+
+def percentile(values, ratio):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(ratio * (len(values) - 1))))]
+
+
+def prepare_stub_store(persist_directory, collection_name):
+    """Chroma 폴더를 임시 폴더로 복사하고, 스텁 임베딩으로 다시 임베딩한 컬렉션을 만듦 (원본은 건드리지 않음)"""
+    import chromadb
+
+    from pages.embedding_backend import StubEmbeddings
+    from pages.embedding_config import collection_name_for
+
+    directory = Path(tempfile.mkdtemp(prefix="eval-chroma-"))
+    shutil.copytree(persist_directory, directory, dirs_exist_ok=True)
+    client = chromadb.PersistentClient(str(directory))
+    source = client.get_collection(collection_name)
+    data = source.get(include=["documents", "metadatas"])
+    target = client.get_or_create_collection(
+        collection_name_for(collection_name, "stub"), metadata=dict(source.metadata or {}) or None
+    )
+    embeddings = StubEmbeddings()
+    for start in range(0, len(data["ids"]), 1000):
+        target.upsert(
+            ids=data["ids"][start:start + 1000],
+            documents=data["documents"][start:start + 1000],
+            metadatas=[metadata or None for metadata in data["metadatas"][start:start + 1000]],
+            embeddings=embeddings.embed_documents(data["documents"][start:start + 1000]),
+        )
+    return directory
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def evaluate(dataset_path, collection_name, ks, backend, mode, flat_index, chroma=None, off_topic_path=None):
+    """페이지 모듈의 리트리버로 데이터셋을 평가해 결과 딕셔너리 반환"""
+    dataset = load_dataset(dataset_path)
+    persist_directory = Path(chroma or os.getenv("CHROMA_PERSIST_DIRECTORY", PROJECT_ROOT / "chroma"))
+
+    # 페이지 모듈이 읽는 설정은 import 전에 환경 변수로 지정
+    os.environ["EMBEDDING_BACKEND"] = backend
+    os.environ["RAG_RETRIEVAL_MODE"] = mode
+    os.environ["RAG_FLAT_INDEX"] = flat_index
+    # 질문 임베딩 캐시가 지연 시간에 섞이지 않도록 빈 캐시 사용
+    temporary = [Path(tempfile.mkdtemp(prefix="eval-cache-"))]
+    os.environ["RAG_EMBEDDING_CACHE_PATH"] = str(temporary[0] / "embeddings.sqlite3")
+    if backend == "stub":
+        # 답변 체인 생성에 필요한 키만 채움 (평가는 검색만 하므로 API를 호출하지 않음)
+        if not os.getenv("OPENAI_API_KEY"):
+            os.environ["OPENAI_API_KEY"] = "offline-evaluation"
+        persist_directory = prepare_stub_store(persist_directory, collection_name)
+        temporary.append(persist_directory)
+    os.environ["CHROMA_PERSIST_DIRECTORY"] = str(persist_directory)
+    try:
+        return _evaluate(dataset, dataset_path, collection_name, ks, backend, mode, chroma, off_topic_path)
+    finally:
+        for directory in temporary:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def _evaluate(dataset, dataset_path, collection_name, ks, backend, mode, chroma, off_topic_path=None):
+    page = importlib.import_module(PAGE_MODULES[collection_name])
+    engine = page.get_rag_engine()
+    start = time.perf_counter()
+    retriever = engine.retriever
+    load_seconds = time.perf_counter() - start
+    retriever.k = max(ks)
+    chunks = engine.vectorstore._collection.count()
+    if not chunks:
+        print(f"경고: {engine.collection_name} 컬렉션이 비어 있습니다.")
+
+    retriever.invoke(dataset[0]["query"])  # 첫 호출(연결/인덱스 준비)은 측정에서 제외
+    queries, latencies = [], []
+    for item in dataset:
+        start = time.perf_counter()
+        docs = retriever.invoke(item["query"])
+        latency = time.perf_counter() - start
+        recall, rank = score_query(docs, item["labels"], ks)
+        latencies.append(latency)
+        queries.append({
+            "query": item["query"],
+            "score": top_score(docs),
+            "rank": rank,
+            "recall": {str(k): value for k, value in recall.items()},
+            "latency_ms": latency * 1000,
+        })
+
+    metrics = {f"recall@{k}": statistics.mean(query["recall"][str(k)] for query in queries) for k in ks}
+    metrics["mrr"] = statistics.mean(1 / query["rank"] if query["rank"] else 0.0 for query in queries)
+    metrics["latency_ms"] = {
+        "p50": statistics.median(latencies) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "mean": statistics.mean(latencies) * 1000,
+    }
+    calibration = None
+    if off_topic_path:
+        # 관련 질문과 무관한 질문의 검색 점수 분포 (답변 생략/재검색 기준 보정용)
+        on_topic = [query["score"] for query in queries]
+        off_topic = [top_score(retriever.invoke(query)) for query in load_queries(off_topic_path)]
+        calibration = {
+            "on_topic": {"p5": percentile(on_topic, 0.05), "p25": percentile(on_topic, 0.25),
+                         "p50": statistics.median(on_topic), "max": max(on_topic)},
+            "off_topic": {"min": min(off_topic), "p50": statistics.median(off_topic),
+                          "p95": percentile(off_topic, 0.95), "max": max(off_topic)},
+            "suggested": suggest_thresholds(on_topic, off_topic),
+            "off_topic_dataset": str(off_topic_path),
+        }
+    return {
+        "calibration": calibration,
+        "config": {
+            "dataset": str(dataset_path),
+            "dataset_sha256": hashlib.sha256(Path(dataset_path).read_bytes()).hexdigest()[:12],
+            "collection": engine.collection_name,
+            "chunks": chunks,
+            "backend": backend,
+            "embedding_model": engine._embeddings.model,
+            "mode": mode,
+            "flat_index": retriever.flat_index is not None,
+            "k": ks,
+            "chroma": str(chroma or ""),
+            "git": git_revision(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "metrics": metrics,
+        "load_seconds": load_seconds,
+        "queries": queries,
+    }
+
+
+def print_results(results):
+    """여러 결과 파일의 지표를 한 표로 출력"""
+    ks = sorted({k for result in results for k in result["config"]["k"]})
+    header = f"{'설정':<36} " + " ".join(f"{'R@' + str(k):>7}" for k in ks) + f" {'MRR':>7} {'p50(ms)':>9} {'p95(ms)':>9}"
+    print(header)
+    for result in results:
+        config, metrics = result["config"], result["metrics"]
+        name = result.get("label") or f"{config['collection']}/{config['backend']}/{config['mode']}"
+        recalls = " ".join(
+            f"{metrics[f'recall@{k}']:>7.1%}" if f"recall@{k}" in metrics else f"{'-':>7}" for k in ks
+        )
+        print(f"{name[:36]:<36} {recalls} {metrics['mrr']:>7.3f} "
+              f"{metrics['latency_ms']['p50']:>9.2f} {metrics['latency_ms']['p95']:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RAG 리트리버의 recall@k / MRR / 질문 지연 시간 평가")
+    parser.add_argument("dataset", nargs="?", help="라벨된 질문 JSONL (예: evaluation/baseball-chroma.jsonl)")
+    parser.add_argument("--collection", choices=sorted(PAGE_MODULES),
+                        help="평가할 컬렉션 (기본값: 데이터셋 파일 이름)")
+    parser.add_argument("-k", type=int, nargs="+", default=[1, 3, 5], help="recall@k의 k 목록")
+    parser.add_argument("--backend", choices=["openai", "local", "stub"], default=os.getenv("EMBEDDING_BACKEND", "openai"),
+                        help="임베딩 백엔드 (stub: 네트워크 없이 임시 복사본을 해시 임베딩으로 다시 만들어 평가)")
+    parser.add_argument("--mode", choices=["hybrid", "vector"], default=os.getenv("RAG_RETRIEVAL_MODE", "hybrid"),
+                        help="검색 방식")
+    parser.add_argument("--flat-index", choices=["off", "auto", "on"], default=os.getenv("RAG_FLAT_INDEX", "auto"),
+                        help="memmap 평면 인덱스 사용 여부")
+    parser.add_argument("--chroma", help="평가할 Chroma 폴더 (기본값: CHROMA_PERSIST_DIRECTORY 또는 chroma)")
+    parser.add_argument("--off-topic", metavar="JSONL",
+                        help="컬렉션과 무관한 질문 목록 (예: evaluation/off-topic.jsonl), 주면 검색 점수 분포와 "
+                             "RAG_SCORE_FLOOR / RAG_REWRITE_BELOW 제안값을 함께 출력")
+    parser.add_argument("--label", help="결과에 붙일 설정 이름 (비교 표에 표시)")
+    parser.add_argument("-o", "--output", help="결과 JSON 경로 (기본값: evaluation/results/<설정>-<시각>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT", help="저장된 결과 JSON들을 비교해 출력하고 종료")
+    args = parser.parse_args()
+
+    if args.compare:
+        print_results([json.loads(Path(path).read_text(encoding="utf-8")) for path in args.compare])
+        raise SystemExit
+    if not args.dataset:
+        parser.error("dataset 또는 --compare가 필요합니다")
+
+    collection = args.collection or Path(args.dataset).stem
+    if collection not in PAGE_MODULES:
+        parser.error(f"컬렉션을 알 수 없습니다: {collection} (--collection으로 지정)")
+
+    result = evaluate(args.dataset, collection, sorted(args.k), args.backend, args.mode, args.flat_index, args.chroma,
+                      args.off_topic)
+    result["label"] = args.label or f"{collection}-{args.backend}-{args.mode}"
+    output = Path(args.output) if args.output else (
+        RESULTS_DIRECTORY / f"{result['label']}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print_results([result])
+    if result["calibration"]:
+        calibration = result["calibration"]
+        print("\n검색 점수 분포 (상위 문서의 relevance_score)")
+        for name, label in (("on_topic", "관련 질문"), ("off_topic", "무관한 질문")):
+            print(f"  {label}: " + ", ".join(f"{key} {value:.3f}" for key, value in calibration[name].items()))
+        suggested = calibration["suggested"]
+        print(f"제안: RAG_SCORE_FLOOR={suggested['score_floor']} RAG_REWRITE_BELOW={suggested['rewrite_below']}"
+              + ("" if suggested["separable"] else " (분포가 겹침: 일부 관련 질문도 답변 생략)"))
+    misses = [query["query"] for query in result["queries"] if not query["rank"]]
+    if misses:
+        print(f"정답을 찾지 못한 질문 {len(misses)}개: " + ", ".join(misses[:5]) + (" ..." if len(misses) > 5 else ""))
+    print(f"결과 저장: {output}")
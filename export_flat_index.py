@@ -0,0 +1,36 @@
+# export_flat_index.py
+import argparse
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from pages.flat_index import FLAT_INDEX_DIR, export_collection
+
+load_dotenv()
+
+# Chroma DB 경로 설정 (환경 변수로 변경 가능)
+PERSIST_DIRECTORY = Path(os.getenv("CHROMA_PERSIST_DIRECTORY", Path(__file__).parent / "chroma"))
+
+
+def export_flat_indexes(names=None):
+    """Chroma 컬렉션을 memmap 평면 벡터 인덱스로 내보냄 (기본값: 모든 컬렉션)"""
+    import chromadb
+
+    client = chromadb.PersistentClient(str(PERSIST_DIRECTORY))
+    names = names or [collection.name for collection in client.list_collections()]
+    for name in names:
+        start = time.perf_counter()
+        result = export_collection(client.get_collection(name), PERSIST_DIRECTORY / FLAT_INDEX_DIR)
+        print(
+            f"{name}: 청크 {result['count']}개 x {result['dimensions']}차원 "
+            f"(버전 {result['version']}, {time.perf_counter() - start:.2f}초)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chroma 컬렉션을 memmap 평면 벡터 인덱스로 내보내기")
+    parser.add_argument("collections", nargs="*", help="내보낼 컬렉션 이름 (기본값: 모든 컬렉션)")
+    args = parser.parse_args()
+    export_flat_indexes(args.collections)
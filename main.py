@@ -3,21 +3,17 @@ import streamlit as st
 import importlib
 import sys
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
-import plotly.express as px
 import os
 
-# SQLite3 버전 문제 해결을 위한 코드
-__import__('pysqlite3')
-import sys
-sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+# selenium, pandas, plotly 등 무거운 라이브러리는 해당 페이지의 함수 안에서 import
+# (홈 화면 첫 로딩 시간 유지, benchmarks/bench_startup.py로 확인)
+
+# SQLite3 버전 문제 해결을 위한 코드 (pysqlite3-binary가 없는 로컬 환경에서는 기본 sqlite3 사용)
+try:
+    __import__('pysqlite3')
+    sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+except ImportError:
+    pass
 
 # Add the project root directory to Python path
 project_root = Path(__file__).parent
@@ -35,6 +31,14 @@ PAGES = {
 }
 
 def collect_yes24_bestsellers():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from webdriver_manager.chrome import ChromeDriverManager
+
     try:
         chrome_options = Options()
         chrome_options.add_argument("--headless")
@@ -123,6 +127,9 @@ def show_home():
 
 
 def show_opendata():
+    import pandas as pd
+    import plotly.express as px
+
     st.title("📊 공공데이터 분석")
     st.write("식품 관련 공공데이터를 분석하고 시각화합니다.")
 
@@ -1,7 +1,5 @@
 import streamlit as st
-from openai import OpenAI
 import re
-import os
 
 def show():
     # 모든 상수와 데이터 구조를 함수 내에서 정의
@@ -267,7 +265,8 @@ def show():
         else:
             with st.spinner("AI 분석 중..."):
                 try:
-                    # OpenAI API 호출                    
+                    # OpenAI API 호출 (openai는 import가 무거워 버튼을 누를 때 로드)
+                    from openai import OpenAI
                     client = OpenAI(api_key=api_key)
                     response = client.chat.completions.create(
                         model="gpt-3.5-turbo",
@@ -280,7 +279,6 @@ def show():
                     analysis_result = response.choices[0].message.content
                     
                     # 칼로리 정보 추출 (정규식 사용)
-                    import re
                     calories_match = re.search(r'(\d+)\s*kcal', analysis_result)
                     if calories_match:
                         calories = int(calories_match.group(1))
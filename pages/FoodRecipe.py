@@ -1,54 +1,9 @@
 import streamlit as st
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-import operator
-from typing import Annotated, Sequence, TypedDict
-from langchain_core.messages import BaseMessage
-import os
-from pathlib import Path
+from pages.rag_engine import get_engine
 
-# Chroma DB 경로 설정
-PERSIST_DIRECTORY = Path(__file__).parent.parent / "chroma"
+COLLECTION_NAME = "food-recipe"  # 음식 레시피용 컬렉션
 
-# 저장된 벡터 스토어 로드
-try:
-    vectorstore = Chroma(
-        collection_name="food-recipe",  # 음식 레시피용 컬렉션
-        embedding_function=OpenAIEmbeddings(),
-        persist_directory=str(PERSIST_DIRECTORY),
-    )
-    retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
-except Exception as e:
-    print(f"Error loading vector store: {e}")
-    raise
-
-class AgentState(TypedDict):
-    messages: Annotated[Sequence[BaseMessage], operator.add]
-    query: str
-    context: str
-    response: str
-
-def should_retrieve(state: AgentState) -> dict:
-    query = state["query"]
-    docs = retriever.invoke(query)
-    context = "\n".join([doc.page_content for doc in docs])
-    return {"next": "grade_documents", "context": context}
-
-def grade_documents(state: AgentState) -> dict:
-    context = state["context"]
-    if not context:
-        return {"next": "rewrite_query"}
-    return {"next": "generate_answer"}
-
-def rewrite_query(state: AgentState) -> dict:
-    return None
-
-def generate_answer(state: AgentState) -> dict:
-    llm = ChatOpenAI(temperature=0)
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """
+SYSTEM_PROMPT = """
 당신은 요리 전문가입니다. 주어진 컨텍스트를 바탕으로 사용자의 레시피 관련 질문에 정확하게 답변해주세요.
 답변할 때는 다음 규칙을 따르세요:
 1. 컨텍스트에 있는 정보만 사용하세요
@@ -58,43 +13,18 @@ def generate_answer(state: AgentState) -> dict:
 
 컨텍스트:
 {context}
-"""),
-        ("human", "{query}")
-    ])
-    
-    chain = prompt | llm
-    response = chain.invoke({
-        "context": state["context"],
-        "query": state["query"]
-    })
-    
-    return {"response": response.content}
+"""
 
-# StateGraph 설정
-from langgraph.graph import StateGraph
-
-graph = StateGraph(AgentState)
-graph.add_node("should_retrieve", should_retrieve)
-graph.add_node("grade_documents", grade_documents)
-graph.add_node("rewrite_query", rewrite_query)
-graph.add_node("generate_answer", generate_answer)
-
-graph.set_entry_point("should_retrieve")
-graph.add_edge("should_retrieve", "grade_documents")
-graph.add_edge("grade_documents", "generate_answer")
-graph.add_edge("grade_documents", "rewrite_query")
-
-chain = graph.compile()
+def get_rag_engine():
+    # 벡터 스토어와 그래프는 첫 질문에서 한 번만 로드하고 모든 세션이 공유
+    return get_engine(COLLECTION_NAME, SYSTEM_PROMPT)
 
 def ask_recipe(question: str):
-    initial_state = AgentState(
-        messages=[],
-        query=question,
-        context="",
-        response=""
-    )
-    result = chain.invoke(initial_state)
-    return result["response"]
+    return get_rag_engine().ask(question)
+
+def stream_recipe(question: str):
+    # 답변 토큰을 생성되는 대로 반환 (st.write_stream에 그대로 전달)
+    return get_rag_engine().stream(question)
 
 def show():
     st.title("🍳 음식 레시피")
@@ -126,13 +56,23 @@ def show():
 
         # 어시스턴트 응답 생성
         with st.chat_message("assistant"):
-            with st.spinner("답변을 생성하고 있습니다..."):
-                try:
-                    response = ask_recipe(prompt)
-                    st.markdown(response)
-                    st.session_state.recipe_messages.append({"role": "assistant", "content": response})
-                except Exception as e:
-                    st.error(f"답변 생성 중 오류가 발생했습니다: {str(e)}")
+            try:
+                # 토큰이 생성되는 대로 표시하고, 완성된 답변은 대화 기록에 저장
+                response = st.write_stream(stream_recipe(prompt))
+                st.session_state.recipe_messages.append({"role": "assistant", "content": response})
+            except Exception as e:
+                st.error(f"답변 생성 중 오류가 발생했습니다: {str(e)}")
+
+    # 답변 캐시 / 컨텍스트 통계
+    with st.expander("⚡ 답변 캐시 / 컨텍스트"):
+        engine = get_rag_engine()
+        stats = engine.answer_cache.stats()
+        st.write(f"적중 {stats['hits']}회 / 미적중 {stats['misses']}회 (적중률 {stats['hit_rate']:.0%}) / 절약한 시간 {stats['saved_seconds']:.1f}초")
+        if engine.packer is not None:
+            packed = engine.packer.stats()
+            st.write(f"질문당 컨텍스트 토큰 절약 평균 {packed['saved_per_query']:.0f}개 (총 {packed['tokens_saved']}개)")
+            if packed["tokens_added"]:
+                st.write(f"남은 예산에 청크를 더 넣어 늘어난 토큰 평균 {packed['added_per_query']:.0f}개")
 
     # 대화 내용 초기화 버튼
     if st.button("대화 내용 초기화"):
@@ -1,47 +1,91 @@
 # pages/Analyzer.py
 import streamlit as st
-from PIL import Image
-from openai import OpenAI
 from datetime import datetime
 import os
-import cv2
-import numpy as np
-from PIL import Image, ImageDraw
-import pandas as pd
+from pages.scan_cache import get_default_cache, make_key
+from pages.nutrient_db import get_default_db, normalize_name
+from pages.image_ingest import MAX_SIZE, downscale, encode_jpeg, ingest_image
+from pages.overlay import get_default_renderer
+from pages.scan_history import ScanHistory
+from pages.detection import RESPONSE_FORMAT, iter_item_blocks, parse_block, parse_json_detections, parse_text_detections
+
+# 분석 모델 및 프롬프트 버전 (프롬프트를 수정하면 버전을 올려 캐시를 무효화)
+MODEL = "gpt-4o-mini-2024-07-18"
+PROMPT_VERSION = "v1"
+
+# 감지 응답 형식: "text"([음식 N] 텍스트) 또는 "json"(스키마 기반 구조화 출력)
+DETECTION_MODE = os.getenv("FOODSCAN_DETECTION_MODE", "text")
+
+# 영양 정보 조회 설정
+NUTRITION_MODE = os.getenv("FOODSCAN_NUTRITION_MODE", "concurrent")
+NUTRITION_MAX_WORKERS = 6
+NUTRITION_TIMEOUT = 60
+NUTRITION_FAILED = {
+    "calories": "분석 실패",
+    "protein": "분석 실패",
+    "carbs": "분석 실패",
+    "fat": "분석 실패"
+}
+
+def _with_unit(value, unit):
+    if value is None or value == "":
+        return "N/A"
+    return f"{value}{unit}"
+
+class LogUI:
+    """Streamlit 없이 실행할 때 st.write/info/warning/error 대신 logging으로 출력"""
+
+    def __init__(self, logger=None, verbose=False):
+        import logging
+        self.logger = logger or logging.getLogger("foodscan")
+        self.verbose = verbose
+
+    def write(self, message):
+        if self.verbose:
+            self.logger.info(message)
+
+    def info(self, message):
+        if self.verbose:
+            self.logger.info(message)
+
+    def warning(self, message):
+        self.logger.warning(message)
+
+    def error(self, message):
+        self.logger.error(message)
 
 class FoodAnalyzer:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    def __init__(self, cache=None, nutrient_db=None, ui=None, detection_mode=None, renderer=None, raise_errors=False):
+        self._client = None
+        # True면 감지 중 API/네트워크 오류를 빈 결과로 바꾸지 않고 예외로 전달 (일괄 분석에서 재시도 판단용)
+        self.raise_errors = raise_errors
+        self.detection_mode = detection_mode or DETECTION_MODE
+        # 진행 상황 출력 대상 (기본값: Streamlit, 헤드리스 실행 시 LogUI)
+        self.ui = ui if ui is not None else st
+        self.cache = cache if cache is not None else get_default_cache()
+        self.nutrient_db = nutrient_db if nutrient_db is not None else get_default_db()
+        self.renderer = renderer if renderer is not None else get_default_renderer()
         
-    def analyze_image(self, image):
-        try:
-            # API 키 확인
-            if not os.getenv('OPENAI_API_KEY'):
-                st.error("OpenAI API 키가 설정되지 않았습니다.")
-                return []
-                
-            # 이미지 준비 과정 로깅
-            st.write("🔄 이미지 준비 시작...")
-            img_byte_arr, resized_image = self.prepare_image(image)
-            st.write("✅ 이미지 준비 완료")
-            
-            width, height = resized_image.size
-            
-            try:
-                st.write("🚀 OpenAI API 호출 시작...")
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini-2024-07-18",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "당신은 음식 이미지 분석 전문가입니다. 이미지의 모든 음식을 정확하게 식별하고 위치와 영양정보를 제공해야 합니다."
-                        },
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": f"""다음 형식으로 정확히 응답해주세요:
+    @property
+    def client(self):
+        # openai는 import가 무거워 첫 API 호출 때 로드 (페이지 첫 화면과 캐시 적중 시에는 불필요)
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        return self._client
+
+    def _detection_messages(self, img_byte_arr, width, height, json_mode=False):
+        if json_mode:
+            instruction = f"""이미지의 모든 음식을 items 배열로 응답해주세요.
+각 항목: food(구체적인 음식명), bbox([x1, y1, x2, y2] 픽셀 좌표), calories(kcal), protein(g), carbs(g), fat(g)
+
+주의사항:
+- 이미지 크기는 {width}x{height}px입니다
+- 모든 음식을 빠짐없이 분석해주세요
+- 숫자 항목에는 단위 없이 숫자만 넣어주세요
+- 영양정보는 1인분 기준으로 제공해주세요"""
+        else:
+            instruction = f"""다음 형식으로 정확히 응답해주세요:
 
 [음식 1]
 음식 이름: [구체적인 음식명]
@@ -60,212 +104,341 @@ class FoodAnalyzer:
 - 모든 음식을 빠짐없이 분석해주세요
 - 정확한 좌표값을 제공해주세요
 - 영양정보는 1인분 기준으로 제공해주세요"""
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{img_byte_arr}"
-                                    }
-                                }
-                            ]
+
+        return [
+            {
+                "role": "system",
+                "content": "당신은 음식 이미지 분석 전문가입니다. 이미지의 모든 음식을 정확하게 식별하고 위치와 영양정보를 제공해야 합니다."
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": instruction
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{img_byte_arr}"
                         }
-                    ],
-                    timeout=180  # 3분으로 증가
+                    }
+                ]
+            }
+        ]
+
+    def analyze_image(self, image, prepared=None):
+        # prepared: ingest_image로 미리 만든 (base64 JPEG, 축소 이미지)
+        try:
+            # API 키 확인
+            if not os.getenv('OPENAI_API_KEY'):
+                self.ui.error("OpenAI API 키가 설정되지 않았습니다.")
+                if self.raise_errors:
+                    raise RuntimeError("OpenAI API 키가 설정되지 않았습니다.")
+                return []
+                
+            # 이미지 준비 과정 로깅
+            self.ui.write("🔄 이미지 준비 시작...")
+            img_byte_arr, resized_image = prepared or self.prepare_image(image)
+            self.ui.write("✅ 이미지 준비 완료")
+            
+            width, height = resized_image.size
+
+            json_mode = self.detection_mode == "json"
+
+            # 동일 이미지 캐시 확인
+            cache_key = make_key("detect", PROMPT_VERSION, MODEL, self.detection_mode, img_byte_arr)
+            cached_items = self.cache.get(cache_key)
+            if cached_items is not None:
+                self.ui.write("⚡ 캐시된 분석 결과 사용")
+                self.ui.write(f"📊 감지된 아이템 수: {len(cached_items)}")
+                return cached_items
+            
+            try:
+                self.ui.write("🚀 OpenAI API 호출 시작...")
+                request = {}
+                if json_mode:
+                    request["response_format"] = RESPONSE_FORMAT
+                response = self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=self._detection_messages(img_byte_arr, width, height, json_mode),
+                    timeout=180,  # 3분으로 증가
+                    **request
                 )
-                st.write("✅ OpenAI API 호출 완료")
+                self.ui.write("✅ OpenAI API 호출 완료")
                 
                 # API 응답 확인
                 if not response or not response.choices:
-                    st.error("API 응답이 비어있습니다.")
+                    self.ui.error("API 응답이 비어있습니다.")
+                    if self.raise_errors:
+                        raise RuntimeError("API 응답이 비어있습니다.")
                     return []
                     
                 analysis_result = response.choices[0].message.content
-                st.info(f"분석 결과 (일부): {analysis_result[:100]}...")
+                self.ui.info(f"분석 결과 (일부): {analysis_result[:100]}...")
                 
             except Exception as api_error:
-                st.error(f"OpenAI API 호출 중 오류 발생: {str(api_error)}")
-                st.error(f"에러 타입: {type(api_error).__name__}")
+                self.ui.error(f"OpenAI API 호출 중 오류 발생: {str(api_error)}")
+                self.ui.error(f"에러 타입: {type(api_error).__name__}")
+                if self.raise_errors:
+                    raise
                 return []
             
             # 파싱 결과 확인
-            detected_items = self.parse_detection_result(analysis_result)
-            st.write(f"📊 감지된 아이템 수: {len(detected_items)}")
+            if json_mode:
+                detections, errors = parse_json_detections(analysis_result, (width, height))
+                for error in errors:
+                    self.ui.warning(f"응답 검증 오류 (해당 항목 제외): {error}")
+                detected_items = [detection.to_dict() for detection in detections]
+            else:
+                detected_items = self.parse_detection_result(analysis_result, (width, height))
+            self.ui.write(f"📊 감지된 아이템 수: {len(detected_items)}")
+            if detected_items:
+                self.cache.set(cache_key, detected_items)
             
             return detected_items
             
         except Exception as e:
-            st.error(f"전체 프로세스 오류: {str(e)}")
-            st.error(f"에러 발생 위치: {e.__traceback__.tb_frame.f_code.co_name}")
+            self.ui.error(f"전체 프로세스 오류: {str(e)}")
+            self.ui.error(f"에러 발생 위치: {e.__traceback__.tb_frame.f_code.co_name}")
+            if self.raise_errors:
+                raise
             return []
 
-    def draw_boxes(self, image, detected_items):
+    def analyze_image_stream(self, image, prepared=None):
+        # 응답을 스트리밍으로 받아 [음식 N] 블록이 완성될 때마다 해당 아이템을 바로 반환
+        if not os.getenv('OPENAI_API_KEY'):
+            self.ui.error("OpenAI API 키가 설정되지 않았습니다.")
+            return
+
+        img_byte_arr, resized_image = prepared or self.prepare_image(image)
+        width, height = resized_image.size
+
+        cache_key = make_key("detect", PROMPT_VERSION, MODEL, "text", img_byte_arr)
+        cached_items = self.cache.get(cache_key)
+        if cached_items is not None:
+            yield from cached_items
+            return
+
+        detected_items = []
         try:
-            st.write("📦 바운딩 박스 그리기 시작...")
-            img_draw = image.copy()
-            draw = ImageDraw.Draw(img_draw)
-            
-            # 폰트 설정
-            try:
-                from PIL import ImageFont
-                font = ImageFont.truetype("NanumGothic.ttf", 20)
-            except Exception as font_error:
-                st.warning(f"기본 폰트를 사용합니다: {str(font_error)}")
-                font = None
-            
-            for item in detected_items:
-                try:
-                    if 'bbox' not in item:
-                        st.warning(f"{item['food']}의 바운딩 박스 정보가 없습니다.")
-                        continue
-                        
-                    x1, y1, x2, y2 = item['bbox']
-                    
-                    # 이미지 경계 확인
-                    width, height = image.size
-                    x1 = max(0, min(x1, width))
-                    y1 = max(0, min(y1, height))
-                    x2 = max(0, min(x2, width))
-                    y2 = max(0, min(y2, height))
-                    
-                    # 박스 그리기
-                    draw.rectangle([x1, y1, x2, y2], outline='red', width=3)
-                    
-                    # 텍스트 준비
-                    text = f"{item['food']}"
-                    if 'calories' in item:
-                        text += f" ({item['calories']})"
-                    
-                    # 텍스트 배경 그리기
-                    if font:
-                        text_bbox = draw.textbbox((x1, y1-25), text, font=font)
-                        draw.rectangle(text_bbox, fill='red')
-                        draw.text((x1, y1-25), text, fill='white', font=font)
-                    else:
-                        draw.rectangle([x1, y1-25, x1+200, y1], fill='red')
-                        draw.text((x1, y1-25), text, fill='white')
-                    
-                    st.write(f"✅ {item['food']}의 바운딩 박스 그리기 완료")
-                    
-                except Exception as box_error:
-                    st.error(f"개별 박스 그리기 실패: {str(box_error)}")
-                    continue
-            
-            st.write("📦 바운딩 박스 그리기 완료")
+            stream = self.client.chat.completions.create(
+                model=MODEL,
+                messages=self._detection_messages(img_byte_arr, width, height),
+                timeout=180,
+                stream=True
+            )
+            chunks = (
+                chunk.choices[0].delta.content
+                for chunk in stream
+                if chunk.choices and chunk.choices[0].delta.content
+            )
+            for block in iter_item_blocks(chunks):
+                detection = parse_block(block, (width, height))
+                if detection is not None:
+                    item = detection.to_dict()
+                    detected_items.append(item)
+                    yield item
+        except Exception as api_error:
+            self.ui.error(f"OpenAI API 호출 중 오류 발생: {str(api_error)}")
+            self.ui.error(f"에러 타입: {type(api_error).__name__}")
+            return
+
+        if detected_items:
+            self.cache.set(cache_key, detected_items)
+
+    def draw_boxes(self, image, detected_items, verbose=True):
+        try:
+            missing = [item['food'] for item in detected_items if 'bbox' not in item]
+            for food in missing:
+                self.ui.warning(f"{food}의 바운딩 박스 정보가 없습니다.")
+
+            # 폰트/라벨 레이어는 렌더러에서 캐시하고 원본 위에 한 번만 합성
+            img_draw = self.renderer.render(image, detected_items)
+
+            if verbose:
+                self.ui.write(f"📦 바운딩 박스 {len(detected_items) - len(missing)}개 그리기 완료")
             return img_draw
             
         except Exception as e:
-            st.error(f"바운딩 박스 그리기 중 오류 발생: {str(e)}")
+            self.ui.error(f"바운딩 박스 그리기 중 오류 발생: {str(e)}")
             return image  # 오류 발생 시 원본 이미지 반환
 
     def prepare_image(self, image):
-        import base64
-        import io
-        
-        # 이미지 크기 조정 (최대 800px)
-        max_size = 800
-        ratio = min(max_size/image.size[0], max_size/image.size[1])
-        if ratio < 1:
-            new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
-        
-        # PIL Image를 바이트로 변환
-        buffered = io.BytesIO()
-        image.save(buffered, format="JPEG", quality=85)
-        img_str = base64.b64encode(buffered.getvalue()).decode()
+        # 이미지 크기 조정 (최대 800px) 후 JPEG base64 인코딩
+        image = downscale(image, MAX_SIZE)
+        img_str = encode_jpeg(image)
         return img_str, image  # 리사이즈된 이미지도 반환
 
-    def get_nutrition_info(self, foods):
+    def get_nutrition_info(self, foods, mode=None):
+        # mode: "sequential"(항목별 순차 호출), "concurrent"(스레드 풀 동시 호출), "batch"(한 번의 요청)
+        mode = mode or NUTRITION_MODE
         nutrition_data = {}
+        cache_keys = {}
+        pending = []
         for food in foods:
-            try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini-2024-07-18",
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": f"'{food['food']}'의 예상되는 영양성분을 다음 형식으로만 답변해주세요:\n칼로리: [숫자]kcal\n단백질: [숫자]g\n탄수화물: [숫자]g\n지방: [숫자]g"
-                        }
-                    ]
-                )
-                nutrition_info = response.choices[0].message.content
-                
-                # GPT 응답을 파싱하여 영양 정보 구조화
-                info_lines = nutrition_info.strip().split('\n')
-                parsed_info = {}
-                
-                for line in info_lines:
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        parsed_info[key.strip().lower()] = value.strip()
-                
-                nutrition_data[food["food"]] = {
-                    "calories": parsed_info.get('칼로리', 'N/A'),
-                    "protein": parsed_info.get('단백질', 'N/A'),
-                    "carbs": parsed_info.get('탄수화물', 'N/A'),
-                    "fat": parsed_info.get('지방', 'N/A')
+            name = food["food"]
+            if name in nutrition_data or name in cache_keys:
+                continue
+
+            # 로컬 영양성분 DB 우선 조회
+            if self.nutrient_db is not None:
+                match = self.nutrient_db.lookup(name)
+                if match is not None:
+                    db_name, local_info = match
+                    if normalize_name(db_name) != normalize_name(name):
+                        self.ui.info(f"'{name}'의 영양 정보는 영양성분 DB의 '{db_name}' 값입니다.")
+                    nutrition_data[name] = local_info
+                    cache_keys[name] = None  # 로컬 조회 결과는 캐시하지 않음
+                    continue
+
+            cache_keys[name] = make_key("nutrition", PROMPT_VERSION, MODEL, name)
+            cached_info = self.cache.get(cache_keys[name])
+            if cached_info is not None:
+                nutrition_data[name] = cached_info
+            else:
+                pending.append(name)
+
+        if not pending:
+            return nutrition_data
+
+        if mode == "batch":
+            results, errors = self._fetch_nutrition_batch(pending)
+        elif mode == "concurrent":
+            results, errors = self._fetch_nutrition_concurrent(pending)
+        else:
+            results, errors = self._fetch_nutrition_sequential(pending)
+
+        # 스레드에서 발생한 오류는 메인 스레드에서 표시
+        for name, error in errors.items():
+            self.ui.error(f"영양 정보 분석 중 오류 발생 ({name}): {str(error)}")
+
+        for name in pending:
+            if name in results:
+                nutrition_data[name] = results[name]
+                self.cache.set(cache_keys[name], results[name])
+            else:
+                nutrition_data[name] = dict(NUTRITION_FAILED)
+
+        # 입력 순서 유지
+        return {name: nutrition_data[name] for name in cache_keys}
+
+    def _fetch_nutrition(self, name):
+        response = self.client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"'{name}'의 예상되는 영양성분을 다음 형식으로만 답변해주세요:\n칼로리: [숫자]kcal\n단백질: [숫자]g\n탄수화물: [숫자]g\n지방: [숫자]g"
                 }
-                
+            ],
+            timeout=NUTRITION_TIMEOUT
+        )
+        nutrition_info = response.choices[0].message.content
+
+        # GPT 응답을 파싱하여 영양 정보 구조화
+        info_lines = nutrition_info.strip().split('\n')
+        parsed_info = {}
+
+        for line in info_lines:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                parsed_info[key.strip().lower()] = value.strip()
+
+        return {
+            "calories": parsed_info.get('칼로리', 'N/A'),
+            "protein": parsed_info.get('단백질', 'N/A'),
+            "carbs": parsed_info.get('탄수화물', 'N/A'),
+            "fat": parsed_info.get('지방', 'N/A')
+        }
+
+    def _fetch_nutrition_sequential(self, names):
+        results, errors = {}, {}
+        for name in names:
+            try:
+                results[name] = self._fetch_nutrition(name)
             except Exception as e:
-                st.error(f"영양 정보 분석 중 오류 발생: {str(e)}")
-                nutrition_data[food["food"]] = {
-                    "calories": "분석 실패",
-                    "protein": "분석 실패",
-                    "carbs": "분석 실패",
-                    "fat": "분석 실패"
-                }
-        return nutrition_data
+                errors[name] = e
+        return results, errors
+
+    def _fetch_nutrition_concurrent(self, names):
+        # 항목별 호출을 동시에 실행 (전체 시간은 가장 느린 항목 기준)
+        from concurrent.futures import ThreadPoolExecutor
+
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=min(NUTRITION_MAX_WORKERS, len(names))) as executor:
+            futures = {name: executor.submit(self._fetch_nutrition, name) for name in names}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors[name] = e
+        return results, errors
+
+    def _fetch_nutrition_batch(self, names):
+        # 모든 음식을 하나의 JSON 요청으로 조회
+        import json
+
+        food_list = "\n".join(f"- {name}" for name in names)
+        try:
+            response = self.client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": f"""다음 음식들의 1인분 기준 예상 영양성분을 JSON 객체로만 답변해주세요.
+키는 음식 이름을 그대로 사용하고, 값은 숫자만 포함한 객체로 작성해주세요.
+예시: {{"김치찌개": {{"calories": 500, "protein": 25, "carbs": 20, "fat": 30}}}}
+
+음식 목록:
+{food_list}"""
+                    }
+                ],
+                response_format={"type": "json_object"},
+                timeout=NUTRITION_TIMEOUT
+            )
+            parsed = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            # 일괄 요청 실패 시 항목별 동시 호출로 대체
+            self.ui.warning(f"일괄 영양 정보 조회 실패, 항목별로 다시 시도합니다: {str(e)}")
+            return self._fetch_nutrition_concurrent(names)
+
+        results = {}
+        for name in names:
+            info = parsed.get(name)
+            if not isinstance(info, dict):
+                continue
+            results[name] = {
+                "calories": _with_unit(info.get("calories"), "kcal"),
+                "protein": _with_unit(info.get("protein"), "g"),
+                "carbs": _with_unit(info.get("carbs"), "g"),
+                "fat": _with_unit(info.get("fat"), "g")
+            }
+
+        # 응답에서 누락된 항목만 개별 조회
+        missing = [name for name in names if name not in results]
+        if not missing:
+            return results, {}
+        retried, errors = self._fetch_nutrition_concurrent(missing)
+        results.update(retried)
+        return results, errors
         
     def get_nutrition_summary(self, nutrition_info):
         # Implement summary logic
         return {}
 
-    def parse_detection_result(self, analysis_result):
+    def parse_detection_result(self, analysis_result, size=None):
+        # size: 응답 좌표 기준 이미지 크기 (0~1 정규화 좌표 복구용)
         try:
-            detected_items = []
-            items = analysis_result.split('[음식 ')[1:]
-            
-            for item in items:
-                current_item = {}
-                lines = [line.strip() for line in item.split('\n') if line.strip()]
-                
-                for line in lines:
-                    try:
-                        if '음식 이름:' in line:
-                            current_item['food'] = line.split('음식 이름:')[1].strip()
-                        elif '위치:' in line:
-                            # 좌표 파싱 개선
-                            coords_str = line.split('위치:')[1].strip()
-                            coords_str = coords_str.replace('[', '').replace(']', '')
-                            coords = [int(float(x.strip())) for x in coords_str.split(',') if x.strip()]
-                            if len(coords) == 4:  # 좌표가 4개인 경우만 저장
-                                current_item['bbox'] = coords
-                        elif '칼로리:' in line:
-                            calories = line.split('칼로리:')[1].strip()
-                            current_item['calories'] = calories.replace('kcal', '').strip()
-                        elif '단백질:' in line:
-                            protein = line.split('단백질:')[1].strip()
-                            current_item['protein'] = protein.replace('g', '').strip()
-                        elif '탄수화물:' in line:
-                            carbs = line.split('탄수화물:')[1].strip()
-                            current_item['carbs'] = carbs.replace('g', '').strip()
-                        elif '지방:' in line:
-                            fat = line.split('지방:')[1].strip()
-                            current_item['fat'] = fat.replace('g', '').strip()
-                    except ValueError as ve:
-                        st.warning(f"값 파싱 오류 (무시하고 계속): {str(ve)}")
-                        continue
-                
-                if 'food' in current_item and 'bbox' in current_item:
-                    detected_items.append(current_item)
-
-            return detected_items
-            
+            return [detection.to_dict() for detection in parse_text_detections(analysis_result, size)]
         except Exception as e:
-            st.error(f"분석 결과 파싱 중 오류 발생: {str(e)}")
-            st.error(f"에러 발생 위치: {e.__traceback__.tb_frame.f_code.co_name}")
+            self.ui.error(f"분석 결과 파싱 중 오류 발생: {str(e)}")
+            self.ui.error(f"에러 발생 위치: {e.__traceback__.tb_frame.f_code.co_name}")
             return []
 
 def display_results(image, detected_foods, nutrition_info):
+    import pandas as pd
+
     try:
         st.write("🖥 결과 표시 시작...")
         
@@ -307,30 +480,75 @@ def display_results(image, detected_foods, nutrition_info):
     except Exception as e:
         st.error(f"결과 표시 중 오류 발생: {str(e)}")
 
+def stream_detection(analyzer, display_image, prepared):
+    import pandas as pd
+
+    # 감지된 음식마다 박스와 표 행을 즉시 갱신
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        image_slot = st.empty()
+        image_slot.image(display_image, caption="분석 중...", use_column_width=True)
+    with col2:
+        table_slot = st.empty()
+
+    detected_foods = []
+    for item in analyzer.analyze_image_stream(display_image, prepared=prepared):
+        detected_foods.append(item)
+        image_slot.image(
+            analyzer.draw_boxes(display_image, detected_foods, verbose=False),
+            caption=f"분석 중... ({len(detected_foods)}개 감지)",
+            use_column_width=True
+        )
+        table_slot.table(pd.DataFrame([
+            {
+                '음식': food['food'],
+                '칼로리': food.get('calories', ''),
+                '단백질': food.get('protein', ''),
+                '탄수화물': food.get('carbs', ''),
+                '지방': food.get('fat', '')
+            }
+            for food in detected_foods
+        ]))
+
+    # 최종 결과는 display_results에서 다시 표시
+    image_slot.empty()
+    table_slot.empty()
+    return detected_foods
+
 def show():
     st.title("🔍 음식 스캔")
     
-    if 'history' not in st.session_state:
-        st.session_state.history = []
+    # 세션별 분석 기록 (썸네일만 메모리에, 원본은 임시 폴더에 저장)
+    history = st.session_state.get('history')
+    if not isinstance(history, ScanHistory):
+        st.session_state.history = ScanHistory()
+        for record in history or []:
+            st.session_state.history.append(record)
 
     analyzer = FoodAnalyzer()
+
+    # 분석 캐시 상태 및 초기화
+    with st.expander("⚡ 분석 캐시"):
+        stats = analyzer.cache.stats()
+        st.write(f"적중 {stats['hits']}회 / 미적중 {stats['misses']}회 / 저장 항목 {stats['entries']}개")
+        if st.button("캐시 비우기"):
+            analyzer.cache.clear()
+            st.success("분석 캐시를 비웠습니다.")
     
     uploaded_file = st.file_uploader("음식 이미지 업로드", type=["jpg", "jpeg", "png"])
     
     if uploaded_file:
-        image = Image.open(uploaded_file)
+        # 한 번의 디코딩/축소로 표시용 이미지와 API 전송용 JPEG를 함께 생성
+        prepared = ingest_image(uploaded_file)
+        display_image = prepared[1]
         
+        streaming = st.toggle("실시간 분석 (감지되는 대로 표시)", value=True)
+
         with st.spinner("음식을 분석하고 있습니다..."):
-            # 이미지 크기 표시 제한
-            display_size = 800
-            ratio = min(display_size/image.size[0], display_size/image.size[1])
-            if ratio < 1:
-                display_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-                display_image = image.resize(display_size, Image.Resampling.LANCZOS)
+            if streaming and analyzer.detection_mode == "text":
+                detected_foods = stream_detection(analyzer, display_image, prepared)
             else:
-                display_image = image
-            
-            detected_foods = analyzer.analyze_image(image)
+                detected_foods = analyzer.analyze_image(display_image, prepared=prepared)
             nutrition_info = analyzer.get_nutrition_info(detected_foods)
             
             # 바운딩 박스 그리기
@@ -344,4 +562,4 @@ def show():
                 "summary": nutrition_info
             })
         
-        display_results(annotated_image, detected_foods, nutrition_info)
+        display_results(annotated_image, detected_foods, nutrition_info)
\ No newline at end of file
@@ -1,12 +1,14 @@
 import streamlit as st
-from pages.lg_rag import ask_question
+from pages.lg_rag import get_rag_engine, stream_question
 import sys
 from pathlib import Path
-import sqlite3
 
-# SQLite3 버전 문제 해결을 위한 코드
-__import__('pysqlite3')
-sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+# SQLite3 버전 문제 해결을 위한 코드 (pysqlite3-binary가 없는 로컬 환경에서는 기본 sqlite3 사용)
+try:
+    __import__('pysqlite3')
+    sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+except ImportError:
+    pass
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
@@ -42,13 +44,23 @@ def show():
 
         # 어시스턴트 응답 생성
         with st.chat_message("assistant"):
-            with st.spinner("답변을 생성하고 있습니다..."):
-                try:
-                    response = ask_question(prompt)
-                    st.markdown(response)
-                    st.session_state.messages.append({"role": "assistant", "content": response})
-                except Exception as e:
-                    st.error(f"답변 생성 중 오류가 발생했습니다: {str(e)}")
+            try:
+                # 토큰이 생성되는 대로 표시하고, 완성된 답변은 대화 기록에 저장
+                response = st.write_stream(stream_question(prompt))
+                st.session_state.messages.append({"role": "assistant", "content": response})
+            except Exception as e:
+                st.error(f"답변 생성 중 오류가 발생했습니다: {str(e)}")
+
+    # 답변 캐시 / 컨텍스트 통계
+    with st.expander("⚡ 답변 캐시 / 컨텍스트"):
+        engine = get_rag_engine()
+        stats = engine.answer_cache.stats()
+        st.write(f"적중 {stats['hits']}회 / 미적중 {stats['misses']}회 (적중률 {stats['hit_rate']:.0%}) / 절약한 시간 {stats['saved_seconds']:.1f}초")
+        if engine.packer is not None:
+            packed = engine.packer.stats()
+            st.write(f"질문당 컨텍스트 토큰 절약 평균 {packed['saved_per_query']:.0f}개 (총 {packed['tokens_saved']}개)")
+            if packed["tokens_added"]:
+                st.write(f"남은 예산에 청크를 더 넣어 늘어난 토큰 평균 {packed['added_per_query']:.0f}개")
 
     # 대화 내용 초기화 버튼을 페이지 본문에 추가
     if st.button("대화 내용 초기화"):
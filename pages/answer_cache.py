@@ -0,0 +1,153 @@
+# pages/answer_cache.py
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 캐시 파일 경로와 기본값 설정 (환경 변수로 변경 가능)
+ANSWER_CACHE_PATH = Path(os.getenv("RAG_ANSWER_CACHE_PATH", Path(__file__).parent.parent / ".cache" / "answers.sqlite3"))
+# text-embedding-ada-002의 코사인 유사도는 대략 0.7~1.0에 몰려 있어, 0.95면 대상만 다른 질문도 일치로 판정됨
+DEFAULT_THRESHOLD = float(os.getenv("RAG_ANSWER_CACHE_THRESHOLD", "0.97"))
+# 질문 토큰(keyword_index.tokenize)의 Jaccard 유사도 하한
+# ("류현진 선수의 타율" vs "김광현 선수의 타율"은 0.43으로 불일치, "류현진 선수 타율"과는 0.8로 일치)
+DEFAULT_MIN_OVERLAP = float(os.getenv("RAG_ANSWER_CACHE_MIN_OVERLAP", "0.5"))
+DEFAULT_TTL = float(os.getenv("RAG_ANSWER_CACHE_TTL", str(24 * 60 * 60)))
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def lexical_overlap(a, b):
+    """두 질문 토큰 집합의 Jaccard 유사도"""
+    from pages.keyword_index import tokenize
+
+    a, b = set(tokenize(a)), set(tokenize(b))
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+class AnswerCache:
+    """질문 임베딩의 코사인 유사도로 비슷한 질문의 이전 답변을 재사용하는 캐시
+
+    답변은 (컬렉션 이름, 컬렉션 버전)별로 저장되므로 컬렉션 내용이 바뀌면 이전 답변은 사용되지 않습니다.
+    임베딩이 비슷해도 질문의 단어(선수 이름 등)가 많이 다르면 다른 질문으로 봅니다.
+    """
+
+    def __init__(self, path=ANSWER_CACHE_PATH, threshold=DEFAULT_THRESHOLD, ttl=DEFAULT_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES, enabled=None, min_overlap=DEFAULT_MIN_OVERLAP):
+        if enabled is None:
+            enabled = os.getenv("RAG_ANSWER_CACHE_DISABLED", "") not in ("1", "true", "yes")
+        self.path = Path(path)
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS answers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    collection TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    question TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    answer TEXT NOT NULL,
+                    latency REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_collection ON answers (collection, version)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, collection, version, vector, question=None):
+        """유사도가 기준 이상이고 질문 단어도 충분히 겹치는 저장 질문 중 가장 비슷한 것의 답변 반환, 없으면 None
+
+        question을 주지 않으면 임베딩 유사도만 봅니다. 조회만 하고 쓰지 않음 (만료 정리는 set에서).
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT vector, answer, latency, question FROM answers "
+                "WHERE collection = ? AND version = ? AND created_at >= ?",
+                (collection, version, time.time() - self.ttl),
+            ).fetchall()
+
+            if rows:
+                matrix = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+                query = np.asarray(vector, dtype=np.float32)
+                scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+                for best in np.argsort(-scores):
+                    if scores[best] < self.threshold:
+                        break
+                    if question is None or lexical_overlap(question, rows[best][3]) >= self.min_overlap:
+                        self.hits += 1
+                        self.saved_seconds += rows[best][2]
+                        return rows[best][1]
+            self.misses += 1
+            return None
+
+    def set(self, collection, version, question, vector, answer, latency):
+        """새로 생성한 답변과 생성에 걸린 시간(초)을 저장"""
+        if not self.enabled:
+            return
+        with self._lock:
+            conn = self._connect()
+            # 버전이 다르거나 만료된 답변은 정리
+            conn.execute(
+                "DELETE FROM answers WHERE collection = ? AND (version != ? OR created_at < ?)",
+                (collection, version, time.time() - self.ttl),
+            )
+            conn.execute(
+                "INSERT INTO answers (collection, version, question, vector, answer, latency, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (collection, version, question, np.asarray(vector, dtype=np.float32).tobytes(), answer, latency, time.time()),
+            )
+            # 개수 제한을 넘으면 가장 오래된 답변부터 삭제
+            conn.execute(
+                "DELETE FROM answers WHERE id NOT IN (SELECT id FROM answers ORDER BY id DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def invalidate(self, collection=None):
+        with self._lock:
+            conn = self._connect()
+            if collection is None:
+                conn.execute("DELETE FROM answers")
+            else:
+                conn.execute("DELETE FROM answers WHERE collection = ?", (collection,))
+            conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_seconds": self.saved_seconds,
+        }
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_answer_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = AnswerCache()
+        return _default_cache
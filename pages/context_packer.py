@@ -0,0 +1,176 @@
+# pages/context_packer.py
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+# 프롬프트 컨텍스트 설정 (환경 변수로 변경 가능)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKENS", "1200"))
+MMR_LAMBDA = float(os.getenv("RAG_MMR_LAMBDA", "0.7"))
+# 잘라서라도 넣을 최소 남은 토큰 수 (이보다 적게 남으면 더 넣지 않음)
+MIN_TRIM_TOKENS = 64
+ENCODER_MODEL = "gpt-4o-mini"
+
+logger = logging.getLogger(__name__)
+
+# 문장(긴 문장은 쉼표로 나눈 구절) 경계
+_SENTENCE_END = re.compile(r"(?<=[.!?。,])\s+|\n+")
+
+
+class _ApproximateEncoder:
+    """tiktoken 인코딩 파일을 받을 수 없을 때 사용하는 근사 토큰 계산 (UTF-8 3바이트 ≈ 1토큰)"""
+
+    def encode(self, text):
+        data = text.encode("utf-8")
+        return [data[i:i + 3] for i in range(0, len(data), 3)]
+
+    def decode(self, tokens):
+        return b"".join(tokens).decode("utf-8", errors="ignore")
+
+
+_fallback_warned = False
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model=ENCODER_MODEL):
+    """모델별 tiktoken 인코더 (프로세스에서 한 번만 로드)"""
+    global _fallback_warned
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:
+        # 모델마다 다시 시도하지만 경고는 프로세스에서 한 번만
+        if not _fallback_warned:
+            _fallback_warned = True
+            logger.warning("tiktoken 인코더를 불러오지 못해 근사 토큰 수를 사용합니다: %s", e)
+        return _ApproximateEncoder()
+
+
+def count_tokens(text, model=ENCODER_MODEL):
+    return len(get_encoder(model).encode(text))
+
+
+def mmr_order(query_vector, doc_vectors, lambda_mult=MMR_LAMBDA, relevance=None):
+    """질문과의 관련성과 이미 고른 문서와의 중복을 함께 고려한 선택 순서(인덱스 목록)
+
+    relevance를 주면 질문 벡터와의 유사도 대신 그 점수를 관련성으로 사용합니다.
+    """
+    vectors = np.asarray(doc_vectors, dtype=np.float32)
+    if not len(vectors):
+        return []
+    vectors = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+    if relevance is None:
+        query = np.asarray(query_vector, dtype=np.float32)
+        relevance = vectors @ (query / (np.linalg.norm(query) + 1e-12))
+    relevance = np.asarray(relevance, dtype=np.float32)
+
+    similarity = vectors @ vectors.T
+    order = [int(np.argmax(relevance))]
+    redundancy = similarity[order[0]].copy()
+    remaining = set(range(len(vectors))) - set(order)
+    while remaining:
+        candidates = list(remaining)
+        scores = lambda_mult * relevance[candidates] - (1 - lambda_mult) * redundancy[candidates]
+        best = candidates[int(np.argmax(scores))]
+        order.append(best)
+        redundancy = np.maximum(redundancy, similarity[best])
+        remaining.remove(best)
+    return order
+
+
+def trim_to_budget(text, query, budget, encoder):
+    """예산을 넘는 청크에서 질문과 겹치는 단어가 많은 문장부터 골라 원래 순서대로 이어 붙임"""
+    from pages.keyword_index import tokenize
+
+    terms = set(tokenize(query or ""))
+    sentences = [sentence for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+    lengths = [len(encoder.encode(sentence)) for sentence in sentences]
+    overlap = [len(terms.intersection(tokenize(sentence))) for sentence in sentences]
+
+    chosen, used = set(), 0
+    # 겹치는 단어 수가 같으면 앞 문장 우선
+    for index in sorted(range(len(sentences)), key=lambda i: (-overlap[i], i)):
+        if used + lengths[index] <= budget:
+            chosen.add(index)
+            used += lengths[index]
+    if not chosen:
+        # 한 문장도 들어가지 않으면 앞부분을 토큰 단위로 자름
+        tokens = encoder.encode(text)[:budget]
+        return encoder.decode(tokens), len(tokens)
+    return " ".join(sentences[index] for index in sorted(chosen)), used
+
+
+class ContextPacker:
+    """검색된 청크를 MMR 순서로 골라 토큰 예산 안에서 프롬프트 컨텍스트를 구성
+
+    기존 방식(상위 baseline_k개를 그대로 이어 붙임) 대비 절약한 토큰 수와,
+    남은 예산에 청크를 더 넣어 기존 방식보다 늘어난 토큰 수를 따로 누적합니다.
+    """
+
+    def __init__(self, budget=CONTEXT_TOKEN_BUDGET, lambda_mult=MMR_LAMBDA, baseline_k=3, model=ENCODER_MODEL,
+                 use_rank=True):
+        self.budget = budget
+        self.use_rank = use_rank
+        self.lambda_mult = lambda_mult
+        self.baseline_k = baseline_k
+        self.model = model
+        self.queries = 0
+        self.tokens_used = 0
+        self.tokens_saved = 0
+        self.tokens_added = 0
+        self._lock = threading.Lock()
+
+    def pack(self, query_vector, docs, doc_vectors, query=None):
+        """(컨텍스트 문자열, 사용한 토큰 수, 절약한 토큰 수(0 이상)) 반환"""
+        encoder = get_encoder(self.model)
+        baseline = len(encoder.encode("\n".join(doc.page_content for doc in docs[:self.baseline_k])))
+
+        # 관련성은 검색기 순위(BM25가 섞인 하이브리드 순위)를 1 → 0으로 환산해 쓰고, 중복은 임베딩으로 판단
+        relevance = 1 - np.arange(len(docs)) / len(docs) if self.use_rank else None
+        order = mmr_order(query_vector, doc_vectors, self.lambda_mult, relevance)
+        lengths = {index: len(encoder.encode(docs[index].page_content)) for index in order[:self.baseline_k]}
+
+        # MMR로 고른 baseline_k개가 예산을 넘으면 짧은 청크부터 통째로 넣고 남은 예산을 나머지 청크에 고르게 나눔
+        shares, remaining = {}, self.budget
+        for position, index in enumerate(sorted(lengths, key=lengths.get)):
+            shares[index] = min(lengths[index], remaining // (len(lengths) - position))
+            remaining -= shares[index]
+
+        parts, used = [], 0
+        for index in order[:self.baseline_k]:
+            if shares[index] == lengths[index]:
+                parts.append(docs[index].page_content)
+                used += lengths[index]
+            elif shares[index] >= MIN_TRIM_TOKENS:
+                # 질문과 관련된 문장만 추려 넣음
+                text, count = trim_to_budget(docs[index].page_content, query, shares[index], encoder)
+                parts.append(text)
+                used += count
+        # 예산이 남으면 다음 MMR 순서의 청크를 통째로 들어가는 만큼 추가
+        for index in order[self.baseline_k:]:
+            count = len(encoder.encode(docs[index].page_content))
+            if used + count > self.budget:
+                break
+            parts.append(docs[index].page_content)
+            used += count
+
+        saved = max(baseline - used, 0)
+        with self._lock:
+            self.queries += 1
+            self.tokens_used += used
+            self.tokens_saved += saved
+            self.tokens_added += max(used - baseline, 0)
+        return "\n".join(parts), used, saved
+
+    def stats(self):
+        return {
+            "queries": self.queries,
+            "tokens_used": self.tokens_used,
+            "tokens_saved": self.tokens_saved,
+            "saved_per_query": self.tokens_saved / self.queries if self.queries else 0.0,
+            "tokens_added": self.tokens_added,
+            "added_per_query": self.tokens_added / self.queries if self.queries else 0.0,
+        }
@@ -0,0 +1,281 @@
+# pages/detection.py
+import json
+import re
+from dataclasses import dataclass
+
+ITEM_MARKER = "[음식 "
+
+# JSON 응답 모드에서 사용하는 스키마 (OpenAI structured outputs, strict 모드)
+DETECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "food": {"type": "string"},
+                    "bbox": {"type": "array", "items": {"type": "number"}, "minItems": 4, "maxItems": 4},
+                    "calories": {"type": "number"},
+                    "protein": {"type": "number"},
+                    "carbs": {"type": "number"},
+                    "fat": {"type": "number"},
+                },
+                "required": ["food", "bbox", "calories", "protein", "carbs", "fat"],
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["items"],
+    "additionalProperties": False,
+}
+
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "food_detection", "schema": DETECTION_SCHEMA, "strict": True},
+}
+
+
+@dataclass
+class Detection:
+    """감지된 음식 하나 (좌표는 정수 픽셀, 영양 정보는 숫자)"""
+    __slots__ = ("food", "bbox", "calories", "protein", "carbs", "fat")
+
+    food: str
+    bbox: tuple
+    calories: float
+    protein: float
+    carbs: float
+    fat: float
+
+    @classmethod
+    def from_dict(cls, item, size=None):
+        """dict 형식 감지 결과를 Detection으로 변환 (이름 또는 좌표가 없으면 None)"""
+        return _make_detection(item, size)
+
+    def to_dict(self):
+        # 기존 코드(draw_boxes, 캐시, 공유 페이지)에서 사용하는 dict 형식
+        item = {"food": self.food, "bbox": list(self.bbox)}
+        for field in ("calories", "protein", "carbs", "fat"):
+            value = getattr(self, field)
+            if value is not None:
+                item[field] = int(value) if value == int(value) else value
+        return item
+
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_COORD_LABEL = re.compile(r"[xy][12]\s*[=:]")
+
+
+def _to_number(value):
+    # 텍스트 응답의 값("350kcal", "약 1,200")이 대부분이라 문자열을 먼저 확인
+    if isinstance(value, str):
+        text = value
+    elif value is None or isinstance(value, bool):
+        return None
+    elif isinstance(value, (int, float)):
+        return float(value)
+    else:
+        text = str(value)
+    if "," in text:
+        text = text.replace(",", "")
+    match = _NUMBER.search(text)
+    return float(match.group()) if match else None
+
+
+def _to_bbox(values, size=None):
+    """좌표 4개를 정수 픽셀 (x1, y1, x2, y2)로 정리 (뒤바뀐 좌표, 0~1 정규화 좌표 복구)"""
+    if isinstance(values, str):
+        if "=" in values or ":" in values:
+            values = _COORD_LABEL.sub("", values)
+        coords = [float(v) for v in _NUMBER.findall(values)]
+    else:
+        coords = [_to_number(v) for v in values or []]
+    if len(coords) != 4 or any(v is None for v in coords):
+        return None
+    return _normalize_bbox(coords, size)
+
+
+def _normalize_bbox(coords, size=None):
+    x1, y1, x2, y2 = coords
+    low, high = min(coords), max(coords)
+    if size and low >= 0 and 0 < high <= 1:
+        x1, y1, x2, y2 = x1 * size[0], y1 * size[1], x2 * size[0], y2 * size[1]
+    x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+    if x1 > x2:
+        x1, x2 = x2, x1
+    if y1 > y2:
+        y1, y2 = y2, y1
+    return (x1, y1, x2, y2)
+
+
+def _make_detection(fields, size=None):
+    food = str(fields.get("food") or "").strip()
+    bbox = _to_bbox(fields.get("bbox"), size)
+    if not food or bbox is None:
+        return None
+    return Detection(
+        food=food,
+        bbox=bbox,
+        calories=_to_number(fields.get("calories")),
+        protein=_to_number(fields.get("protein")),
+        carbs=_to_number(fields.get("carbs")),
+        fat=_to_number(fields.get("fat")),
+    )
+
+
+# ---- 스키마 검증기 ----
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+}
+
+
+def compile_validator(schema):
+    """스키마를 한 번 해석해 검증 함수로 변환 (object/array/string/number 부분집합 지원)"""
+    check_type = _TYPE_CHECKS[schema["type"]]
+
+    if schema["type"] == "object":
+        properties = {key: compile_validator(sub) for key, sub in schema.get("properties", {}).items()}
+        required = tuple(schema.get("required", ()))
+        closed = schema.get("additionalProperties") is False
+
+        def validate(value, path="$"):
+            if not check_type(value):
+                return [f"{path}: object가 아닙니다"]
+            errors = [f"{path}.{key}: 필수 항목 누락" for key in required if key not in value]
+            for key, item in value.items():
+                if key in properties:
+                    errors.extend(properties[key](item, f"{path}.{key}"))
+                elif closed:
+                    errors.append(f"{path}.{key}: 허용되지 않은 항목")
+            return errors
+
+    elif schema["type"] == "array":
+        validate_item = compile_validator(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems", 0)
+        max_items = schema.get("maxItems")
+
+        def validate(value, path="$"):
+            if not check_type(value):
+                return [f"{path}: array가 아닙니다"]
+            errors = []
+            if len(value) < min_items or (max_items is not None and len(value) > max_items):
+                errors.append(f"{path}: 항목 수 {len(value)}개가 허용 범위를 벗어났습니다")
+            if validate_item is not None:
+                for index, item in enumerate(value):
+                    errors.extend(validate_item(item, f"{path}[{index}]"))
+            return errors
+
+    else:
+        type_name = schema["type"]
+
+        def validate(value, path="$"):
+            return [] if check_type(value) else [f"{path}: {type_name}이(가) 아닙니다"]
+
+    return validate
+
+
+_validate_item = compile_validator(DETECTION_SCHEMA["properties"]["items"]["items"])
+
+
+def parse_json_detections(content, size=None):
+    """JSON 응답을 검증해 Detection 목록과 오류 목록을 반환
+
+    스키마에 맞지 않는 항목도 숫자 문자열 변환, 좌표 정리로 최대한 복구합니다.
+    """
+    try:
+        payload = json.loads(content)
+    except (TypeError, ValueError) as e:
+        return [], [f"$: JSON 파싱 실패 ({e})"]
+
+    items = payload.get("items") if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        return [], ["$.items: array가 아닙니다"]
+
+    detections, errors = [], []
+    for index, item in enumerate(items):
+        item_errors = _validate_item(item, f"$.items[{index}]")
+        detection = _make_detection(item, size) if isinstance(item, dict) else None
+        if detection is None:
+            errors.extend(item_errors or [f"$.items[{index}]: 복구할 수 없는 항목"])
+            continue
+        detections.append(detection)
+    return detections, errors
+
+
+# ---- 기존 [음식 N] 텍스트 형식 파서 ----
+
+_FIELD_LINE = re.compile(
+    r"^[\s\-*•]*(음식\s*이름|음식명|위치|좌표|칼로리|열량|단백질|탄수화물|지방)\s*[:：]\s*([^\n]*)",
+    re.MULTILINE,
+)
+_FIELD_NAMES = {
+    "음식이름": "food", "음식명": "food",
+    "위치": "bbox", "좌표": "bbox",
+    "칼로리": "calories", "열량": "calories",
+    "단백질": "protein", "탄수화물": "carbs", "지방": "fat",
+}
+
+
+_NUM = r"(-?\d+(?:\.\d+)?)"
+_CANONICAL_BLOCK = re.compile(
+    r"\s*\d+\]\s*음식 이름:[ \t]*([^\n]+?)[ \t]*\n"
+    rf"\s*위치:\s*\[\s*{_NUM}\s*,\s*{_NUM}\s*,\s*{_NUM}\s*,\s*{_NUM}\s*\][ \t]*\n"
+    rf"\s*칼로리:\s*{_NUM}\s*kcal\s*영양성분:\s*"
+    rf"-\s*단백질:\s*{_NUM}\s*g\s*-\s*탄수화물:\s*{_NUM}\s*g\s*-\s*지방:\s*{_NUM}\s*g"
+)
+
+
+def parse_block(block, size=None):
+    """[음식 N] 블록 하나를 Detection으로 변환 (이름 또는 좌표가 없으면 None)"""
+    # 프롬프트 형식 그대로인 블록은 한 번의 정규식 매칭으로 처리
+    match = _CANONICAL_BLOCK.match(block)
+    if match:
+        food, x1, y1, x2, y2, calories, protein, carbs, fat = match.groups()
+        bbox = _normalize_bbox((float(x1), float(y1), float(x2), float(y2)), size)
+        return Detection(food.strip("[] "), bbox, float(calories), float(protein), float(carbs), float(fat))
+
+    # 형식이 조금씩 다른 블록은 줄 단위로 처리
+    fields = {}
+    for label, value in _FIELD_LINE.findall(block):
+        key = _FIELD_NAMES[label.replace(" ", "")]
+        if key not in fields:
+            fields[key] = value.rstrip().strip("[] ") if key == "food" else value.rstrip()
+    return _make_detection(fields, size)
+
+
+def iter_item_blocks(chunks):
+    """텍스트 조각 스트림에서 완성된 [음식 N] 블록을 순서대로 반환"""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        # 다음 블록의 시작 표시가 나타나면 이전 블록은 완성된 것
+        while True:
+            start = buffer.find(ITEM_MARKER)
+            if start < 0:
+                break
+            next_start = buffer.find(ITEM_MARKER, start + len(ITEM_MARKER))
+            if next_start < 0:
+                break
+            yield buffer[start + len(ITEM_MARKER):next_start]
+            buffer = buffer[next_start:]
+
+    # 마지막 블록은 스트림 종료 시 완성
+    start = buffer.find(ITEM_MARKER)
+    if start >= 0:
+        yield buffer[start + len(ITEM_MARKER):]
+
+
+def parse_text_detections(text, size=None):
+    """기존 텍스트 형식 응답 전체를 Detection 목록으로 변환"""
+    detections = []
+    for block in text.split(ITEM_MARKER)[1:]:
+        detection = parse_block(block, size)
+        if detection is not None:
+            detections.append(detection)
+    return detections
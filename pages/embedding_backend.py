@@ -0,0 +1,161 @@
+# pages/embedding_backend.py
+import hashlib
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from langchain_core.embeddings import Embeddings
+
+from pages.embedding_config import EMBEDDING_BACKEND, LOCAL_EMBEDDING_MODEL
+
+LOCAL_EMBEDDING_THREADS = int(os.getenv("LOCAL_EMBEDDING_THREADS", "0")) or None
+# none: 기본 PyTorch, int8: PyTorch 동적 양자화, onnx: ONNX Runtime, onnx-int8: 양자화된 ONNX 모델
+LOCAL_EMBEDDING_ACCELERATION = os.getenv("LOCAL_EMBEDDING_ACCELERATION", "none")
+
+# 동시에 들어온 질문을 한 번에 인코딩하기 위한 대기 시간과 최대 배치 크기
+QUERY_BATCH_WAIT = 0.002
+QUERY_BATCH_SIZE = 32
+DOCUMENT_BATCH_SIZE = 64
+
+ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+STUB_EMBEDDING_DIMENSIONS = 256
+
+
+class LocalEmbeddings(Embeddings):
+    """CPU에서 실행하는 sentence-transformers 임베딩
+
+    모델은 첫 호출에서 로드합니다. 여러 스레드(세션)에서 동시에 들어온 질문은 짧게 모아 한 번에 인코딩하고,
+    문서는 길이순으로 정렬된 배치로 인코딩합니다.
+    """
+
+    def __init__(self, model_name=LOCAL_EMBEDDING_MODEL, threads=LOCAL_EMBEDDING_THREADS,
+                 acceleration=LOCAL_EMBEDDING_ACCELERATION, batch_wait=QUERY_BATCH_WAIT,
+                 max_batch=QUERY_BATCH_SIZE, document_batch_size=DOCUMENT_BATCH_SIZE):
+        if acceleration not in ("none", "int8", "onnx", "onnx-int8"):
+            raise ValueError(f"지원하지 않는 가속 방식입니다: {acceleration}")
+        self.model_name = model_name
+        self.threads = threads
+        self.acceleration = acceleration
+        self.batch_wait = batch_wait
+        self.max_batch = max_batch
+        self.document_batch_size = document_batch_size
+        self._model = None
+        self._lock = threading.Lock()
+        self._queries = queue.Queue()
+        self._worker = None
+
+    def _load(self):
+        if self.threads:
+            # 토크나이저/추론 스레드 수 제한 (Streamlit 서버의 다른 작업과 CPU를 나눠 쓰기 위함)
+            os.environ.setdefault("OMP_NUM_THREADS", str(self.threads))
+            os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if self.threads:
+            torch.set_num_threads(self.threads)
+
+        if self.acceleration.startswith("onnx"):
+            model_kwargs = {"provider": "CPUExecutionProvider"}
+            if self.acceleration == "onnx-int8":
+                model_kwargs["file_name"] = ONNX_INT8_FILE
+            try:
+                return SentenceTransformer(self.model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+            except ImportError as e:
+                raise ImportError('ONNX 가속을 사용하려면 pip install "sentence-transformers[onnx]"를 실행하세요') from e
+
+        model = SentenceTransformer(self.model_name, device="cpu")
+        if self.acceleration == "int8":
+            # Linear 레이어만 int8로 동적 양자화 (정확도 손실이 작고 CPU에서 1.5~2배 빠름)
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        model.eval()
+        return model
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+                    self._worker = threading.Thread(target=self._serve_queries, daemon=True)
+                    self._worker.start()
+        return self._model
+
+    def _encode(self, texts, batch_size):
+        vectors = self.model.encode(texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.tolist()
+
+    def _serve_queries(self):
+        while True:
+            batch = [self._queries.get()]
+            # 잠깐 기다리며 동시에 들어온 질문을 모음
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._queries.get(timeout=self.batch_wait))
+            except queue.Empty:
+                pass
+
+            try:
+                vectors = self._encode([text for text, _ in batch], len(batch))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def embed_query(self, text):
+        self.model  # 모델과 질문 처리 스레드 준비
+        future = Future()
+        self._queries.put((text, future))
+        return future.result()
+
+    def embed_documents(self, texts):
+        # sentence-transformers가 길이순으로 정렬해 배치를 만들므로 패딩 낭비가 적음
+        return self._encode(list(texts), self.document_batch_size) if texts else []
+
+
+class StubEmbeddings(Embeddings):
+    """오프라인용 해시 임베딩 (음절 2-gram / 영단어 해시를 고정 차원에 누적한 뒤 정규화)
+
+    의미를 이해하지는 못하지만 단어가 겹치는 문서를 찾을 수 있어 API 키 없이 검색 파이프라인을 돌려볼 수 있습니다.
+    """
+
+    def __init__(self, dimensions=STUB_EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+        self.model = f"stub-hash-{dimensions}"
+
+    def _embed(self, text):
+        import numpy as np
+
+        from pages.keyword_index import tokenize
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in tokenize(text):
+            vector[int(hashlib.md5(token.encode()).hexdigest()[:8], 16) % self.dimensions] += 1
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def get_embeddings(backend=None):
+    """설정된 백엔드의 임베딩 객체 생성"""
+    backend = backend or EMBEDDING_BACKEND
+    if backend == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        from pages.llm_clients import get_http_client
+        return OpenAIEmbeddings(http_client=get_http_client())
+    if backend == "local":
+        return LocalEmbeddings()
+    if backend == "stub":
+        return StubEmbeddings()
+    raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {backend}")
+
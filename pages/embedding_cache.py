@@ -0,0 +1,116 @@
+# pages/embedding_cache.py
+import inspect
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from pathlib import Path
+
+from langchain_core.embeddings import Embeddings
+
+from pages.scan_cache import make_key
+
+# 캐시 파일 경로 설정 (환경 변수로 변경 가능)
+EMBEDDING_CACHE_PATH = Path(os.getenv("RAG_EMBEDDING_CACHE_PATH", Path(__file__).parent.parent / ".cache" / "embeddings.sqlite3"))
+DEFAULT_MAX_ENTRIES = 50000
+
+_SPACES = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s?!.,~…？！。]+$")
+
+
+def normalize_query(text):
+    """유니코드 정규화, 공백 정리, 끝 문장부호 제거로 사실상 같은 질문을 같은 키로 만듦"""
+    text = unicodedata.normalize("NFC", text).strip().lower()
+    text = _SPACES.sub(" ", text)
+    return _TRAILING.sub("", text)
+
+
+def model_name(embeddings):
+    """캐시 키에 쓸 모델 이름 (설정값에서 읽음)"""
+    for attr in ("model_name", "model"):
+        # LocalEmbeddings.model처럼 모델을 로드해 반환하는 property는 읽지 않음 (지연 로딩 유지)
+        if isinstance(inspect.getattr_static(type(embeddings), attr, None), property):
+            continue
+        value = getattr(embeddings, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(embeddings).__name__
+
+
+class CachedEmbeddings(Embeddings):
+    """질문 임베딩을 SQLite에 float32로 저장해 같은 질문의 임베딩 API 호출을 생략
+
+    문서 임베딩(embed_documents)은 캐시하지 않고 그대로 전달합니다.
+    """
+
+    def __init__(self, embeddings, path=EMBEDDING_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.embeddings = embeddings
+        self.model = model_name(embeddings)
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS query_embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_query_accessed ON query_embeddings (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _key(self, text):
+        return make_key(self.model, normalize_query(text))
+
+    def embed_query(self, text):
+        key = self._key(text)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT vector FROM query_embeddings WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE query_embeddings SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                self.hits += 1
+                vector = array("f")
+                vector.frombytes(row[0])
+                return vector.tolist()
+            self.misses += 1
+
+        # 캐시 적중 때와 같은 값이 나오도록 float32로 저장한 값을 반환
+        vector = array("f", self.embeddings.embed_query(text))
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings (key, model, vector, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, self.model, vector.tobytes(), time.time()),
+            )
+            # 개수 제한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제
+            count = conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM query_embeddings WHERE key IN "
+                    "(SELECT key FROM query_embeddings ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            conn.commit()
+        return vector.tolist()
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+    def stats(self):
+        return {"model": self.model, "hits": self.hits, "misses": self.misses}
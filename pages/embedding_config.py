@@ -0,0 +1,25 @@
+# pages/embedding_config.py
+import os
+import re
+
+# 임베딩 백엔드 설정 (환경 변수로 변경 가능)
+# - openai: OpenAIEmbeddings (기본값)
+# - local: CPU에서 실행하는 다국어 sentence-transformers 모델
+# - stub: 네트워크/모델 없이 동작하는 해시 임베딩 (오프라인 평가/벤치마크용)
+# 페이지 첫 화면에서 langchain_core를 불러오지 않도록 임베딩 구현(embedding_backend)과 분리
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+
+
+def collection_name_for(collection_name, backend=None):
+    """백엔드별 컬렉션 이름 (모델마다 벡터 차원이 달라 같은 컬렉션을 함께 쓸 수 없음)
+
+    openai는 기존 컬렉션 이름을 그대로 쓰고, local은 모델 이름을, stub은 "stub"을 붙인 별도 컬렉션을 사용합니다.
+    """
+    backend = backend or EMBEDDING_BACKEND
+    if backend == "openai":
+        return collection_name
+    if backend == "stub":
+        return f"{collection_name}--stub"
+    model = re.sub(r"[^a-zA-Z0-9._-]", "-", LOCAL_EMBEDDING_MODEL.split("/")[-1].lower())
+    return f"{collection_name}--{model}"
@@ -0,0 +1,163 @@
+# pages/flat_index.py
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+
+# Chroma 폴더 안에 함께 저장하는 평면 벡터 인덱스 폴더 이름
+FLAT_INDEX_DIR = "flat-index"
+
+# 내보내기 / 검색 시 한 번에 처리하는 행 수 (임시 메모리 사용량 제한)
+EXPORT_BATCH_SIZE = 5000
+SEARCH_BLOCK_ROWS = 65536
+
+
+def collection_version(collection):
+    """컬렉션 문서 수와 메타데이터의 content_version으로 만든 버전 문자열"""
+    metadata = collection.metadata or {}
+    return f"{collection.count()}:{metadata.get('content_version', '')}"
+
+
+def export_collection(collection, directory):
+    """Chroma 컬렉션의 임베딩을 정규화된 float32 .npy 파일로, 문서/메타데이터는 옆의 SQLite 파일로 내보냄
+
+    여러 프로세스가 같은 .npy 파일을 memmap으로 열면 OS 페이지 캐시의 한 복사본을 함께 씁니다.
+    기존 파일은 새 파일을 다 쓴 뒤에 교체합니다.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    count = collection.count()
+    version = collection_version(collection)
+    space = (collection.metadata or {}).get("hnsw:space", "l2")
+
+    vectors_path = directory / f"{collection.name}.npy"
+    meta_path = directory / f"{collection.name}.sqlite3"
+    tmp_vectors = directory / f"{collection.name}.tmp.npy"
+    tmp_meta = directory / f"{collection.name}.tmp.sqlite3"
+    tmp_meta.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(str(tmp_meta))
+    conn.executescript(
+        """CREATE TABLE info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE chunks (
+            position INTEGER PRIMARY KEY,
+            id TEXT NOT NULL,
+            document TEXT,
+            metadata TEXT
+        );"""
+    )
+    matrix = None
+    position = 0
+    for offset in range(0, count, EXPORT_BATCH_SIZE):
+        data = collection.get(
+            include=["embeddings", "documents", "metadatas"], limit=EXPORT_BATCH_SIZE, offset=offset
+        )
+        batch = np.asarray(data["embeddings"], dtype=np.float32)
+        if not len(batch):
+            break
+        if matrix is None:
+            matrix = np.lib.format.open_memmap(tmp_vectors, mode="w+", dtype=np.float32, shape=(count, batch.shape[1]))
+        batch /= np.linalg.norm(batch, axis=1, keepdims=True) + 1e-12
+        matrix[position:position + len(batch)] = batch
+        conn.executemany(
+            "INSERT INTO chunks (position, id, document, metadata) VALUES (?, ?, ?, ?)",
+            [
+                (position + i, id_, text, json.dumps(metadata or {}, ensure_ascii=False))
+                for i, (id_, text, metadata) in enumerate(zip(data["ids"], data["documents"], data["metadatas"]))
+            ],
+        )
+        position += len(batch)
+    if matrix is None:
+        matrix = np.lib.format.open_memmap(tmp_vectors, mode="w+", dtype=np.float32, shape=(0, 0))
+    matrix.flush()
+    dimensions = matrix.shape[1]
+    del matrix
+
+    conn.executemany(
+        "INSERT INTO info (key, value) VALUES (?, ?)",
+        [("version", version), ("space", space), ("count", str(position)), ("dimensions", str(dimensions))],
+    )
+    conn.commit()
+    conn.close()
+    os.replace(tmp_vectors, vectors_path)
+    os.replace(tmp_meta, meta_path)
+    return {"count": position, "dimensions": dimensions, "version": version}
+
+
+class FlatIndex:
+    """내보낸 컬렉션을 memmap으로 열어 NumPy 행렬 곱으로 정확한 top-k 검색"""
+
+    def __init__(self, directory, name):
+        self.name = name
+        self.vectors_path = Path(directory) / f"{name}.npy"
+        self.meta_path = Path(directory) / f"{name}.sqlite3"
+        self._lock = threading.Lock()
+        self.vectors = np.load(self.vectors_path, mmap_mode="r")
+        self._conn = sqlite3.connect(f"file:{self.meta_path}?mode=ro", uri=True, check_same_thread=False)
+        info = dict(self._conn.execute("SELECT key, value FROM info").fetchall())
+        self.version = info["version"]
+        self.space = info["space"]
+        if int(info["count"]) != len(self.vectors):
+            raise ValueError(f"평면 인덱스 파일이 서로 맞지 않습니다: {self.vectors_path}")
+
+    @classmethod
+    def open(cls, directory, name):
+        """내보낸 파일이 없으면 None"""
+        if not (Path(directory) / f"{name}.npy").exists():
+            return None
+        return cls(directory, name)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def search(self, query_vector, k=10):
+        """코사인 유사도 상위 k개의 (위치, 유사도) 목록"""
+        if not len(self.vectors):
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) + 1e-12)
+
+        # 블록별 상위 k개만 남기면서 전체를 훑음
+        best_positions = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, len(self.vectors), SEARCH_BLOCK_ROWS):
+            scores = self.vectors[start:start + SEARCH_BLOCK_ROWS] @ query
+            if len(scores) > k:
+                top = np.argpartition(scores, -k)[-k:]
+            else:
+                top = np.arange(len(scores))
+            best_positions = np.concatenate([best_positions, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, -k)[-k:]
+                best_positions, best_scores = best_positions[keep], best_scores[keep]
+        order = np.argsort(-best_scores)
+        return [(int(best_positions[i]), float(best_scores[i])) for i in order]
+
+    def documents(self, positions):
+        """위치 목록 순서대로 Document 반환"""
+        if not positions:
+            return []
+        placeholders = ",".join("?" * len(positions))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT position, id, document, metadata FROM chunks WHERE position IN ({placeholders})",
+                list(positions),
+            ).fetchall()
+        by_position = {
+            position: Document(page_content=text or "", metadata=json.loads(metadata or "{}"), id=id_)
+            for position, id_, text, metadata in rows
+        }
+        return [by_position[position] for position in positions if position in by_position]
+
+    def similarity_search_with_score(self, query_vector, k=4):
+        """Chroma와 같은 거리 기준의 (Document, 거리) 목록 (정규화된 벡터 기준)"""
+        found = self.search(query_vector, k)
+        docs = self.documents([position for position, _ in found])
+        # l2는 Chroma처럼 제곱 거리, cosine/ip는 1 - 유사도
+        distance = (lambda score: max(0.0, 2 - 2 * score)) if self.space == "l2" else (lambda score: max(0.0, 1 - score))
+        return [(doc, distance(score)) for doc, (_, score) in zip(docs, found)]
@@ -0,0 +1,64 @@
+# pages/image_ingest.py
+import base64
+import io
+import threading
+
+from PIL import Image, ImageOps
+
+# 화면 표시와 API 전송에 공통으로 사용하는 최대 크기
+MAX_SIZE = 800
+JPEG_QUALITY = 85
+
+# 스레드별로 재사용하는 인코딩 버퍼
+_local = threading.local()
+
+
+def _buffer():
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        buffer = _local.buffer = io.BytesIO()
+    buffer.seek(0)
+    buffer.truncate()
+    return buffer
+
+
+def downscale(image, max_size=MAX_SIZE):
+    """최대 크기를 넘으면 비율을 유지하며 축소"""
+    ratio = min(max_size / image.size[0], max_size / image.size[1])
+    if ratio < 1:
+        new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
+        # reducing_gap: 큰 이미지는 정수배 축소 후 LANCZOS 적용
+        image = image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return image
+
+
+def encode_jpeg(image, quality=JPEG_QUALITY):
+    """이미지를 JPEG로 인코딩한 base64 문자열"""
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = _buffer()
+    image.save(buffer, format="JPEG", quality=quality)
+    return base64.b64encode(buffer.getbuffer()).decode()
+
+
+def load_image(source, max_size=MAX_SIZE):
+    """파일/업로드 객체를 한 번만 디코딩하여 축소된 RGB 이미지 반환
+
+    JPEG는 draft 모드로 디코딩 단계에서 1/2~1/8 크기로 줄여 읽고,
+    EXIF 회전 정보를 반영한 뒤 최대 크기에 맞춰 한 번만 리샘플링합니다.
+    """
+    image = Image.open(source)
+    if image.format == "JPEG":
+        # 긴 변이 max_size 이상으로 유지되는 가장 작은 배율로 디코딩
+        ratio = min(1.0, max_size / max(image.size))
+        image.draft("RGB", (int(image.size[0] * ratio), int(image.size[1] * ratio)))
+    image = ImageOps.exif_transpose(image)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return downscale(image, max_size)
+
+
+def ingest_image(source, max_size=MAX_SIZE):
+    """FoodAnalyzer.prepare_image와 같은 (base64 JPEG, 축소 이미지) 튜플 반환"""
+    image = load_image(source, max_size)
+    return encode_jpeg(image), image
@@ -0,0 +1,195 @@
+# pages/ingest_pipeline.py
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from pathlib import Path
+
+import httpx
+from langchain_core.documents import Document
+
+# 분할 설정 (기존 create_vectorstore와 동일)
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 0
+SPLIT_MODEL = "gpt-4o-mini"
+
+# 로컬 파일로 읽을 확장자
+HTML_SUFFIXES = {".html", ".htm"}
+TEXT_SUFFIXES = {".txt", ".md"}
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_TIMEOUT = 30
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 가져온 문서가 분할 단계보다 너무 앞서가지 않도록 큐 크기 제한
+QUEUE_SIZE = 64
+
+_DONE = object()
+
+
+def is_url(source):
+    return source.startswith(("http://", "https://"))
+
+
+def expand_sources(sources):
+    """URL은 그대로, 로컬 폴더는 읽을 수 있는 파일 목록으로 펼침"""
+    expanded = []
+    for source in sources:
+        if is_url(source):
+            expanded.append(source)
+            continue
+        path = Path(source).resolve()
+        if path.is_dir():
+            expanded.extend(
+                str(child) for child in sorted(path.rglob("*"))
+                if child.is_file() and child.suffix.lower() in HTML_SUFFIXES | TEXT_SUFFIXES
+            )
+        else:
+            expanded.append(str(path))
+    return expanded
+
+
+@lru_cache(maxsize=1)
+def get_splitter():
+    # 프로세스마다 한 번만 토크나이저를 로드
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP, model_name=SPLIT_MODEL
+    )
+
+
+def warm_worker():
+    get_splitter()
+
+
+def parse_html(raw, source):
+    """WebBaseLoader와 같은 방식으로 본문 텍스트와 메타데이터 추출"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(raw, "html.parser")
+    metadata = {"source": source}
+    if title := soup.find("title"):
+        metadata["title"] = title.get_text()
+    if description := soup.find("meta", attrs={"name": "description"}):
+        metadata["description"] = description.get("content", "No description found.")
+    if html := soup.find("html"):
+        metadata["language"] = html.get("lang", "No language found.")
+    return soup.get_text(), metadata
+
+
+def split_source(source, raw, is_html):
+    """(작업 프로세스에서 실행) 원문 하나를 파싱하고 청크 Document 목록으로 분할"""
+    if is_html:
+        text, metadata = parse_html(raw, source)
+    else:
+        text, metadata = raw.decode("utf-8", errors="replace"), {"source": source, "title": Path(source).name}
+    return [Document(page_content=chunk, metadata=dict(metadata)) for chunk in get_splitter().split_text(text)]
+
+
+class IngestPipeline:
+    """수집 → 분할 → (소비자의) 임베딩이 겹쳐서 진행되는 문서 수집 파이프라인
+
+    URL은 크기가 제한된 비동기 HTTP 풀로 동시에 가져오고, 파싱/분할은 프로세스 풀에서 처리합니다.
+    반복하면 분할이 끝나는 대로 청크 Document를 내보내므로 소비자는 바로 임베딩을 시작할 수 있습니다.
+    """
+
+    def __init__(self, sources, max_connections=DEFAULT_MAX_CONNECTIONS, workers=None,
+                 timeout=DEFAULT_TIMEOUT, headers=None):
+        self.sources = expand_sources(sources)
+        self.max_connections = max_connections
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.headers = headers or {"User-Agent": os.environ.get("USER_AGENT", USER_AGENT)}
+        self.loaded = set()
+        self.failed = {}
+        self.docs = 0
+        self.chunks = 0
+        self.elapsed = 0.0
+
+    async def _fetch_all(self, output):
+        semaphore = asyncio.Semaphore(self.max_connections)
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+
+        async with httpx.AsyncClient(headers=self.headers, timeout=self.timeout, limits=limits,
+                                     follow_redirects=True) as client:
+            async def fetch(source):
+                async with semaphore:
+                    try:
+                        if is_url(source):
+                            response = await client.get(source)
+                            response.raise_for_status()
+                            raw = response.content
+                            is_html = "html" in response.headers.get("content-type", "text/html")
+                        else:
+                            raw = await asyncio.to_thread(Path(source).read_bytes)
+                            is_html = Path(source).suffix.lower() in HTML_SUFFIXES
+                    except Exception as e:
+                        self.failed[source] = str(e)
+                        print(f"Error loading {source}: {e}")
+                        return
+                # 분할 단계가 밀려 있으면 여기서 대기 (메모리 사용량 제한)
+                await asyncio.to_thread(output.put, (source, raw, is_html))
+
+            await asyncio.gather(*(fetch(source) for source in self.sources))
+        output.put(_DONE)
+
+    def _fetch_thread(self, output):
+        try:
+            asyncio.run(self._fetch_all(output))
+        except Exception as e:
+            print(f"Error fetching sources: {e}")
+            output.put(_DONE)
+
+    def __iter__(self):
+        start = time.perf_counter()
+        # 작업 프로세스는 수집 스레드를 시작하기 전에 만들고, 수집하는 동안 토크나이저를 미리 로드
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        executor.submit(warm_worker)
+
+        fetched = queue.Queue(maxsize=QUEUE_SIZE)
+        threading.Thread(target=self._fetch_thread, args=(fetched,), daemon=True).start()
+
+        futures = {}
+        fetch_done = False
+        try:
+            while not fetch_done or futures:
+                # 가져온 문서를 분할 작업으로 넘김 (진행 중인 분할이 없으면 다음 문서를 기다림)
+                try:
+                    item = fetched.get() if not futures else fetched.get_nowait()
+                except queue.Empty:
+                    item = None
+                if item is _DONE:
+                    fetch_done = True
+                elif item is not None:
+                    futures[executor.submit(split_source, *item)] = item[0]
+                    continue
+
+                # 분할이 끝난 문서의 청크를 바로 내보냄
+                done, _ = wait(futures, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = futures.pop(future)
+                    try:
+                        chunks = future.result()
+                    except Exception as e:
+                        self.failed[source] = str(e)
+                        print(f"Error splitting {source}: {e}")
+                        continue
+                    self.loaded.add(source)
+                    self.docs += 1
+                    self.chunks += len(chunks)
+                    yield from chunks
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.elapsed = time.perf_counter() - start
+
+    def stats(self):
+        return {
+            "docs": self.docs,
+            "chunks": self.chunks,
+            "failed": len(self.failed),
+            "seconds": self.elapsed,
+            "docs_per_sec": self.docs / self.elapsed if self.elapsed else 0.0,
+        }
@@ -0,0 +1,201 @@
+# pages/keyword_index.py
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+# Chroma 폴더 안에 함께 저장하는 역색인 파일 이름
+KEYWORD_INDEX_FILE = "keyword-index.sqlite3"
+
+# BM25 / RRF 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+
+_WORD = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+
+def tokenize(text):
+    """한글은 음절 2-gram(한 글자 단어는 그대로), 영문/숫자는 단어 단위로 토큰화
+
+    형태소 분석기 없이도 "스트라이크존"과 "스트라이크 존", "김치찌개를"과 "김치찌개"가 같은 토큰을 공유합니다.
+    """
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if word[0] >= "가" and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class KeywordIndex:
+    """컬렉션별 BM25 역색인 (SQLite에 저장, 문서 추가/삭제 시 증분 갱신)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.executescript(
+                """CREATE TABLE IF NOT EXISTS docs (
+                    collection TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    PRIMARY KEY (collection, id)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS postings (
+                    collection TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (collection, term, doc_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (collection, doc_id);"""
+            )
+        return self._conn
+
+    def _delete(self, conn, collection, ids):
+        rows = [(collection, id_) for id_ in ids]
+        conn.executemany("DELETE FROM postings WHERE collection = ? AND doc_id = ?", rows)
+        conn.executemany("DELETE FROM docs WHERE collection = ? AND id = ?", rows)
+
+    def add(self, collection, ids, texts):
+        """문서 추가 (같은 ID가 있으면 교체)"""
+        with self._lock:
+            conn = self._connect()
+            self._delete(conn, collection, ids)
+            docs, postings = [], []
+            for id_, text in zip(ids, texts):
+                counts = Counter(tokenize(text))
+                docs.append((collection, id_, sum(counts.values())))
+                postings.extend((collection, term, id_, tf) for term, tf in counts.items())
+            conn.executemany("INSERT INTO docs (collection, id, length) VALUES (?, ?, ?)", docs)
+            conn.executemany("INSERT INTO postings (collection, term, doc_id, tf) VALUES (?, ?, ?, ?)", postings)
+            conn.commit()
+
+    def delete(self, collection, ids):
+        with self._lock:
+            conn = self._connect()
+            self._delete(conn, collection, ids)
+            conn.commit()
+
+    def clear(self, collection):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM postings WHERE collection = ?", (collection,))
+            conn.execute("DELETE FROM docs WHERE collection = ?", (collection,))
+            conn.commit()
+
+    def count(self, collection):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM docs WHERE collection = ?", (collection,)).fetchone()[0]
+
+    def sync(self, collection, chroma_collection):
+        """색인 문서 수가 Chroma 컬렉션과 다르면 컬렉션 전체로 색인을 다시 만듦 (기존 컬렉션 최초 사용 시)"""
+        if self.count(collection) == chroma_collection.count():
+            return False
+        data = chroma_collection.get(include=["documents"])
+        self.clear(collection)
+        for start in range(0, len(data["ids"]), 1000):
+            self.add(collection, data["ids"][start:start + 1000], data["documents"][start:start + 1000])
+        return True
+
+    def search(self, collection, query, k=10):
+        """BM25 점수 상위 k개 문서의 (ID, 점수) 목록"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            conn = self._connect()
+            total, average = conn.execute(
+                "SELECT COUNT(*), AVG(length) FROM docs WHERE collection = ?", (collection,)
+            ).fetchone()
+            if not total:
+                return []
+            placeholders = ",".join("?" * len(terms))
+            rows = conn.execute(
+                f"SELECT p.term, p.doc_id, p.tf, d.length FROM postings p "
+                f"JOIN docs d ON d.collection = p.collection AND d.id = p.doc_id "
+                f"WHERE p.collection = ? AND p.term IN ({placeholders})",
+                (collection, *terms),
+            ).fetchall()
+
+        document_frequency = Counter(term for term, _, _, _ in rows)
+        scores = Counter()
+        for term, doc_id, tf, length in rows:
+            df = document_frequency[term]
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average))
+        return scores.most_common(k)
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """여러 순위 목록(ID 리스트)을 RRF 점수로 합친 (ID, 점수) 목록"""
+    scores = Counter()
+    for ranking in rankings:
+        for rank, id_ in enumerate(ranking):
+            scores[id_] += 1 / (k + rank + 1)
+    return scores.most_common()
+
+
+class HybridRetriever(BaseRetriever):
+    """벡터 검색과 BM25 검색 결과를 RRF로 합친 리트리버 (index가 None이면 벡터 검색만 사용)
+
+    벡터 검색으로 찾은 문서에는 metadata["relevance_score"](0~1 유사도)를 붙입니다.
+    flat_index(FlatIndex)를 주면 벡터 검색을 Chroma 대신 memmap 평면 인덱스에서 합니다.
+    """
+
+    vectorstore: Any
+    index: Any = None
+    flat_index: Any = None
+    collection_name: str = ""
+    k: int = 3
+    fetch_k: int = 20
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        dense = []
+        fetch_k = self.fetch_k if self.index is not None else self.k
+        relevance = self.vectorstore._select_relevance_score_fn()
+        if self.flat_index is not None:
+            found = self.flat_index.similarity_search_with_score(self.vectorstore.embeddings.embed_query(query), k=fetch_k)
+        else:
+            found = self.vectorstore.similarity_search_with_score(query, k=fetch_k)
+        for doc, distance in found:
+            # 거리를 0~1 유사도로 변환 (l2 거리가 큰 경우 음수가 되므로 0으로 자름)
+            doc.metadata["relevance_score"] = min(1.0, max(0.0, relevance(distance)))
+            dense.append(doc)
+        keyword = self.index.search(self.collection_name, query, k=self.fetch_k) if self.index is not None else []
+
+        documents = {doc.id: doc for doc in dense}
+        fused = reciprocal_rank_fusion([[doc.id for doc in dense], [id_ for id_, _ in keyword]])
+        # 같은 내용의 청크가 중복 저장된 경우를 대비해 여유 있게 후보를 가져옴
+        candidates = [id_ for id_, _ in fused[:self.k * 4]]
+
+        # BM25로만 찾은 문서는 Chroma에서 본문을 가져옴
+        missing = [id_ for id_ in candidates if id_ not in documents]
+        if missing:
+            data = self.vectorstore._collection.get(ids=missing, include=["documents", "metadatas"])
+            for id_, text, metadata in zip(data["ids"], data["documents"], data["metadatas"]):
+                documents[id_] = Document(page_content=text, metadata=metadata or {}, id=id_)
+
+        results, seen = [], set()
+        for id_ in candidates:
+            doc = documents.get(id_)
+            if doc is None or doc.page_content in seen:
+                continue
+            seen.add(doc.page_content)
+            results.append(doc)
+            if len(results) == self.k:
+                break
+        return results
@@ -0,0 +1,42 @@
+# pages/llm_clients.py
+import threading
+from functools import lru_cache
+
+import httpx
+
+# 프로세스 전체에서 공유하는 HTTP 연결 풀 설정
+# (세션/질문마다 새 클라이언트를 만들면 keep-alive 연결과 TLS 세션을 매번 다시 맺어야 함)
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+KEEPALIVE_EXPIRY = 120
+TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+_clients_lock = threading.Lock()
+_http_client = None
+
+
+def get_http_client():
+    """OpenAI 호출에 공유하는 동기 httpx 클라이언트"""
+    global _http_client
+    with _clients_lock:
+        if _http_client is None:
+            limits = httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            )
+            _http_client = httpx.Client(limits=limits, timeout=TIMEOUT)
+        return _http_client
+
+
+@lru_cache(maxsize=None)
+def get_chat_model(model=None, temperature=0):
+    """설정별로 한 번만 만드는 ChatOpenAI (공유 연결 풀 사용, 여러 스레드에서 동시에 사용 가능)"""
+    from langchain_openai import ChatOpenAI
+
+    kwargs = {"model": model} if model else {}
+    return ChatOpenAI(
+        temperature=temperature,
+        http_client=get_http_client(),
+        **kwargs,
+    )
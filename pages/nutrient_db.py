@@ -0,0 +1,238 @@
+# pages/nutrient_db.py
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+# 영양성분 DB 경로 설정 (환경 변수로 변경 가능)
+NUTRIENT_DB_PATH = Path(os.getenv("FOODSCAN_NUTRIENT_DB", Path(__file__).parent.parent / "data" / "nutrients.sqlite3"))
+
+# 공공 식품영양성분 CSV 열 이름 후보 (식품의약품안전처 식품영양성분 DB 기준)
+COLUMN_ALIASES = {
+    "name": ["식품명", "음식명", "food_name", "name"],
+    "calories": ["에너지(kcal)", "에너지(㎉)", "열량(kcal)", "칼로리", "calories"],
+    "protein": ["단백질(g)", "단백질", "protein"],
+    "carbs": ["탄수화물(g)", "탄수화물", "carbs"],
+    "fat": ["지방(g)", "지방", "fat"],
+    "basis": ["영양성분함량기준량", "기준량"],
+    "serving": ["1회제공량", "1회 제공량", "serving"],
+}
+
+# 유사도 기준 (자모 3-gram Dice 계수)
+# 0.6이면 "김치전"→"김치", "순두부"→"순두부찌개"처럼 다른 음식이 일치해 LLM 조회가 생략되므로,
+# 글자 수가 거의 같은 표기 차이("된장찌게"→"된장찌개", 0.82)만 일치로 봄
+MATCH_THRESHOLD = 0.75
+MIN_LENGTH_RATIO = 0.85
+CANDIDATE_LIMIT = 20
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_END = 0xD7A3
+_CHOSEONG = [chr(c) for c in range(0x1100, 0x1113)]
+_JUNGSEONG = [chr(c) for c in range(0x1161, 0x1176)]
+_JONGSEONG = [""] + [chr(c) for c in range(0x11A8, 0x11C3)]
+
+
+def normalize_name(name):
+    """괄호 내용, 공백, 특수문자를 제거한 음식명"""
+    name = re.sub(r"\(.*?\)|\[.*?\]", "", str(name))
+    return re.sub(r"[^0-9a-z가-힣]", "", name.lower())
+
+
+def to_jamo(text):
+    """한글 음절을 초성/중성/종성 자모로 분해"""
+    jamo = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_END:
+            offset = code - _HANGUL_BASE
+            jamo.append(_CHOSEONG[offset // 588])
+            jamo.append(_JUNGSEONG[(offset % 588) // 28])
+            jamo.append(_JONGSEONG[offset % 28])
+        else:
+            jamo.append(ch)
+    return "".join(jamo)
+
+
+def trigrams(text):
+    padded = f"  {to_jamo(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _parse_number(value):
+    match = re.search(r"-?\d+(?:\.\d+)?", str(value or "").replace(",", ""))
+    return float(match.group()) if match else None
+
+
+def _format_number(value):
+    return f"{value:g}" if value == int(value) else f"{value:.1f}"
+
+
+class NutrientDB:
+    """정규화된 음식명 + 자모 3-gram 색인을 가진 로컬 영양성분 저장소"""
+
+    def __init__(self, path=NUTRIENT_DB_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS foods (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    norm TEXT NOT NULL,
+                    gram_count INTEGER NOT NULL,
+                    calories REAL,
+                    protein REAL,
+                    carbs REAL,
+                    fat REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_foods_norm ON foods (norm);
+                CREATE TABLE IF NOT EXISTS grams (
+                    gram TEXT NOT NULL,
+                    food_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_grams_gram ON grams (gram);
+                """
+            )
+        return self._conn
+
+    def load_csv(self, csv_path, replace=True):
+        """공공 식품영양성분 CSV를 읽어 DB에 적재하고 적재 건수를 반환"""
+        for encoding in ("utf-8-sig", "cp949"):
+            try:
+                with open(csv_path, newline="", encoding=encoding) as f:
+                    rows = list(csv.DictReader(f))
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            raise ValueError(f"CSV 인코딩을 인식할 수 없습니다: {csv_path}")
+
+        if not rows:
+            return 0
+        columns = {}
+        for field, aliases in COLUMN_ALIASES.items():
+            columns[field] = next((alias for alias in aliases if alias in rows[0]), None)
+        if not columns["name"] or not columns["calories"]:
+            raise ValueError(f"음식명/칼로리 열을 찾을 수 없습니다: {list(rows[0])}")
+
+        with self._lock:
+            conn = self._connect()
+            if replace:
+                conn.execute("DELETE FROM foods")
+                conn.execute("DELETE FROM grams")
+            count = 0
+            for row in rows:
+                name = (row.get(columns["name"]) or "").strip()
+                norm = normalize_name(name)
+                if not norm:
+                    continue
+
+                # 100g 기준 값은 1회 제공량 기준으로 환산
+                scale = 1.0
+                basis = _parse_number(row.get(columns["basis"])) if columns["basis"] else None
+                serving = _parse_number(row.get(columns["serving"])) if columns["serving"] else None
+                if basis and serving:
+                    scale = serving / basis
+
+                values = []
+                for field in ("calories", "protein", "carbs", "fat"):
+                    value = _parse_number(row.get(columns[field])) if columns[field] else None
+                    values.append(value * scale if value is not None else None)
+
+                grams = trigrams(norm)
+                cursor = conn.execute(
+                    "INSERT INTO foods (name, norm, gram_count, calories, protein, carbs, fat) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (name, norm, len(grams), *values),
+                )
+                conn.executemany(
+                    "INSERT INTO grams (gram, food_id) VALUES (?, ?)",
+                    [(gram, cursor.lastrowid) for gram in grams],
+                )
+                count += 1
+            conn.commit()
+        return count
+
+    def search(self, name, limit=5):
+        """정규화 이름 일치 우선, 이후 자모 3-gram 유사도 순으로 후보 반환"""
+        norm = normalize_name(name)
+        if not norm:
+            return []
+        with self._lock:
+            conn = self._connect()
+            exact = conn.execute(
+                "SELECT id, name, calories, protein, carbs, fat FROM foods WHERE norm = ? LIMIT 1", (norm,)
+            ).fetchone()
+            if exact:
+                return [(1.0, exact)]
+
+            grams = trigrams(norm)
+            placeholders = ",".join("?" * len(grams))
+            candidates = conn.execute(
+                f"""SELECT f.id, f.name, f.calories, f.protein, f.carbs, f.fat, f.gram_count, COUNT(*) AS shared
+                    FROM grams g JOIN foods f ON f.id = g.food_id
+                    WHERE g.gram IN ({placeholders})
+                    GROUP BY g.food_id
+                    ORDER BY shared DESC
+                    LIMIT ?""",
+                (*grams, CANDIDATE_LIMIT),
+            ).fetchall()
+
+        scored = []
+        for row in candidates:
+            score = 2 * row[7] / (len(grams) + row[6])
+            scored.append((score, row[:6]))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored[:limit]
+
+    def lookup(self, name, threshold=MATCH_THRESHOLD, min_length_ratio=MIN_LENGTH_RATIO):
+        """(DB의 음식명, get_nutrition_info와 같은 형식의 영양 정보), 없으면 None
+
+        유사도가 기준 이상이어도 글자 수 차이가 크면("김치전"과 "김치") 다른 음식으로 봅니다.
+        """
+        length = len(normalize_name(name))
+        for score, row in self.search(name, limit=CANDIDATE_LIMIT):
+            if score < threshold:
+                break
+            _, db_name, calories, protein, carbs, fat = row
+            db_length = len(normalize_name(db_name))
+            if min(length, db_length) / max(length, db_length) < min_length_ratio or calories is None:
+                continue
+            units = (("calories", calories, "kcal"), ("protein", protein, "g"), ("carbs", carbs, "g"), ("fat", fat, "g"))
+            return db_name, {
+                key: f"{_format_number(value)}{unit}" if value is not None else "N/A"
+                for key, value, unit in units
+            }
+        return None
+
+
+_default_db = None
+_default_lock = threading.Lock()
+
+
+def get_default_db():
+    """영양성분 DB가 준비되어 있으면 공유 인스턴스를, 없으면 None 반환"""
+    global _default_db
+    with _default_lock:
+        if _default_db is None and NUTRIENT_DB_PATH.exists():
+            _default_db = NutrientDB()
+        return _default_db
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공공 식품영양성분 CSV로 로컬 영양성분 DB 생성")
+    parser.add_argument("csv_path", help="식품영양성분 CSV 파일 경로")
+    parser.add_argument("--db", default=str(NUTRIENT_DB_PATH), help="생성할 SQLite DB 경로")
+    parser.add_argument("--append", action="store_true", help="기존 데이터를 유지하고 추가")
+    args = parser.parse_args()
+
+    count = NutrientDB(args.db).load_csv(args.csv_path, replace=not args.append)
+    print(f"{count}개 음식의 영양 정보를 저장했습니다: {args.db}")
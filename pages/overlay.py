@@ -0,0 +1,126 @@
+# pages/overlay.py
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+# 한글 라벨용 폰트 후보 (앞에서부터 시도)
+FONT_CANDIDATES = [
+    "NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+FONT_SIZE = 20
+LABEL_HEIGHT = 25
+BOX_COLOR = (255, 0, 0, 255)
+TEXT_COLOR = (255, 255, 255, 255)
+
+
+@lru_cache(maxsize=8)
+def get_font(size=FONT_SIZE):
+    """프로세스당 한 번만 폰트를 로드 (없으면 기본 폰트, 그것도 없으면 None)"""
+    for candidate in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def item_label(item):
+    text = f"{item['food']}"
+    if 'calories' in item:
+        text += f" ({item['calories']})"
+    return text
+
+
+class OverlayRenderer:
+    """바운딩 박스와 라벨을 투명 레이어에 그린 뒤 원본 위에 한 번만 합성
+
+    라벨/좌표가 같으면 캐시된 레이어를 재사용하고, 원본 이미지의 RGBA 변환 결과도
+    마지막으로 사용한 이미지에 대해 보관해 라벨만 바뀔 때는 레이어만 다시 그립니다.
+    """
+
+    def __init__(self, font_size=FONT_SIZE, cache_size=32):
+        self.font_size = font_size
+        self.cache_size = cache_size
+        self._overlays = OrderedDict()
+        self._base = (None, None)
+        self._lock = threading.Lock()
+
+    def _overlay_key(self, size, items):
+        return size, tuple((tuple(item['bbox']), item_label(item)) for item in items if 'bbox' in item)
+
+    def render_overlay(self, size, items):
+        key = self._overlay_key(size, items)
+        with self._lock:
+            overlay = self._overlays.get(key)
+            if overlay is not None:
+                self._overlays.move_to_end(key)
+                return overlay
+
+        font = get_font(self.font_size)
+        width, height = size
+        overlay = Image.new("RGBA", size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+        for bbox, text in key[1]:
+            # 이미지 경계 확인
+            x1, y1, x2, y2 = bbox
+            x1 = max(0, min(x1, width))
+            y1 = max(0, min(y1, height))
+            x2 = max(0, min(x2, width))
+            y2 = max(0, min(y2, height))
+
+            # 박스 그리기
+            draw.rectangle([x1, y1, x2, y2], outline=BOX_COLOR, width=3)
+
+            # 라벨은 박스 위에, 공간이 없으면 박스 안쪽 상단에 표시
+            label_y = y1 - LABEL_HEIGHT if y1 >= LABEL_HEIGHT else y1
+            if font is not None:
+                text_bbox = draw.textbbox((x1, label_y), text, font=font)
+                draw.rectangle(text_bbox, fill=BOX_COLOR)
+                draw.text((x1, label_y), text, fill=TEXT_COLOR, font=font)
+            else:
+                draw.rectangle([x1, label_y, x1 + 200, label_y + LABEL_HEIGHT], fill=BOX_COLOR)
+                draw.text((x1, label_y), text, fill=TEXT_COLOR)
+
+        with self._lock:
+            self._overlays[key] = overlay
+            if len(self._overlays) > self.cache_size:
+                self._overlays.popitem(last=False)
+        return overlay
+
+    def _rgba_base(self, image):
+        with self._lock:
+            source, base = self._base
+            if source is image:
+                return base
+        base = image.convert("RGBA")
+        with self._lock:
+            self._base = (image, base)
+        return base
+
+    def render(self, image, items):
+        """원본과 같은 모드의 주석 이미지 반환 (원본은 변경하지 않음)"""
+        overlay = self.render_overlay(image.size, items)
+        composed = Image.alpha_composite(self._rgba_base(image), overlay)
+        return composed if image.mode == "RGBA" else composed.convert(image.mode)
+
+
+_default_renderer = None
+_default_lock = threading.Lock()
+
+
+def get_default_renderer():
+    """프로세스 전체에서 공유하는 렌더러 반환"""
+    global _default_renderer
+    with _default_lock:
+        if _default_renderer is None:
+            _default_renderer = OverlayRenderer()
+        return _default_renderer
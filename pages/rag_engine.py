@@ -0,0 +1,363 @@
+# pages/rag_engine.py
+import operator
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Sequence, TypedDict
+
+from dotenv import load_dotenv
+
+from pages.embedding_config import EMBEDDING_BACKEND, collection_name_for
+
+# langchain_core(+pydantic)는 import 비용이 커서 그래프를 만들 때 불러옴 (_build 참고)
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+load_dotenv()
+
+# Chroma DB 경로 설정 (환경 변수로 변경 가능)
+PERSIST_DIRECTORY = Path(os.getenv("CHROMA_PERSIST_DIRECTORY", Path(__file__).parent.parent / "chroma"))
+
+# 검색 방식: hybrid (벡터 + BM25, RRF로 결합) 또는 vector
+RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "hybrid")
+
+# 컬렉션 변경 여부(답변 캐시 무효화)를 확인하는 최소 간격(초)
+VERSION_CHECK_INTERVAL = 10
+
+# 검색 점수(벡터 유사도 0~1) 기준
+# - SCORE_FLOOR 미만: LLM 호출 없이 NO_ANSWER 반환
+# - REWRITE_BELOW 미만: 검색어를 다시 써서 최대 MAX_REWRITES번 재검색
+# 점수는 langchain의 l2 변환(1 - 거리/√2, Chroma의 l2 거리는 제곱 거리)이라 코사인 유사도 c에 대해 1 - (2 - 2c)/√2이고,
+# 임베딩 모델마다 분포가 크게 다르므로 백엔드별로 정함 (환경 변수로 덮어쓸 수 있음)
+# - openai (text-embedding-ada-002): 코사인 유사도가 0.7~1.0에 몰려 있어 무관한 질문도 0.55 이상이 나옴
+#   (baseball-chroma에서 서로 가장 먼 청크끼리도 0.53). 0.70은 코사인 0.79, 0.76은 코사인 0.83
+# - local (multilingual MiniLM): 무관한 문장의 코사인이 0.3 이하라 0 근처, 0.15는 코사인 0.4
+# - stub (해시 임베딩): 무관한 질문은 모두 0이지만 관련 질문도 40%가 0이라 구분할 수 없어 끔
+# 보정: python evaluate_retrieval.py evaluation/baseball-chroma.jsonl --backend <백엔드> --off-topic evaluation/off-topic.jsonl
+SCORE_THRESHOLDS = {
+    "openai": (0.70, 0.76),
+    "local": (0.15, 0.35),
+    "stub": (0.0, 0.0),
+}
+_score_floor, _rewrite_below = SCORE_THRESHOLDS.get(EMBEDDING_BACKEND, SCORE_THRESHOLDS["openai"])
+SCORE_FLOOR = float(os.getenv("RAG_SCORE_FLOOR", _score_floor))
+REWRITE_BELOW = float(os.getenv("RAG_REWRITE_BELOW", _rewrite_below))
+MAX_REWRITES = int(os.getenv("RAG_MAX_REWRITES", "1"))
+
+# 컨텍스트 구성: 후보 청크를 더 많이 가져와 MMR + 토큰 예산으로 고름 (RAG_CONTEXT_PACKING=0이면 상위 k개를 그대로 사용)
+CONTEXT_PACKING = os.getenv("RAG_CONTEXT_PACKING", "1") not in ("0", "false", "no")
+CONTEXT_CANDIDATES = int(os.getenv("RAG_CONTEXT_CANDIDATES", "8"))
+
+# 평면 벡터 인덱스(export_flat_index.py로 내보낸 memmap): off / auto / on
+# auto: 내보낸 파일이 컬렉션과 같은 버전이고 청크 수가 FLAT_INDEX_MAX_CHUNKS 이하일 때만 사용
+# (전수 검색이라 이보다 크면 Chroma의 HNSW 검색이 더 빠름, benchmarks/bench_flat_index.py 참고)
+FLAT_INDEX = os.getenv("RAG_FLAT_INDEX", "auto")
+FLAT_INDEX_MAX_CHUNKS = int(os.getenv("RAG_FLAT_INDEX_MAX_CHUNKS", "20000"))
+
+NO_ANSWER = "제가 가진 정보로는 답변하기 어렵습니다."
+
+REWRITE_PROMPT = """
+사용자의 질문을 문서 검색에 적합한 짧은 검색어로 바꿔주세요.
+핵심 용어만 남기고, 검색어 외의 다른 말은 쓰지 마세요.
+"""
+
+
+class AgentState(TypedDict):
+    messages: Annotated[Sequence["BaseMessage"], operator.add]
+    question: str  # 사용자의 원래 질문 (답변 생성에 사용)
+    query: str  # 검색어 (재작성되면 바뀜)
+    context: str
+    context_tokens: int
+    score: float
+    rewrites: int
+    next: str
+    response: str
+
+
+def initial_state(question):
+    return AgentState(
+        messages=[],
+        question=question,
+        query=question,
+        context="",
+        context_tokens=0,
+        score=0.0,
+        rewrites=0,
+        next="",
+        response=""
+    )
+
+
+class RagEngine:
+    """컬렉션 하나에 대한 검색 + 답변 생성 파이프라인
+
+    벡터 스토어, 리트리버, StateGraph는 import 시점이 아니라 첫 질문에서 한 번만 만들고
+    여러 세션(스레드)이 같은 인스턴스를 공유합니다.
+    """
+
+    def __init__(self, collection_name, system_prompt, k=3, answer_cache=None):
+        if answer_cache is None:
+            from pages.answer_cache import get_default_answer_cache
+            answer_cache = get_default_answer_cache()
+        # 임베딩 백엔드에 맞는 컬렉션 사용 (local 백엔드는 별도 컬렉션)
+        self.collection_name = collection_name_for(collection_name)
+        self.system_prompt = system_prompt
+        self.k = k
+        self.answer_cache = answer_cache
+        self.packer = None
+        if CONTEXT_PACKING:
+            from pages.context_packer import ContextPacker
+            self.packer = ContextPacker(baseline_k=k)
+        self.timings = {}
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked = 0.0
+        self._embeddings = None
+        self._vectorstore = None
+        self._retriever = None
+        self._chain = None
+        self._answer_chain = None
+        self._rewrite_chain = None
+
+    def _build(self):
+        start = time.perf_counter()
+        from langchain_chroma import Chroma
+
+        from pages.embedding_backend import get_embeddings
+        from pages.embedding_cache import CachedEmbeddings
+        self.timings["import"] = time.perf_counter() - start
+
+        # 저장된 벡터 스토어 로드
+        start = time.perf_counter()
+        try:
+            embeddings = CachedEmbeddings(get_embeddings())
+            vectorstore = Chroma(
+                collection_name=self.collection_name,
+                embedding_function=embeddings,
+                persist_directory=str(PERSIST_DIRECTORY),
+            )
+            from pages.keyword_index import KEYWORD_INDEX_FILE, HybridRetriever, KeywordIndex
+
+            index = None
+            if RETRIEVAL_MODE == "hybrid":
+                # 역색인이 없거나 컬렉션과 맞지 않으면 컬렉션 문서로 다시 만듦
+                index = KeywordIndex(PERSIST_DIRECTORY / KEYWORD_INDEX_FILE)
+                index.sync(self.collection_name, vectorstore._collection)
+            flat_index = self._open_flat_index(vectorstore._collection) if FLAT_INDEX != "off" else None
+            # 벡터 검색 유사도(relevance_score)를 문서에 붙여 답변 생략/재검색 판단에 사용
+            retriever = HybridRetriever(
+                vectorstore=vectorstore, index=index, flat_index=flat_index, collection_name=self.collection_name,
+                k=CONTEXT_CANDIDATES if self.packer is not None else self.k,
+            )
+        except Exception as e:
+            print(f"Error loading vector store ({self.collection_name}) at {PERSIST_DIRECTORY}: {e}")
+            raise
+        self.timings["vectorstore"] = time.perf_counter() - start
+
+        # 답변 생성 체인은 한 번만 만들고 모든 질문이 공유 (공유 연결 풀 사용)
+        start = time.perf_counter()
+        from langchain_core.prompts import ChatPromptTemplate
+
+        from pages.llm_clients import get_chat_model
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", self.system_prompt),
+            ("human", "{query}")
+        ])
+        answer_chain = prompt | get_chat_model()
+        rewrite_prompt = ChatPromptTemplate.from_messages([
+            ("system", REWRITE_PROMPT),
+            ("human", "{query}")
+        ])
+        rewrite_chain = rewrite_prompt | get_chat_model()
+        self.timings["llm"] = time.perf_counter() - start
+
+        # StateGraph 설정
+        start = time.perf_counter()
+        chain = self._build_graph()
+        self.timings["graph"] = time.perf_counter() - start
+
+        self._embeddings = embeddings
+        self._answer_chain, self._rewrite_chain = answer_chain, rewrite_chain
+        self._vectorstore, self._retriever, self._chain = vectorstore, retriever, chain
+
+    def _build_graph(self):
+        global BaseMessage
+        # StateGraph가 AgentState의 타입 힌트("BaseMessage")를 모듈 전역에서 찾으므로 전역 이름으로 import
+        from langchain_core.messages import BaseMessage
+        from langgraph.graph import END, StateGraph
+
+        graph = StateGraph(AgentState)
+        graph.add_node("should_retrieve", self.should_retrieve)
+        graph.add_node("grade_documents", self.grade_documents)
+        graph.add_node("rewrite_query", self.rewrite_query)
+        graph.add_node("generate_answer", self.generate_answer)
+        graph.add_node("no_answer", self.no_answer)
+
+        graph.set_entry_point("should_retrieve")
+        graph.add_edge("should_retrieve", "grade_documents")
+        # grade_documents가 정한 next 값으로 한 갈래만 실행
+        graph.add_conditional_edges(
+            "grade_documents",
+            lambda state: state["next"],
+            {"generate_answer": "generate_answer", "rewrite_query": "rewrite_query", "no_answer": "no_answer"},
+        )
+        graph.add_edge("rewrite_query", "should_retrieve")
+        graph.add_edge("generate_answer", END)
+        graph.add_edge("no_answer", END)
+        return graph.compile()
+
+    def _open_flat_index(self, collection):
+        from pages.flat_index import FLAT_INDEX_DIR, FlatIndex, collection_version
+
+        try:
+            flat_index = FlatIndex.open(PERSIST_DIRECTORY / FLAT_INDEX_DIR, self.collection_name)
+        except ValueError as e:
+            # 내보내기가 중간에 끊기는 등 파일이 어긋나 있으면 Chroma로 검색
+            print(f"평면 인덱스를 열 수 없어 사용하지 않습니다: {e}")
+            return None
+        if flat_index is None:
+            return None
+        if flat_index.version != collection_version(collection):
+            # 내보낸 뒤 컬렉션이 바뀌었으면 Chroma로 검색
+            print(f"평면 인덱스가 컬렉션({self.collection_name})보다 오래되어 사용하지 않습니다.")
+            return None
+        if FLAT_INDEX == "auto" and len(flat_index) > FLAT_INDEX_MAX_CHUNKS:
+            return None
+        return flat_index
+
+    def warmup(self):
+        """필요하면 파이프라인을 만들고, 구성 단계별 소요 시간(초)을 반환"""
+        if self._chain is None:
+            with self._lock:
+                if self._chain is None:
+                    self._build()
+        return dict(self.timings)
+
+    @property
+    def vectorstore(self):
+        self.warmup()
+        return self._vectorstore
+
+    @property
+    def retriever(self):
+        self.warmup()
+        return self._retriever
+
+    @property
+    def chain(self):
+        self.warmup()
+        return self._chain
+
+    def collection_version(self):
+        """컬렉션 문서 수와 메타데이터의 content_version으로 만든 버전 문자열 (변경되면 답변 캐시 무효화)"""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked >= VERSION_CHECK_INTERVAL:
+            from pages.flat_index import collection_version
+
+            self._version = collection_version(self.vectorstore._client.get_collection(self.collection_name))
+            self._version_checked = now
+        return self._version
+
+    def should_retrieve(self, state: AgentState) -> dict:
+        query = state["query"]
+        docs = self.retriever.invoke(query)
+        # 벡터 검색으로 찾은 문서의 유사도 중 가장 높은 값을 검색 점수로 사용
+        score = max((doc.metadata.get("relevance_score", 0.0) for doc in docs), default=0.0)
+        # 재작성한 검색어의 점수가 이전 검색보다 낮으면 이전 컨텍스트를 그대로 사용
+        if state["context"] and score <= state["score"]:
+            return {"score": state["score"]}
+        if self.packer is None or not docs:
+            return {"context": "\n".join([doc.page_content for doc in docs]), "score": score}
+
+        # 중복이 적은 청크부터 토큰 예산 안에서 컨텍스트 구성
+        data = self.vectorstore._collection.get(ids=[doc.id for doc in docs], include=["embeddings"])
+        vectors = dict(zip(data["ids"], data["embeddings"]))
+        docs = [doc for doc in docs if doc.id in vectors]
+        context, used, _ = self.packer.pack(
+            self._embeddings.embed_query(query), docs, [vectors[doc.id] for doc in docs], query
+        )
+        return {"context": context, "context_tokens": used, "score": score}
+
+    def grade_documents(self, state: AgentState) -> dict:
+        score = state["score"]
+        if not state["context"] or score < SCORE_FLOOR:
+            return {"next": "no_answer"}
+        if score < REWRITE_BELOW and state["rewrites"] < MAX_REWRITES:
+            return {"next": "rewrite_query"}
+        return {"next": "generate_answer"}
+
+    def rewrite_query(self, state: AgentState) -> dict:
+        # 마지막으로 시도한 검색어를 다시 써서 라운드마다 다른 검색어로 검색
+        response = self._rewrite_chain.invoke({"query": state["query"]})
+        query = response.content.strip() or state["query"]
+        return {"query": query, "rewrites": state["rewrites"] + 1}
+
+    def no_answer(self, state: AgentState) -> dict:
+        # 관련 문서가 없으면 LLM을 호출하지 않고 정해진 답변 반환
+        return {"response": NO_ANSWER}
+
+    def generate_answer(self, state: AgentState) -> dict:
+        response = self._answer_chain.invoke({
+            "context": state["context"],
+            "query": state["question"]
+        })
+
+        return {"response": response.content}
+
+    def stream(self, question: str):
+        """답변을 생성되는 대로 조각(문자열) 단위로 반환하는 제너레이터
+
+        검색/평가 노드는 그대로 실행하고, generate_answer 노드의 LLM 토큰만 내보냅니다.
+        """
+        # 비슷한 질문의 답변이 캐시에 있으면 검색/생성 없이 바로 반환
+        # (질문 임베딩은 임베딩 캐시에 남으므로 검색 단계에서 다시 호출되지 않음)
+        vector = version = None
+        if self.answer_cache.enabled:
+            self.warmup()
+            vector = self._embeddings.embed_query(question)
+            version = self.collection_version()
+            answer = self.answer_cache.get(self.collection_name, version, vector, question)
+            if answer is not None:
+                yield answer
+                return
+
+        start = time.perf_counter()
+        streamed = False
+        result = {}
+        for mode, payload in self.chain.stream(initial_state(question), stream_mode=["messages", "values"]):
+            if mode == "values":
+                result = payload
+                continue
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") == "generate_answer" and chunk.content:
+                streamed = True
+                yield chunk.content
+
+        # LLM을 거치지 않은 답변은 한 번에 반환
+        response = result.get("response", "")
+        if not streamed and response:
+            yield response
+
+        # 답변하지 못한 경우는 저장하지 않음 (내용이 보강된 뒤에도 TTL 동안 같은 거절이 나가지 않도록)
+        if vector is not None and response and response != NO_ANSWER:
+            self.answer_cache.set(
+                self.collection_name, version, question, vector, response, time.perf_counter() - start
+            )
+
+    def ask(self, question: str):
+        return "".join(self.stream(question))
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(collection_name, system_prompt, k=3):
+    """컬렉션별로 프로세스 전체에서 공유하는 엔진 반환 (생성만 하고 로드는 첫 질문에서)"""
+    with _engines_lock:
+        engine = _engines.get(collection_name)
+        if engine is None:
+            engine = _engines[collection_name] = RagEngine(collection_name, system_prompt, k)
+        return engine
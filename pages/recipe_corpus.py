@@ -0,0 +1,160 @@
+# pages/recipe_corpus.py
+import csv
+import gzip
+import io
+import json
+import re
+import sys
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from pages.context_packer import get_encoder
+
+# 청크 하나의 최대 토큰 수 (웹 문서 분할과 같은 기준)
+RECIPE_CHUNK_TOKENS = 500
+
+# 레시피 덤프마다 다른 열 이름 (앞에 있을수록 우선, 만개의레시피 등 공개 데이터셋의 열 이름 포함)
+FIELD_ALIASES = {
+    "id": ["id", "recipe_id", "RCP_SNO", "RCP_SEQ", "레시피일련번호"],
+    "title": ["title", "name", "recipe_name", "RCP_TTL", "RCP_NM", "CKG_NM", "요리명", "레시피제목"],
+    "ingredients": ["ingredients", "ingredient", "CKG_MTRL_CN", "RCP_PARTS_DTLS", "재료"],
+    "steps": ["steps", "instructions", "directions", "method", "recipe", "조리순서", "조리방법"],
+}
+# 메타데이터로 남길 짧은 항목 (분류, 인분, 조리 시간 등)
+METADATA_MAX_LENGTH = 100
+
+_STEP_NUMBER = re.compile(r"^\s*(\d+)[.)]\s*")
+
+
+def open_text(path):
+    """.gz 압축 파일도 스트리밍으로 읽음"""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8-sig", newline="")
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+def read_recipes(path):
+    """CSV / JSONL 레시피 덤프를 한 줄씩 읽어 dict로 반환 (파일 전체를 메모리에 올리지 않음)"""
+    name = Path(path).name.lower().removesuffix(".gz")
+    with open_text(path) as f:
+        if name.endswith((".jsonl", ".ndjson", ".json")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif name.endswith(".csv"):
+            # 조리 순서가 긴 레시피가 있어 필드 크기 제한을 늘림
+            csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+            yield from csv.DictReader(f)
+        else:
+            raise ValueError(f"지원하지 않는 레시피 파일 형식입니다: {path} (CSV 또는 JSONL)")
+
+
+def _pick(row, field):
+    for alias in FIELD_ALIASES[field]:
+        value = row.get(alias)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _as_list(value):
+    """리스트, JSON 리스트 문자열, 줄바꿈/| 구분 문자열을 항목 리스트로 변환"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith("["):
+            try:
+                value = json.loads(text)
+            except json.JSONDecodeError:
+                value = [text]
+        else:
+            value = re.split(r"\n+|\s*\|\s*", text)
+    items = []
+    for item in value:
+        if isinstance(item, dict):
+            # {"name": "김치", "amount": "300g"} 같은 구조
+            item = " ".join(str(v) for v in item.values() if v)
+        item = str(item).strip()
+        if item:
+            items.append(item)
+    return items
+
+
+def normalize_recipe(row, number):
+    """열 이름이 제각각인 레코드를 {"id", "title", "ingredients", "steps", "metadata"}로 정리 (제목이 없으면 None)"""
+    title = _pick(row, "title")
+    if not title:
+        return None
+    used = {alias for aliases in FIELD_ALIASES.values() for alias in aliases}
+    metadata = {
+        key: value for key, value in row.items()
+        if key not in used and isinstance(value, (str, int, float, bool)) and value != ""
+        and len(str(value)) <= METADATA_MAX_LENGTH
+    }
+    return {
+        "id": str(_pick(row, "id") or number),
+        "title": str(title).strip(),
+        "ingredients": _as_list(_pick(row, "ingredients")),
+        "steps": [_STEP_NUMBER.sub("", step) for step in _as_list(_pick(row, "steps"))],
+        "metadata": metadata,
+    }
+
+
+def _split_long(text, max_tokens, encoder):
+    """한 항목이 예산을 넘으면 토큰 단위로 자름"""
+    tokens = encoder.encode(text)
+    return [encoder.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
+
+
+def chunk_recipe(recipe, max_tokens=RECIPE_CHUNK_TOKENS):
+    """레시피 구조를 살려 청크로 나눔
+
+    - 전체가 예산 안이면 제목 + 재료 + 조리 순서를 한 청크로
+    - 길면 재료는 한 청크에 모으고, 조리 순서는 단계가 중간에 잘리지 않게 묶어서 나눔
+    - 모든 청크는 요리 이름으로 시작해 어느 레시피의 내용인지 검색/답변에서 알 수 있음
+    """
+    encoder = get_encoder()
+    title = recipe["title"]
+    extras = [f"{key}: {value}" for key, value in recipe["metadata"].items()]
+    ingredients = f"재료: {', '.join(recipe['ingredients'])}" if recipe["ingredients"] else ""
+    steps = [f"{number}. {step}" for number, step in enumerate(recipe["steps"], 1)]
+    metadata = {
+        **recipe["metadata"], "source": f"recipe:{recipe['id']}", "recipe_id": recipe["id"], "title": title,
+    }
+
+    whole = "\n".join([f"요리: {title}", *extras, ingredients, "조리 순서:" if steps else "", *steps]).strip()
+    whole = re.sub(r"\n{2,}", "\n", whole)
+    if len(encoder.encode(whole)) <= max_tokens:
+        return [Document(page_content=whole, metadata={**metadata, "part": "full"})]
+
+    chunks = []
+    header = "\n".join([f"요리: {title}", *extras])
+    if ingredients:
+        budget = max_tokens - len(encoder.encode(header)) - 1
+        for piece in _split_long(ingredients, max(budget, 1), encoder):
+            chunks.append(Document(page_content=f"{header}\n{piece}", metadata={**metadata, "part": "ingredients"}))
+
+    step_header_tokens = len(encoder.encode(f"요리: {title} (조리 순서 000-000)")) + 1
+    budget = max(max_tokens - step_header_tokens, 1)
+
+    def flush(group, first, last):
+        numbers = f"{first}" if first == last else f"{first}-{last}"
+        content = f"요리: {title} (조리 순서 {numbers})\n" + "\n".join(group)
+        chunks.append(Document(page_content=content, metadata={**metadata, "part": "steps"}))
+
+    group, first, last, used = [], 1, 1, 0
+    for number, step in enumerate(steps, 1):
+        for piece in _split_long(step, budget, encoder):
+            count = len(encoder.encode(piece)) + 1
+            if group and used + count > budget:
+                flush(group, first, last)
+                group, first, used = [], number, 0
+            group.append(piece)
+            last = number
+            used += count
+    if group:
+        flush(group, first, last)
+    return chunks
@@ -0,0 +1,133 @@
+# pages/scan_history.py
+import shutil
+import tempfile
+import weakref
+from collections import deque
+from pathlib import Path
+
+from PIL import Image
+
+from pages.detection import Detection
+
+# 세션별 제한값
+MAX_ENTRIES = 20
+MAX_MEMORY_BYTES = 2 * 1024 * 1024
+THUMBNAIL_SIZE = 256
+
+
+class HistoryEntry:
+    """분석 기록 하나 (썸네일만 메모리에 두고 원본 이미지는 디스크에서 필요할 때 로드)
+
+    기존 dict 기록과 같은 키("datetime", "image", "detected_foods", "summary")로 읽을 수 있습니다.
+    """
+
+    __slots__ = ("datetime", "image_path", "thumbnail", "detections", "summary")
+
+    KEYS = ("datetime", "image", "thumbnail", "detected_foods", "summary")
+
+    def __init__(self, datetime, image_path, thumbnail, detections, summary):
+        self.datetime = datetime
+        self.image_path = image_path
+        self.thumbnail = thumbnail
+        self.detections = detections
+        self.summary = summary
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __getitem__(self, key):
+        if key == "image":
+            return self.load_image()
+        if key == "thumbnail":
+            return self.thumbnail if self.thumbnail is not None else self._make_thumbnail()
+        if key == "detected_foods":
+            return [detection.to_dict() for detection in self.detections]
+        if key in ("datetime", "summary"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def load_image(self):
+        with Image.open(self.image_path) as image:
+            image.load()
+            return image
+
+    def _make_thumbnail(self):
+        image = self.load_image()
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        return image
+
+    def memory_bytes(self):
+        if self.thumbnail is None:
+            return 0
+        width, height = self.thumbnail.size
+        return width * height * len(self.thumbnail.getbands())
+
+
+class ScanHistory:
+    """세션별 분석 기록 (최대 개수/메모리 제한, 원본 이미지는 임시 폴더에 저장)
+
+    list처럼 len(), history[-1], 반복을 지원하므로 기존 session_state.history 사용 코드가 그대로 동작합니다.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_memory_bytes=MAX_MEMORY_BYTES):
+        self.max_entries = max_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.directory = Path(tempfile.mkdtemp(prefix="foodscan-history-"))
+        self._entries = deque()
+        self._counter = 0
+        # 세션이 끝나 객체가 사라지면 임시 폴더 삭제
+        self._finalizer = weakref.finalize(self, shutil.rmtree, str(self.directory), True)
+
+    def append(self, record):
+        self._counter += 1
+        image = record["image"]
+        image_path = self.directory / f"{self._counter:06d}.png"
+        image.save(image_path, format="PNG")
+
+        thumbnail = image.copy()
+        thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+
+        detections = []
+        for item in record.get("detected_foods", []):
+            detection = Detection.from_dict(item)
+            if detection is not None:
+                detections.append(detection)
+
+        self._entries.append(HistoryEntry(
+            record["datetime"], image_path, thumbnail, tuple(detections), record.get("summary", {})
+        ))
+        self._evict()
+
+    def _evict(self):
+        # 개수 제한을 넘으면 가장 오래된 기록과 파일 삭제
+        while len(self._entries) > self.max_entries:
+            entry = self._entries.popleft()
+            entry.image_path.unlink(missing_ok=True)
+
+        # 메모리 제한을 넘으면 오래된 기록부터 썸네일 해제 (필요 시 디스크에서 다시 생성)
+        total = sum(entry.memory_bytes() for entry in self._entries)
+        for entry in list(self._entries)[:-1]:
+            if total <= self.max_memory_bytes:
+                break
+            total -= entry.memory_bytes()
+            entry.thumbnail = None
+
+    def memory_bytes(self):
+        return sum(entry.memory_bytes() for entry in self._entries)
+
+    def clear(self):
+        for entry in self._entries:
+            entry.image_path.unlink(missing_ok=True)
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+    def __iter__(self):
+        return iter(self._entries)
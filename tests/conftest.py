@@ -0,0 +1,10 @@
+# tests/conftest.py
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가 (pages 패키지 import)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# 페이지 모듈이 import 시점에 읽는 키 (테스트는 API를 호출하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "test")
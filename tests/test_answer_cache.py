@@ -0,0 +1,32 @@
+# tests/test_answer_cache.py
+import numpy as np
+
+from pages.answer_cache import AnswerCache
+
+
+def make_cache(tmp_path, **kwargs):
+    return AnswerCache(path=tmp_path / "answers.sqlite3", enabled=True, **kwargs)
+
+
+def test_templated_question_with_other_entity_misses(tmp_path):
+    cache = make_cache(tmp_path)
+    vector = np.ones(8)
+    cache.set("baseball", "1:a", "류현진 선수의 타율", vector, "류현진의 타율은 ...", 1.0)
+    # 임베딩이 거의 같아도 선수 이름이 다르면 재사용하지 않음
+    assert cache.get("baseball", "1:a", vector * 1.001, "김광현 선수의 타율") is None
+    assert cache.get("baseball", "1:a", vector, "류현진 선수 타율") == "류현진의 타율은 ..."
+
+
+def test_below_threshold_misses(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("baseball", "1:a", "질문", np.array([1.0, 0.0]), "답변", 1.0)
+    # 코사인 유사도 0.95는 기본 기준(0.97) 미만
+    assert cache.get("baseball", "1:a", np.array([0.95, np.sqrt(1 - 0.95 ** 2)]), "질문") is None
+
+
+def test_get_does_not_write(tmp_path):
+    cache = make_cache(tmp_path, ttl=0)
+    cache.set("baseball", "1:a", "질문", np.ones(4), "답변", 1.0)
+    changes = cache._connect().total_changes
+    assert cache.get("baseball", "1:a", np.ones(4), "질문") is None  # 만료
+    assert cache._connect().total_changes == changes
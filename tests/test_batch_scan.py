@@ -0,0 +1,93 @@
+# tests/test_batch_scan.py
+import io
+import json
+
+import pyarrow.parquet as pq
+import pytest
+from PIL import Image
+
+import batch_scan
+from pages.FoodScan import FoodAnalyzer, LogUI
+from pages.scan_cache import ScanCache
+
+
+class FailingClient:
+    """모든 요청이 네트워크 오류로 실패하는 OpenAI 클라이언트"""
+
+    class chat:
+        class completions:
+            @staticmethod
+            def create(**kwargs):
+                raise ConnectionError("connection reset")
+
+
+def make_analyzer(raise_errors):
+    analyzer = FoodAnalyzer(cache=ScanCache(enabled=False), ui=LogUI(), raise_errors=raise_errors)
+    analyzer._client = FailingClient()
+    return analyzer
+
+
+def test_parquet_writer_accepts_mixed_rows(tmp_path):
+    writer = batch_scan.ParquetWriter(tmp_path / "results.parquet", batch_size=2)
+    rows = [dict.fromkeys(batch_scan.ROW_FIELDS) for _ in range(4)]
+    rows[0].update(image="a.jpg", status="ok", detected_foods=[{"food": "김밥"}], latency=1.0)
+    rows[1].update(image="b.jpg", status="error", error="ConnectionError: reset", latency=0.5)
+    rows[2].update(image="c.jpg", status="ok", annotated="out/c.jpg", latency=1.2)
+    rows[3].update(image="d.jpg", status="empty", detected_foods=[], latency=0.8)
+    written = []
+    for row in rows:
+        written += writer.write(row)
+    written += writer.close()
+
+    table = pq.read_table(writer.path)
+    assert table.column_names == batch_scan.ROW_FIELDS
+    assert table.column("status").to_pylist() == ["ok", "error", "ok", "empty"]
+    assert json.loads(table.column("detected_foods")[0].as_py()) == [{"food": "김밥"}]
+    assert [row["image"] for row in written] == ["a.jpg", "b.jpg", "c.jpg", "d.jpg"]
+
+
+def write_rows(path, images, append=True):
+    writer = batch_scan.ParquetWriter(path, append=append)
+    for image in images:
+        writer.write(dict(dict.fromkeys(batch_scan.ROW_FIELDS), image=image, status="ok"))
+    writer.close()
+    return writer.path
+
+
+def test_parquet_writer_resumes_into_parts_and_restart_clears_them(tmp_path):
+    path = tmp_path / "results.parquet"
+    write_rows(path, ["a.jpg"])
+    assert write_rows(path, ["b.jpg"]).name == "results.part1.parquet"
+
+    assert write_rows(path, ["c.jpg"], append=False) == path
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["results.parquet"]
+    assert pq.read_table(path).column("image").to_pylist() == ["c.jpg"]
+
+
+def test_analyze_image_raises_in_batch_mode(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    image = Image.new("RGB", (32, 32))
+    assert make_analyzer(raise_errors=False).analyze_image(image) == []
+    with pytest.raises(ConnectionError):
+        make_analyzer(raise_errors=True).analyze_image(image)
+
+
+def test_failed_images_are_not_checkpointed(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    path = tmp_path / "food.jpg"
+    Image.new("RGB", (32, 32)).save(path)
+    row = batch_scan.scan_image(make_analyzer(raise_errors=True), batch_scan.RateLimiter(0), path, "off")
+    assert row["status"] == "error"
+    assert set(row) == set(batch_scan.ROW_FIELDS)
+
+    checkpoint = io.StringIO()
+    ok = dict(row, image="other.jpg", status="ok", error=None)
+    batch_scan.mark_done(checkpoint, [row, ok])
+    assert checkpoint.getvalue() == "other.jpg\n"
+
+
+def test_annotated_paths_keep_subdirectories(tmp_path):
+    first = batch_scan.annotated_path_for(tmp_path / "lunch" / "plate.jpg", tmp_path, "out")
+    second = batch_scan.annotated_path_for(tmp_path / "dinner" / "plate.jpg", tmp_path, "out")
+    assert first != second
+    assert first.as_posix() == "out/lunch/plate_annotated.jpg"
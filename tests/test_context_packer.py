@@ -0,0 +1,18 @@
+# tests/test_context_packer.py
+import numpy as np
+from langchain_core.documents import Document
+
+from pages.context_packer import ContextPacker
+
+
+def test_saved_tokens_never_negative_when_budget_allows_extra_chunks():
+    docs = [Document(page_content=f"문서 {i} " + "야구 " * 20) for i in range(6)]
+    vectors = np.eye(6)
+    packer = ContextPacker(budget=10000, baseline_k=3)
+    _, used, saved = packer.pack(np.ones(6), docs, vectors, "야구")
+    stats = packer.stats()
+    # 예산이 넉넉하면 기존 상위 3개보다 많이 넣으므로 절약은 0, 늘어난 토큰은 따로 집계
+    assert saved == 0
+    assert stats["tokens_saved"] == 0
+    assert stats["tokens_added"] > 0
+    assert used > stats["tokens_added"]
@@ -0,0 +1,87 @@
+# tests/test_detection.py
+import json
+
+from pages.detection import (
+    DETECTION_SCHEMA, Detection, compile_validator, iter_item_blocks, parse_block, parse_json_detections,
+    parse_text_detections,
+)
+
+SIZE = (800, 600)
+
+CANONICAL = """분석 결과입니다.
+
+[음식 1]
+음식 이름: 김치찌개
+위치: [10,20,200,180]
+칼로리: 450kcal
+영양성분:
+- 단백질: 25g
+- 탄수화물: 20g
+- 지방: 30g
+"""
+
+VARIANTS = """[음식 1]
+음식 이름： 공기밥
+위치: x1=300, y1=200, x2=100, y2=50
+칼로리: 약 1,200kcal
+영양성분:
+- 단백질: 6g
+- 탄수화물: 65.5g
+- 지방: 1g
+[음식 2]
+음식명: 계란말이
+좌표: [0.1, 0.5, 0.25, 0.75]
+칼로리: 150kcal
+[음식 3]
+음식 이름: 위치 없는 음식
+칼로리: 100kcal
+"""
+
+
+def test_canonical_block():
+    assert parse_text_detections(CANONICAL, SIZE) == [Detection("김치찌개", (10, 20, 200, 180), 450.0, 25.0, 20.0, 30.0)]
+
+
+def test_recovers_format_variants():
+    rice, omelet = parse_text_detections(VARIANTS, SIZE)
+    # 좌표 라벨 제거, 뒤바뀐 좌표 정리, 천 단위 쉼표와 "약" 처리
+    assert rice == Detection("공기밥", (100, 50, 300, 200), 1200.0, 6.0, 65.5, 1.0)
+    # 0~1 정규화 좌표는 이미지 크기로 환산, 없는 영양 정보는 None
+    assert omelet.bbox == (80, 300, 200, 450)
+    assert (omelet.calories, omelet.protein) == (150.0, None)
+    assert omelet.to_dict() == {"food": "계란말이", "bbox": [80, 300, 200, 450], "calories": 150}
+
+
+def test_block_without_bbox_is_dropped():
+    assert parse_block(" 1]\n음식 이름: 김밥\n칼로리: 300kcal\n") is None
+
+
+def test_stream_blocks_match_full_parse():
+    text = CANONICAL + VARIANTS
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    streamed = [parse_block(block, SIZE) for block in iter_item_blocks(chunks)]
+    assert [item for item in streamed if item is not None] == parse_text_detections(text, SIZE)
+
+
+def test_json_recovers_schema_violations_and_reports_the_rest():
+    payload = {"items": [
+        {"food": "불고기", "bbox": [10, 10, 50, 60], "calories": "350kcal", "protein": 20, "carbs": 10, "fat": 15},
+        {"food": "", "bbox": [1, 2, 3, 4], "calories": 1, "protein": 1, "carbs": 1, "fat": 1},
+    ]}
+    detections, errors = parse_json_detections(json.dumps(payload, ensure_ascii=False), SIZE)
+    assert detections == [Detection("불고기", (10, 10, 50, 60), 350.0, 20.0, 10.0, 15.0)]
+    assert errors == ["$.items[1]: 복구할 수 없는 항목"]
+
+
+def test_json_parse_failure():
+    detections, errors = parse_json_detections("{not json", SIZE)
+    assert detections == [] and errors[0].startswith("$: JSON 파싱 실패")
+
+
+def test_validator_reports_paths():
+    validate = compile_validator(DETECTION_SCHEMA)
+    errors = validate({"items": [{"food": 1, "bbox": [1, 2], "extra": True}]})
+    assert "$.items[0].food: string이(가) 아닙니다" in errors
+    assert "$.items[0].bbox: 항목 수 2개가 허용 범위를 벗어났습니다" in errors
+    assert "$.items[0].extra: 허용되지 않은 항목" in errors
+    assert "$.items[0].calories: 필수 항목 누락" in errors
@@ -0,0 +1,38 @@
+# tests/test_embedding_cache.py
+from pages.embedding_backend import LocalEmbeddings, StubEmbeddings
+from pages.embedding_cache import CachedEmbeddings
+
+
+def test_wrapping_local_embeddings_does_not_load_model(tmp_path):
+    local = LocalEmbeddings(model_name="sentence-transformers/test-model")
+    cached = CachedEmbeddings(local, path=tmp_path / "embeddings.sqlite3")
+    assert cached.model == "sentence-transformers/test-model"
+    assert local._model is None
+
+
+def test_model_name_from_stub(tmp_path):
+    cached = CachedEmbeddings(StubEmbeddings(), path=tmp_path / "embeddings.sqlite3")
+    assert cached.model == "stub-hash-256"
+
+
+class PreciseEmbeddings:
+    """float32로 표현되지 않는 float64 값을 돌려주는 임베딩"""
+
+    model = "precise"
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [0.1, 1 / 3, 2 / 3]
+
+
+def test_miss_and_hit_return_the_same_vector(tmp_path):
+    backend = PreciseEmbeddings()
+    cached = CachedEmbeddings(backend, path=tmp_path / "embeddings.sqlite3")
+    miss = cached.embed_query("질문")
+    hit = cached.embed_query("질문 ")
+    assert backend.calls == 1 and cached.stats()["hits"] == 1
+    assert miss == hit
+    assert miss != [0.1, 1 / 3, 2 / 3]
@@ -0,0 +1,40 @@
+# tests/test_evaluate_retrieval.py
+import json
+
+import pytest
+from langchain_core.documents import Document
+
+from evaluate_retrieval import load_dataset, percentile, score_query
+
+
+def write_jsonl(path, items):
+    path.write_text("\n".join(json.dumps(item, ensure_ascii=False) for item in items) + "\n\n", encoding="utf-8")
+    return path
+
+
+def test_load_dataset_combines_id_and_text_labels(tmp_path):
+    path = write_jsonl(tmp_path / "set.jsonl", [{"query": "보크란?", "relevant_ids": ["c1"], "relevant_texts": ["보크"]}])
+    assert load_dataset(path) == [{"query": "보크란?", "labels": [("id", "c1"), ("text", "보크")]}]
+
+
+def test_load_dataset_rejects_unlabelled_queries(tmp_path):
+    path = write_jsonl(tmp_path / "set.jsonl", [{"query": "보크란?"}])
+    with pytest.raises(ValueError, match="set.jsonl:1"):
+        load_dataset(path)
+
+
+def test_score_query_recall_and_first_rank():
+    docs = [
+        Document(page_content="타율 계산법", id="c1"),
+        Document(page_content="보크 규정 설명", id="c2"),
+        Document(page_content="도루 기록", id="c3"),
+    ]
+    recall, rank = score_query(docs, [("text", "보크"), ("id", "c3")], ks=[1, 2, 3])
+    assert recall == {1: 0.0, 2: 0.5, 3: 1.0}
+    assert rank == 2
+    assert score_query(docs, [("id", "없음")], ks=[3]) == ({3: 0.0}, None)
+
+
+def test_percentile_uses_nearest_rank():
+    values = [5, 1, 4, 2, 3]
+    assert (percentile(values, 0.5), percentile(values, 0.95), percentile(values, 0)) == (3, 5, 1)
@@ -0,0 +1,76 @@
+# tests/test_flat_index.py
+import numpy as np
+import pytest
+
+from pages.flat_index import FlatIndex, collection_version, export_collection
+
+
+class FakeCollection:
+    """name/metadata/count()/get()만 흉내 내는 Chroma 컬렉션"""
+
+    def __init__(self, name, vectors, metadata=None):
+        self.name = name
+        self.metadata = metadata
+        self.vectors = vectors
+
+    def count(self):
+        return len(self.vectors)
+
+    def get(self, include, limit, offset):
+        rows = range(offset, min(offset + limit, len(self.vectors)))
+        return {
+            "ids": [f"id-{i}" for i in rows],
+            "embeddings": [self.vectors[i] for i in rows],
+            "documents": [f"문서 {i}" for i in rows],
+            "metadatas": [{"row": i} for i in rows],
+        }
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(50, 8)).astype(np.float32)
+
+
+def test_export_and_search_match_brute_force(tmp_path, vectors, monkeypatch):
+    # 블록 경계를 넘는 검색도 확인
+    monkeypatch.setattr("pages.flat_index.EXPORT_BATCH_SIZE", 16)
+    monkeypatch.setattr("pages.flat_index.SEARCH_BLOCK_ROWS", 7)
+    collection = FakeCollection("recipes", vectors, {"content_version": "abc"})
+    info = export_collection(collection, tmp_path)
+    assert info == {"count": 50, "dimensions": 8, "version": "50:abc"}
+
+    index = FlatIndex.open(tmp_path, "recipes")
+    assert len(index) == 50 and index.version == collection_version(collection)
+    query = vectors[3] + 0.01
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+    assert [position for position, _ in index.search(query, k=5)] == list(expected)
+
+    doc, distance = index.similarity_search_with_score(vectors[3], k=1)[0]
+    assert (doc.id, doc.page_content, doc.metadata) == ("id-3", "문서 3", {"row": 3})
+    assert distance == pytest.approx(0.0, abs=1e-5)  # l2 제곱 거리
+
+
+def test_open_missing_export_returns_none(tmp_path):
+    assert FlatIndex.open(tmp_path, "recipes") is None
+
+
+def test_row_count_mismatch_is_rejected(tmp_path, vectors):
+    export_collection(FakeCollection("recipes", vectors), tmp_path)
+    # 내보내기가 중간에 끊겨 벡터 파일과 메타데이터가 어긋난 경우
+    np.save(tmp_path / "recipes.npy", vectors[:10])
+    with pytest.raises(ValueError):
+        FlatIndex(tmp_path, "recipes")
+
+
+def test_engine_falls_back_to_chroma_on_stale_export(tmp_path, vectors, monkeypatch):
+    import pages.rag_engine as rag_engine
+    from pages.flat_index import FLAT_INDEX_DIR
+
+    monkeypatch.setattr(rag_engine, "PERSIST_DIRECTORY", tmp_path)
+    collection = FakeCollection("recipes", vectors)
+    export_collection(collection, tmp_path / FLAT_INDEX_DIR)
+    np.save(tmp_path / FLAT_INDEX_DIR / "recipes.npy", vectors[:10])
+    engine = rag_engine.RagEngine("recipes", "system", answer_cache=object())
+    engine.collection_name = "recipes"
+    assert engine._open_flat_index(collection) is None
@@ -0,0 +1,52 @@
+# tests/test_foodscan.py
+from PIL import Image
+
+import pages.FoodScan as FoodScan
+from pages.scan_cache import ScanCache
+
+
+class StubAnalyzer:
+    """API를 호출하지 않고 고정된 감지/영양 정보를 돌려주는 분석기"""
+
+    detection_mode = "json"
+
+    def __init__(self):
+        self.cache = ScanCache(enabled=False)
+
+    def analyze_image(self, image, prepared=None):
+        return [{"food": "김치찌개", "bbox": [10, 10, 50, 50]}]
+
+    def get_nutrition_info(self, foods):
+        return {"김치찌개": {"calories": "200kcal", "protein": "10g", "carbs": "8g", "fat": "12g"}}
+
+    def draw_boxes(self, image, detected_items, verbose=True):
+        return image
+
+
+class SessionState(dict):
+    __getattr__ = dict.get
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def test_show_displays_results(monkeypatch):
+    image = Image.new("RGB", (64, 64))
+    tables, errors = [], []
+    st = FoodScan.st
+    monkeypatch.setattr(st, "session_state", SessionState())
+    monkeypatch.setattr(st, "file_uploader", lambda *args, **kwargs: object())
+    monkeypatch.setattr(st, "toggle", lambda *args, **kwargs: True)
+    monkeypatch.setattr(st, "table", tables.append)
+    monkeypatch.setattr(st, "error", errors.append)
+    monkeypatch.setattr(FoodScan, "ingest_image", lambda uploaded: ("jpeg-base64", image))
+    monkeypatch.setattr(FoodScan, "FoodAnalyzer", StubAnalyzer)
+
+    FoodScan.show()
+
+    assert errors == []
+    assert len(tables) == 1
+    assert tables[0].to_dict("records") == [
+        {"음식": "김치찌개", "칼로리": "200kcal", "단백질": "10g", "탄수화물": "8g", "지방": "12g"}
+    ]
+    assert len(st.session_state["history"]) == 1
@@ -0,0 +1,51 @@
+# tests/test_image_ingest.py
+import base64
+import io
+
+from PIL import Image
+
+from pages.image_ingest import downscale, encode_jpeg, ingest_image, load_image
+
+
+def make_file(size, format="JPEG", mode="RGB", exif=None):
+    buffer = io.BytesIO()
+    image = Image.new(mode, size, "red")
+    if exif is not None:
+        image.save(buffer, format=format, exif=exif)
+    else:
+        image.save(buffer, format=format)
+    buffer.seek(0)
+    return buffer
+
+
+def test_downscale_keeps_aspect_ratio():
+    assert downscale(Image.new("RGB", (1600, 400)), 800).size == (800, 200)
+    small = Image.new("RGB", (300, 200))
+    assert downscale(small, 800) is small
+
+
+def test_load_jpeg_fits_max_size():
+    image = load_image(make_file((3200, 2400)), max_size=800)
+    assert image.size == (800, 600)
+    assert image.mode == "RGB"
+
+
+def test_load_applies_exif_orientation():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # 시계 방향 90도 회전
+    image = load_image(make_file((400, 200), exif=exif.tobytes()))
+    assert image.size == (200, 400)
+
+
+def test_ingest_returns_jpeg_of_the_downscaled_image():
+    encoded, image = ingest_image(make_file((1000, 1000), format="PNG", mode="RGBA"), max_size=500)
+    decoded = Image.open(io.BytesIO(base64.b64decode(encoded)))
+    assert decoded.format == "JPEG"
+    assert decoded.size == image.size == (500, 500)
+
+
+def test_encode_reuses_buffer_without_leaking_previous_data():
+    first = encode_jpeg(Image.new("RGB", (400, 400), "blue"))
+    second = encode_jpeg(Image.new("RGB", (8, 8), "blue"))
+    assert len(base64.b64decode(second)) < len(base64.b64decode(first))
+    assert Image.open(io.BytesIO(base64.b64decode(second))).size == (8, 8)
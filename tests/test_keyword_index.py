@@ -0,0 +1,72 @@
+# tests/test_keyword_index.py
+import pytest
+
+from pages.keyword_index import KeywordIndex, reciprocal_rank_fusion, tokenize
+
+
+class FakeCollection:
+    """count()/get()만 흉내 내는 Chroma 컬렉션"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.gets = 0
+
+    def count(self):
+        return len(self.documents)
+
+    def get(self, include):
+        self.gets += 1
+        return {"ids": list(self.documents), "documents": list(self.documents.values())}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return KeywordIndex(tmp_path / "keyword-index.sqlite3")
+
+
+def test_tokenize_shares_bigrams_across_spacing_and_particles():
+    assert tokenize("스트라이크존") == ["스트", "트라", "라이", "이크", "크존"]
+    assert set(tokenize("스트라이크 존")) <= set(tokenize("스트라이크존")) | {"존"}
+    assert set(tokenize("김치찌개")) <= set(tokenize("김치찌개를"))
+    assert tokenize("KBO 2024 시즌") == ["kbo", "2024", "시즌"]
+
+
+def test_bm25_prefers_rare_terms_and_shorter_documents(index):
+    index.add("baseball", ["rule", "long", "other"], [
+        "보크 규정",
+        "보크 규정에 대한 아주 길고 자세한 설명과 여러 가지 예외 상황 정리",
+        "타율 규정",
+    ])
+    ranked = [id_ for id_, _ in index.search("baseball", "보크")]
+    assert ranked == ["rule", "long"]
+    # 모든 문서에 있는 "규정"보다 드문 "타율"이 점수를 결정
+    assert index.search("baseball", "타율 규정")[0][0] == "other"
+    assert index.search("baseball", "없는단어") == []
+    assert index.search("recipes", "보크") == []
+
+
+def test_add_replaces_and_delete_removes(index):
+    index.add("baseball", ["a"], ["보크 규정"])
+    index.add("baseball", ["a"], ["타율 계산"])
+    assert index.count("baseball") == 1
+    assert index.search("baseball", "보크") == []
+    index.delete("baseball", ["a"])
+    assert index.count("baseball") == 0
+
+
+def test_sync_rebuilds_only_when_counts_differ(index):
+    collection = FakeCollection({"a": "보크 규정", "b": "타율 계산"})
+    assert index.sync("baseball", collection) is True
+    assert index.count("baseball") == 2
+    assert index.sync("baseball", collection) is False
+    assert collection.gets == 1
+
+    # 컬렉션에 문서가 추가되면 다시 색인
+    collection.documents["c"] = "도루 기록"
+    assert index.sync("baseball", collection) is True
+    assert index.search("baseball", "도루")[0][0] == "c"
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]])
+    assert [id_ for id_, _ in fused] == ["b", "a", "d", "c"]
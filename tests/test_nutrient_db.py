@@ -0,0 +1,58 @@
+# tests/test_nutrient_db.py
+import pytest
+
+from pages.nutrient_db import NutrientDB, normalize_name
+
+CSV_HEADER = "식품명,에너지(kcal),단백질(g),탄수화물(g),지방(g),영양성분함량기준량,1회제공량\n"
+CSV_ROWS = [
+    "김치찌개,50,3,2.5,3,100g,400g",
+    "된장찌개,40,3,4,1.5,100g,400g",
+    "비빔밥(돌솥),150,5,25,3,100g,200g",
+    "김치,20,1,4,0.5,100g,100g",
+    "콩나물국,15,1.5,1.5,0.5,100g,300g",
+    "순두부찌개,45,4,2,2.5,100g,400g",
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    csv_path = tmp_path / "foods.csv"
+    csv_path.write_text(CSV_HEADER + "\n".join(CSV_ROWS) + "\n", encoding="utf-8")
+    db = NutrientDB(tmp_path / "nutrients.sqlite3")
+    assert db.load_csv(csv_path) == len(CSV_ROWS)
+    return db
+
+
+def test_normalize_name_drops_brackets_and_spaces():
+    assert normalize_name("비빔밥 (돌솥)") == "비빔밥"
+    assert normalize_name(" 김치 찌개! ") == "김치찌개"
+
+
+def test_exact_lookup_scales_to_serving(db):
+    # 100g 기준 값을 1회 제공량(400g)으로 환산
+    assert db.lookup("김치 찌개") == ("김치찌개", {"calories": "200kcal", "protein": "12g", "carbs": "10g", "fat": "12g"})
+    assert db.lookup("비빔밥") == ("비빔밥(돌솥)", {"calories": "300kcal", "protein": "10g", "carbs": "50g", "fat": "6g"})
+
+
+def test_spelling_variant_matches(db):
+    name, info = db.lookup("된장찌게")
+    assert (name, info["calories"]) == ("된장찌개", "160kcal")
+
+
+@pytest.mark.parametrize("query", ["김치전", "김", "콩나물무침", "순두부", "참치김치찌개"])
+def test_different_food_with_similar_name_is_not_matched(db, query):
+    # 이름이 겹치는 다른 음식은 DB 값 대신 LLM 조회로 넘김
+    assert db.lookup(query) is None
+
+
+def test_unknown_food_returns_none(db):
+    assert db.lookup("스테이크") is None
+    assert db.lookup("!!!") is None
+
+
+def test_load_cp949_csv(tmp_path):
+    csv_path = tmp_path / "foods.csv"
+    csv_path.write_bytes((CSV_HEADER + CSV_ROWS[0] + "\n").encode("cp949"))
+    db = NutrientDB(tmp_path / "nutrients.sqlite3")
+    assert db.load_csv(csv_path) == 1
+    assert db.lookup("김치찌개")[0] == "김치찌개"
@@ -0,0 +1,101 @@
+# tests/test_nutrition_info.py
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import pages.FoodScan as FoodScan
+from pages.nutrient_db import NutrientDB
+from pages.scan_cache import ScanCache
+
+
+class FakeOpenAI:
+    """음식별 응답을 돌려주고 요청을 기록하는 OpenAI 클라이언트"""
+
+    def __init__(self, *args, **kwargs):
+        self.requests = []
+        self.batch_reply = {}
+        self.fail = set()
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, response_format=None, **kwargs):
+        prompt = messages[-1]["content"]
+        with self._lock:
+            self.requests.append(prompt)
+        if response_format is not None:
+            content = json.dumps(self.batch_reply, ensure_ascii=False)
+        else:
+            name = prompt.split("'")[1]
+            if name in self.fail:
+                raise ConnectionError(f"{name} 요청 실패")
+            content = "칼로리: 100kcal\n단백질: 5g\n탄수화물: 10g\n지방: 3g"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    # 페이지가 어느 시점에 클라이언트를 만들든 가짜 클라이언트를 쓰도록 교체
+    client = FakeOpenAI()
+    monkeypatch.setattr("openai.OpenAI", lambda *args, **kwargs: client)
+    monkeypatch.setattr(FoodScan, "OpenAI", lambda *args, **kwargs: client, raising=False)
+    monkeypatch.setattr(FoodScan.st, "error", lambda message: None)
+    monkeypatch.setattr(FoodScan.st, "warning", lambda message: None)
+    analyzer = FoodScan.FoodAnalyzer(cache=ScanCache(enabled=False))
+    analyzer.fake = client
+    return analyzer
+
+
+FOODS = [{"food": "food-a"}, {"food": "food-b"}, {"food": "food-a"}]
+
+
+def test_batch_mode_uses_one_request(analyzer):
+    analyzer.fake.batch_reply = {
+        "food-b": {"calories": 300, "protein": 12, "carbs": 40, "fat": 9},
+        "food-a": {"calories": 150, "protein": None, "carbs": 20, "fat": 4},
+    }
+    result = analyzer.get_nutrition_info(FOODS, mode="batch")
+    assert len(analyzer.fake.requests) == 1
+    # 입력 순서 유지, 중복 제거, 단위 추가
+    assert list(result) == ["food-a", "food-b"]
+    assert result["food-a"] == {"calories": "150kcal", "protein": "N/A", "carbs": "20g", "fat": "4g"}
+
+
+def test_batch_mode_retries_missing_items_individually(analyzer):
+    analyzer.fake.batch_reply = {"food-a": {"calories": 150, "protein": 5, "carbs": 20, "fat": 4}}
+    result = analyzer.get_nutrition_info(FOODS, mode="batch")
+    assert len(analyzer.fake.requests) == 2
+    assert result["food-b"]["calories"] == "100kcal"
+
+
+def test_concurrent_mode_marks_failed_items(analyzer):
+    analyzer.fake.fail = {"food-b"}
+    result = analyzer.get_nutrition_info(FOODS, mode="concurrent")
+    assert len(analyzer.fake.requests) == 2
+    assert result["food-a"] == {"calories": "100kcal", "protein": "5g", "carbs": "10g", "fat": "3g"}
+    assert result["food-b"] == FoodScan.NUTRITION_FAILED
+
+
+def test_near_miss_in_local_db_falls_back_to_the_api(monkeypatch, tmp_path):
+    csv_path = tmp_path / "foods.csv"
+    csv_path.write_text("식품명,에너지(kcal),단백질(g),탄수화물(g),지방(g)\n김치,20,1,4,0.5\n", encoding="utf-8")
+    db = NutrientDB(tmp_path / "nutrients.sqlite3")
+    db.load_csv(csv_path)
+    client = FakeOpenAI()
+    monkeypatch.setattr("openai.OpenAI", lambda *args, **kwargs: client)
+    analyzer = FoodScan.FoodAnalyzer(cache=ScanCache(enabled=False), nutrient_db=db, ui=FoodScan.LogUI())
+    result = analyzer.get_nutrition_info([{"food": "김치"}, {"food": "김치전"}], mode="sequential")
+    assert result["김치"]["calories"] == "20kcal"
+    assert result["김치전"]["calories"] == "100kcal"
+    assert client.requests == ["'김치전'의 예상되는 영양성분을 다음 형식으로만 답변해주세요:\n칼로리: [숫자]kcal\n단백질: [숫자]g\n탄수화물: [숫자]g\n지방: [숫자]g"]
+
+
+def test_cached_items_skip_requests(monkeypatch, tmp_path):
+    client = FakeOpenAI()
+    monkeypatch.setattr("openai.OpenAI", lambda *args, **kwargs: client)
+    monkeypatch.setattr(FoodScan, "OpenAI", lambda *args, **kwargs: client, raising=False)
+    analyzer = FoodScan.FoodAnalyzer(cache=ScanCache(path=tmp_path / "scan.sqlite3", enabled=True))
+    first = analyzer.get_nutrition_info(FOODS, mode="sequential")
+    assert analyzer.get_nutrition_info(FOODS, mode="sequential") == first
+    assert len(client.requests) == 2
@@ -0,0 +1,35 @@
+# tests/test_overlay.py
+from PIL import Image
+
+from pages.overlay import BOX_COLOR, OverlayRenderer, item_label
+
+ITEMS = [{"food": "김밥", "bbox": [10, 40, 60, 90], "calories": 300}, {"food": "좌표 없음"}]
+
+
+def test_item_label():
+    assert item_label(ITEMS[0]) == "김밥 (300)"
+    assert item_label({"food": "김밥"}) == "김밥"
+
+
+def test_render_keeps_mode_and_leaves_original_untouched():
+    image = Image.new("RGB", (100, 100), "white")
+    annotated = OverlayRenderer().render(image, ITEMS)
+    assert annotated.mode == "RGB" and annotated.size == image.size
+    assert annotated.getpixel((10, 65)) == BOX_COLOR[:3]  # 박스 왼쪽 변
+    assert annotated.getpixel((35, 65)) == (255, 255, 255)  # 박스 안쪽
+    assert image.getpixel((10, 65)) == (255, 255, 255)
+
+
+def test_overlay_cache_reuses_layers_and_evicts_oldest():
+    renderer = OverlayRenderer(cache_size=2)
+    first = renderer.render_overlay((100, 100), ITEMS)
+    # 같은 좌표/라벨이면 dict가 새로 만들어져도 같은 레이어 재사용
+    assert renderer.render_overlay((100, 100), [dict(item) for item in ITEMS]) is first
+    renderer.render_overlay((100, 100), [{"food": "라면", "bbox": [0, 0, 5, 5]}])
+    renderer.render_overlay((200, 100), ITEMS)
+    assert renderer.render_overlay((100, 100), ITEMS) is not first
+
+
+def test_boxes_are_clipped_to_the_image():
+    annotated = OverlayRenderer().render(Image.new("RGB", (50, 50), "white"), [{"food": "큰 박스", "bbox": [-20, 30, 80, 49]}])
+    assert annotated.getpixel((0, 40)) == BOX_COLOR[:3]
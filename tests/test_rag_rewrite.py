@@ -0,0 +1,70 @@
+# tests/test_rag_rewrite.py
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.documents import Document
+
+import pages.rag_engine as rag_engine
+from pages.answer_cache import AnswerCache
+
+
+class FakeRetriever:
+    """검색어별로 정해진 문서와 점수를 돌려줌"""
+
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    def invoke(self, query):
+        self.queries.append(query)
+        content, score = self.results[query]
+        return [Document(page_content=content, metadata={"relevance_score": score})]
+
+
+class FakeChain:
+    def __init__(self, reply):
+        self.reply = reply
+        self.inputs = []
+
+    def invoke(self, inputs):
+        self.inputs.append(inputs)
+        return SimpleNamespace(content=self.reply(inputs))
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(rag_engine, "SCORE_FLOOR", 0.2)
+    monkeypatch.setattr(rag_engine, "REWRITE_BELOW", 0.8)
+    monkeypatch.setattr(rag_engine, "MAX_REWRITES", 2)
+    engine = rag_engine.RagEngine("baseball-chroma", "system", answer_cache=AnswerCache(enabled=False))
+    engine.packer = None
+    engine._retriever = FakeRetriever({
+        "질문": ("원래 문서", 0.6),
+        "검색어1": ("재작성 문서1", 0.4),
+        "검색어2": ("재작성 문서2", 0.5),
+    })
+    rewrites = {"질문": "검색어1", "검색어1": "검색어2"}
+    engine._rewrite_chain = FakeChain(lambda inputs: rewrites[inputs["query"]])
+    engine._answer_chain = FakeChain(lambda inputs: f"답변: {inputs['context']}")
+    engine._chain = engine._build_graph()
+    return engine
+
+
+def test_lower_scoring_rewrite_keeps_original_context(engine):
+    assert engine.ask("질문") == "답변: 원래 문서"
+    assert engine._answer_chain.inputs == [{"context": "원래 문서", "query": "질문"}]
+
+
+def test_rewrite_starts_from_last_attempted_query(engine):
+    engine.ask("질문")
+    # 두 번째 재작성은 원래 질문이 아니라 첫 번째 재작성 검색어에서 시작
+    assert [inputs["query"] for inputs in engine._rewrite_chain.inputs] == ["질문", "검색어1"]
+    assert engine._retriever.queries == ["질문", "검색어1", "검색어2"]
+
+
+def test_higher_scoring_rewrite_replaces_context(engine):
+    engine._retriever.results["검색어1"] = ("재작성 문서1", 0.9)
+    assert engine.ask("질문") == "답변: 재작성 문서1"
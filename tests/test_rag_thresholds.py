@@ -0,0 +1,69 @@
+# tests/test_rag_thresholds.py
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+pytest.importorskip("langchain_chroma")
+
+from langchain_chroma import Chroma
+
+import pages.rag_engine as rag_engine
+from pages.keyword_index import HybridRetriever
+
+COLLECTION = "baseball-chroma"
+
+
+class FixedEmbeddings(Embeddings):
+    """지정한 벡터를 질문 임베딩으로 돌려줌 (API 없이 실제 ada-002 점수 척도에서 검색)"""
+
+    vector = None
+
+    def embed_query(self, text):
+        return list(self.vector)
+
+    def embed_documents(self, texts):
+        return [list(self.vector) for _ in texts]
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    # 저장소의 ada-002 컬렉션(l2)을 복사해서 사용 (원본은 건드리지 않음)
+    directory = tmp_path_factory.mktemp("chroma")
+    shutil.copytree(Path(__file__).parent.parent / "chroma", directory, dirs_exist_ok=True)
+    embeddings = FixedEmbeddings()
+    vectorstore = Chroma(collection_name=COLLECTION, embedding_function=embeddings, persist_directory=str(directory))
+    data = vectorstore._collection.get(include=["embeddings"], limit=1)
+    vector = np.asarray(data["embeddings"][0], dtype=np.float64)
+    return embeddings, HybridRetriever(vectorstore=vectorstore, collection_name=COLLECTION, k=3), vector / np.linalg.norm(vector)
+
+
+def score_at(store, cosine):
+    """저장된 청크와 코사인 유사도가 cosine인 질문 벡터로 검색했을 때의 검색 점수"""
+    embeddings, retriever, chunk = store
+    noise = np.random.default_rng(0).standard_normal(chunk.shape)
+    noise -= noise @ chunk * chunk
+    embeddings.vector = cosine * chunk + np.sqrt(1 - cosine ** 2) * noise / np.linalg.norm(noise)
+    return max(doc.metadata["relevance_score"] for doc in retriever.invoke("질문"))
+
+
+def grade(score, monkeypatch):
+    floor, rewrite_below = rag_engine.SCORE_THRESHOLDS["openai"]
+    monkeypatch.setattr(rag_engine, "SCORE_FLOOR", floor)
+    monkeypatch.setattr(rag_engine, "REWRITE_BELOW", rewrite_below)
+    engine = rag_engine.RagEngine(COLLECTION, "system", answer_cache=object())
+    return engine.grade_documents({"context": "문서", "score": score, "rewrites": 0})["next"]
+
+
+def test_off_topic_score_scale_triggers_no_answer(store, monkeypatch):
+    # ada-002에서 무관한 질문의 코사인 유사도(약 0.75)도 l2 점수로는 0.55를 넘음
+    score = score_at(store, 0.75)
+    assert score > 0.55
+    assert grade(score, monkeypatch) == "no_answer"
+
+
+def test_weak_match_rewrites_and_strong_match_answers(store, monkeypatch):
+    assert grade(score_at(store, 0.80), monkeypatch) == "rewrite_query"
+    assert grade(score_at(store, 0.90), monkeypatch) == "generate_answer"
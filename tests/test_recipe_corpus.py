@@ -0,0 +1,60 @@
+# tests/test_recipe_corpus.py
+import gzip
+import json
+
+import pytest
+
+from pages.recipe_corpus import chunk_recipe, normalize_recipe, read_recipes
+
+ROWS = [
+    {"RCP_NM": "김치찌개", "RCP_PARTS_DTLS": "김치 | 돼지고기 | 두부", "조리순서": "1. 김치를 볶는다\n2. 물을 붓고 끓인다", "인분": "2"},
+    {"RCP_NM": "", "재료": "없음"},
+]
+
+
+def test_reads_gzipped_jsonl_and_csv(tmp_path):
+    jsonl = tmp_path / "recipes.JSONL.gz"
+    with gzip.open(jsonl, "wt", encoding="utf-8") as f:
+        f.write("\n".join(json.dumps(row, ensure_ascii=False) for row in ROWS) + "\n\n")
+    csv_path = tmp_path / "recipes.csv.gz"
+    with gzip.open(csv_path, "wt", encoding="utf-8-sig", newline="") as f:
+        f.write("RCP_NM,재료\n김치찌개,\"김치, 두부\"\n")
+
+    # .gz는 압축을 풀어 읽고, 그 앞의 확장자로 형식을 판단
+    assert list(read_recipes(jsonl)) == ROWS
+    assert list(read_recipes(csv_path)) == [{"RCP_NM": "김치찌개", "재료": "김치, 두부"}]
+
+
+def test_rejects_unknown_format(tmp_path):
+    path = tmp_path / "recipes.txt.gz"
+    with gzip.open(path, "wt") as f:
+        f.write("김치찌개\n")
+    with pytest.raises(ValueError):
+        list(read_recipes(path))
+
+
+def test_normalize_recipe_maps_aliases_and_keeps_short_metadata():
+    recipe = normalize_recipe(ROWS[0], 7)
+    assert recipe == {
+        "id": "7",
+        "title": "김치찌개",
+        "ingredients": ["김치", "돼지고기", "두부"],
+        "steps": ["김치를 볶는다", "물을 붓고 끓인다"],
+        "metadata": {"인분": "2"},
+    }
+    assert normalize_recipe(ROWS[1], 8) is None
+
+
+def test_short_recipe_is_one_chunk():
+    (chunk,) = chunk_recipe(normalize_recipe(ROWS[0], 7))
+    assert chunk.page_content.startswith("요리: 김치찌개\n인분: 2\n재료: 김치, 돼지고기, 두부\n조리 순서:\n1. 김치를 볶는다")
+    assert chunk.metadata == {"인분": "2", "source": "recipe:7", "recipe_id": "7", "title": "김치찌개", "part": "full"}
+
+
+def test_long_recipe_keeps_steps_whole_and_titled():
+    recipe = normalize_recipe({"title": "갈비찜", "ingredients": ["갈비"], "steps": [f"{i}단계 " + "양념 " * 20 for i in range(1, 9)]}, 1)
+    chunks = chunk_recipe(recipe, max_tokens=80)
+    assert [chunk.metadata["part"] for chunk in chunks][:2] == ["ingredients", "steps"]
+    assert all(chunk.page_content.startswith("요리: 갈비찜") for chunk in chunks)
+    steps = "\n".join(chunk.page_content for chunk in chunks if chunk.metadata["part"] == "steps")
+    assert all(f"{i}. {i}단계" in steps for i in range(1, 9))
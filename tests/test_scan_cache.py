@@ -0,0 +1,69 @@
+# tests/test_scan_cache.py
+import pages.scan_cache as scan_cache
+from pages.scan_cache import ScanCache, make_key
+
+
+class Clock:
+    """time.time()을 대신하는 수동 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(scan_cache.time, "time", clock)
+    return ScanCache(path=tmp_path / "scan.sqlite3", enabled=True, **kwargs), clock
+
+
+def test_make_key_separates_parts():
+    assert make_key("ab", "c") != make_key("a", "bc")
+    assert make_key("음식", b"\x00") == make_key("음식".encode("utf-8"), b"\x00")
+
+
+def test_round_trip_and_stats(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    assert cache.get("a") is None
+    cache.set("a", [{"food": "김밥", "bbox": [1, 2, 3, 4]}])
+    assert cache.get("a") == [{"food": "김밥", "bbox": [1, 2, 3, 4]}]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_evicts_least_recently_used_over_max_bytes(tmp_path, monkeypatch):
+    # 항목 하나가 json으로 12바이트라 두 개까지만 들어감
+    cache, clock = make_cache(tmp_path, monkeypatch, max_bytes=25)
+    cache.set("a", "x" * 10)
+    clock.now += 1
+    cache.set("b", "x" * 10)
+    clock.now += 1
+    assert cache.get("a") is not None  # a를 최근 사용으로 갱신
+    clock.now += 1
+    cache.set("c", "x" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_expires_entries_older_than_max_age(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, max_age=60)
+    cache.set("old", 1)
+    clock.now += 30
+    cache.set("new", 2)
+    clock.now += 31
+    assert cache.get("old") is None
+    assert cache.get("new") == 2
+    # 새 항목을 쓸 때 만료된 항목도 함께 정리됨
+    clock.now += 60
+    cache.set("newest", 3)
+    assert cache.stats()["entries"] == 1
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = ScanCache(path=tmp_path / "scan.sqlite3", enabled=False)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert not (tmp_path / "scan.sqlite3").exists()
@@ -0,0 +1,52 @@
+# tests/test_scan_history.py
+from PIL import Image
+
+from pages.scan_history import THUMBNAIL_SIZE, ScanHistory
+
+
+def record(index, size=(600, 400)):
+    return {
+        "datetime": f"2024-01-01 00:00:{index:02d}",
+        "image": Image.new("RGB", size, (index, 0, 0)),
+        "detected_foods": [{"food": "김밥", "bbox": [1, 2, 30, 40], "calories": 300}, {"food": "좌표 없음"}],
+        "summary": {"count": index},
+    }
+
+
+def test_entries_read_like_the_old_dict_records():
+    history = ScanHistory()
+    history.append(record(1))
+    entry = history[-1]
+    assert entry["datetime"] == "2024-01-01 00:00:01"
+    assert entry["detected_foods"] == [{"food": "김밥", "bbox": [1, 2, 30, 40], "calories": 300}]
+    assert entry["image"].size == (600, 400)
+    assert entry["image"].getpixel((0, 0)) == (1, 0, 0)
+    assert max(entry["thumbnail"].size) == THUMBNAIL_SIZE
+    assert entry.get("missing", "기본값") == "기본값"
+
+
+def test_oldest_entries_and_files_are_dropped_over_max_entries():
+    history = ScanHistory(max_entries=2)
+    for index in range(3):
+        history.append(record(index))
+    assert [entry["datetime"][-2:] for entry in history] == ["01", "02"]
+    assert len(list(history.directory.iterdir())) == 2
+
+
+def test_thumbnails_are_released_over_the_memory_budget():
+    # 썸네일 하나가 256x171x3 바이트라 한 개만 메모리에 유지
+    history = ScanHistory(max_memory_bytes=256 * 171 * 3)
+    for index in range(3):
+        history.append(record(index))
+    assert [entry.thumbnail is None for entry in history] == [True, True, False]
+    assert history.memory_bytes() <= history.max_memory_bytes
+    # 해제된 썸네일은 디스크의 원본에서 다시 만듦
+    assert max(history[0]["thumbnail"].size) == THUMBNAIL_SIZE
+
+
+def test_clear_removes_files():
+    history = ScanHistory()
+    history.append(record(1))
+    history.clear()
+    assert len(history) == 0
+    assert list(history.directory.iterdir()) == []